@@ -0,0 +1,74 @@
+"""
+Per-keystroke engine overhead: the cost of replaying a plan with no waits
+into sinks that do nothing.
+"""
+
+import time
+from typing import Dict
+
+from common import sample_text
+
+from human_typer import HumanTyper
+from scheduler import DeadlineScheduler
+from sinks import OutputSink, KeyboardSink, PYNPUT_AVAILABLE
+from typing_plan import TypingPlan
+
+
+class NullSink(OutputSink):
+    """Sink that discards every keystroke."""
+
+    def write(self, char: str):
+        pass
+
+    def backspace(self):
+        pass
+
+
+class NullController:
+    """Stand-in for a pynput keyboard controller that sends nothing."""
+
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+def zero_wait_plan(text: str) -> TypingPlan:
+    """Plan every character of `text` at offset 0, so nothing waits."""
+    plan = TypingPlan()
+    for index, char in enumerate(text):
+        plan.press(char)
+        plan.completed = index + 1
+    return plan
+
+
+def measure(sink: OutputSink, plan: TypingPlan, repeats: int, trace: bool = False) -> float:
+    """Best nanoseconds per keystroke replaying `plan` into `sink`."""
+    typer = HumanTyper(use_keyboard=False, sink=sink)
+    typer.set_callbacks(on_progress=None)
+    if trace:
+        typer.enable_tracing()
+    best = float('inf')
+    for _ in range(repeats):
+        typer._start_session_metrics(plan.completed)
+        scheduler = DeadlineScheduler(control=typer._control)
+        scheduler.start()
+        started = time.perf_counter_ns()
+        typer._run_plan(plan, scheduler, plan.completed)
+        best = min(best, time.perf_counter_ns() - started)
+    return best / len(plan)
+
+
+def run(quick: bool = False) -> Dict:
+    plan = zero_wait_plan(sample_text(2_000 if quick else 20_000))
+    repeats = 3 if quick else 5
+    results = {
+        'keystrokes': len(plan),
+        'null_sink_ns_per_key': measure(NullSink(), plan, repeats),
+        'traced_null_sink_ns_per_key': measure(NullSink(), plan, repeats, trace=True),
+    }
+    if PYNPUT_AVAILABLE:
+        results['keyboard_sink_ns_per_key'] = measure(KeyboardSink(NullController()), plan,
+                                                      repeats)
+    return results
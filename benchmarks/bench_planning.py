@@ -0,0 +1,104 @@
+"""
+Planning throughput: how fast text is turned into a keystroke plan.
+
+Measures compile_plan() end to end and the _type_word() logic alone, with
+the NumPy and pure-Python samplers, and the closed-form estimate of the
+same text for comparison. simulate_speedup is how many times faster than
+real time simulate() runs. LIMITS holds the slowest acceptable
+values; `run.py --check` fails when they are exceeded.
+"""
+
+from typing import Dict
+
+from common import best_of, sample_text
+
+import sampling
+from estimator import TypingEstimator
+from human_typer import HumanTyper
+from typing_plan import TypingPlan
+
+# Slowest acceptable results, about twice the time measured when they were
+# last tuned (compiling 100 KB took 0.27 s with NumPy, 0.34 s without, and
+# estimating it about 35 us per KB)
+LIMITS = {
+    'compile_ms_per_100kb': 750.0,
+    'estimate_us_per_kb': 100.0,
+}
+
+PLANNED_KB = 100
+
+
+def make_typer(trace: bool = False) -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False, seed=1)
+    typer.set_speed(300)
+    if trace:
+        typer.enable_tracing()
+    return typer
+
+
+def measure(words: int, repeats: int, trace: bool = False) -> Dict:
+    text = sample_text(words)
+    typer = make_typer(trace)
+    keystrokes = len(typer.compile_plan(text))
+    compile_time = best_of(lambda: typer.compile_plan(text), repeats)
+
+    word_list = text.split(' ')
+
+    def type_words():
+        typer._begin_session()
+        plan = TypingPlan()
+        for word in word_list:
+            typer._type_word(plan, word)
+
+    word_time = best_of(type_words, repeats)
+    return {
+        'compile_words_per_second': words / compile_time,
+        'compile_keystrokes_per_second': keystrokes / compile_time,
+        'type_word_words_per_second': words / word_time,
+        'type_word_us_per_word': 1e6 * word_time / words,
+    }
+
+
+def compile_ms_per_100kb(repeats: int) -> float:
+    """Milliseconds compile_plan() takes for 100 KB of text with the default sampler."""
+    text = sample_text(PLANNED_KB * 1024 // 5)[:PLANNED_KB * 1024]
+    typer = make_typer()
+    return 1000 * best_of(lambda: typer.compile_plan(text), repeats) * 100 / PLANNED_KB
+
+
+def estimate_us_per_kb(repeats: int) -> float:
+    """Microseconds TypingEstimator takes per KB of text, from set_text() to estimate()."""
+    text = sample_text(PLANNED_KB * 1024 // 5)[:PLANNED_KB * 1024]
+    estimator = TypingEstimator(make_typer())
+
+    def estimate():
+        estimator.set_text(text)
+        estimator.estimate()
+
+    return 1e6 * best_of(estimate, repeats) / PLANNED_KB
+
+
+def simulate_speedup(words: int, repeats: int) -> float:
+    """Simulated seconds of typing per real second spent in simulate()."""
+    text = sample_text(words)
+    typer = make_typer()
+    duration = typer.simulate(text)['duration']
+    return duration / best_of(lambda: typer.simulate(text), repeats)
+
+
+def run(quick: bool = False) -> Dict:
+    words = 5_000 if quick else 50_000
+    repeats = 3 if quick else 5
+    results = {'words': words, 'compile_ms_per_100kb': compile_ms_per_100kb(repeats),
+               'estimate_us_per_kb': estimate_us_per_kb(repeats),
+               'simulate_speedup': simulate_speedup(words // 10, repeats)}
+    numpy_available = sampling.NUMPY_AVAILABLE
+    try:
+        if numpy_available:
+            results['numpy'] = measure(words, repeats)
+        sampling.NUMPY_AVAILABLE = False
+        results['python'] = measure(words, repeats)
+        results['python_traced'] = measure(words, repeats, trace=True)
+    finally:
+        sampling.NUMPY_AVAILABLE = numpy_available
+    return results
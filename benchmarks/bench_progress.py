@@ -0,0 +1,84 @@
+"""
+Progress reporting cost on the typing thread and the GUI thread.
+
+Compares publishing into the polled ProgressCounter with the per-word
+pattern of queueing two Tk callbacks. A real Tk root is used when a
+display is available; otherwise an in-memory queue stands in for the Tk
+event queue.
+"""
+
+import time
+from collections import deque
+from typing import Dict
+
+from progress import ProgressCounter
+
+
+class QueueRoot:
+    """Stand-in for a Tk root that only queues after() callbacks."""
+
+    def __init__(self):
+        self.queue = deque()
+
+    def after(self, delay, callback):
+        self.queue.append(callback)
+
+    def update(self):
+        while self.queue:
+            self.queue.popleft()()
+
+
+def ns_per_call(function, calls: int) -> float:
+    started = time.perf_counter_ns()
+    for index in range(calls):
+        function(index, calls)
+    return (time.perf_counter_ns() - started) / calls
+
+
+def make_root():
+    try:
+        import tkinter
+        root = tkinter.Tk()
+        root.withdraw()
+        return root, True
+    except Exception:
+        return QueueRoot(), False
+
+
+def run(quick: bool = False) -> Dict:
+    calls = 20_000 if quick else 200_000
+    counter = ProgressCounter()
+    publish_ns = ns_per_call(counter.publish, calls)
+
+    root, real_tk = make_root()
+    shown = []
+
+    def per_word_callback(typed, total):
+        percentage = typed / total * 100
+        root.after(0, lambda: shown.append(f"Typing: {typed}/{total} ({percentage:.1f}%)"))
+        root.after(0, lambda: shown.append(percentage))
+
+    callback_calls = calls // 10
+    callback_ns = ns_per_call(per_word_callback, callback_calls)
+    started = time.perf_counter_ns()
+    root.update()
+    drain_ns = (time.perf_counter_ns() - started) / callback_calls
+
+    last = [None]
+
+    def poll(index, total):
+        state = counter.snapshot()
+        if state != last[0]:
+            last[0] = state
+
+    poll_ns = ns_per_call(poll, calls)
+    if real_tk:
+        root.destroy()
+
+    return {
+        'real_tk': real_tk,
+        'counter_publish_ns': publish_ns,
+        'callback_enqueue_ns': callback_ns,
+        'callback_gui_drain_ns': drain_ns,
+        'poll_tick_ns': poll_ns,
+    }
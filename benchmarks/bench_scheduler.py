@@ -0,0 +1,97 @@
+"""
+Scheduler accuracy: jitter and drift of real-time keystroke scheduling at
+100, 300 and 500 CPM, for each timing mode, how quickly stop_typing()
+ends a session that is waiting for its next keystroke, and the lateness of
+many AsyncHumanTyper sessions sharing one event loop. LIMITS holds the
+slowest acceptable values for `run.py --check`.
+"""
+
+import asyncio
+import threading
+from typing import Dict
+
+from common import percentile
+
+from async_typer import AsyncHumanTyper
+from human_typer import HumanTyper
+from scheduler import SCHEDULERS, NS_PER_SECOND
+from sinks import MemorySink
+from typing_plan import TypingPlan
+
+SPEEDS = (100, 300, 500)
+
+LIMITS = {
+    'stop_latency_ms': 10.0,
+    'async_max_lateness_ms': 250.0,
+}
+
+
+def steady_plan(cpm: int, seconds: float) -> TypingPlan:
+    """Evenly spaced keystrokes at `cpm` lasting about `seconds`."""
+    plan = TypingPlan()
+    delay = 60.0 / cpm
+    for _ in range(max(5, int(seconds / delay))):
+        plan.press('x')
+        plan.wait(delay)
+    return plan
+
+
+def measure(mode: str, plan: TypingPlan) -> Dict:
+    scheduler = SCHEDULERS[mode]()
+    scheduler.start()
+    wait_until = scheduler.wait_until
+    lateness = [wait_until(offset) / NS_PER_SECOND for offset in plan.offsets]
+    report = scheduler.report()
+    return {
+        'events': len(lateness),
+        'p50_lateness_ms': 1e3 * percentile(lateness, 0.5),
+        'p99_lateness_ms': 1e3 * percentile(lateness, 0.99),
+        'max_lateness_ms': 1e3 * report['max_lateness'],
+        'drift_ms': 1e3 * report['drift'],
+        'drift_ms_per_minute': 60e3 * report['drift'] / max(report['elapsed'], 1e-9),
+    }
+
+
+def stop_latency(repeats: int) -> float:
+    """Worst time stop_typing() took to end a session waiting between keystrokes, in seconds."""
+    worst = 0.0
+    for _ in range(repeats):
+        typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=1)
+        typer.set_speed(50)  # about a second between keystrokes
+        typer.pause_probability = 0.0
+        first_key = threading.Event()
+        typer.set_callbacks(on_progress=lambda done, total: first_key.set())
+        text = "b" * 100
+        typer.typing_thread = threading.Thread(
+            target=typer._typing_worker, args=(lambda: [text], len(text)), daemon=True)
+        typer.typing_thread.start()
+        first_key.wait(5)
+        typer.stop_typing()
+        worst = max(worst, typer.last_stop_latency)
+    return worst
+
+
+def async_max_lateness(sessions: int) -> float:
+    """Worst keystroke lateness of `sessions` concurrent async sessions, in seconds."""
+    typers = []
+    for seed in range(sessions):
+        typer = AsyncHumanTyper(use_keyboard=False, sink=MemorySink(), seed=seed)
+        typer.set_speed(500)
+        typer.pause_probability = 0.0
+        typers.append(typer)
+
+    async def type_all():
+        await asyncio.gather(*(typer.type_text("many sessions") for typer in typers))
+
+    asyncio.run(type_all())
+    return max(typer.last_timing['max_lateness'] for typer in typers)
+
+
+def run(quick: bool = False) -> Dict:
+    seconds = 2.0 if quick else 10.0
+    results = {'stop_latency_ms': 1e3 * stop_latency(3 if quick else 10),
+               'async_max_lateness_ms': 1e3 * async_max_lateness(1000)}
+    for cpm in SPEEDS:
+        plan = steady_plan(cpm, seconds)
+        results[f'{cpm}_cpm'] = {mode: measure(mode, plan) for mode in SCHEDULERS}
+    return results
@@ -0,0 +1,69 @@
+"""
+Startup cost of main.py: wall time of `main.py --help` in a fresh
+interpreter and the import time reported by `python -X importtime`.
+LIMITS holds the import time budgets that `run.py --check` enforces.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Dict
+
+from common import ROOT_DIR
+
+# Modules the CLI should not need just to start
+HEAVY_MODULES = ('tkinter', 'pynput', 'numpy')
+
+# Cumulative import time budgets in milliseconds, generous enough for a cold
+# interpreter without cached bytecode
+LIMITS = {
+    'import_main_ms': 100.0,
+    'import_human_typer_ms': 250.0,
+}
+
+
+def importtime(statement: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of each module `statement` imports."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def loaded_modules(statement: str) -> set:
+    """Names of the modules loaded after running `statement`."""
+    result = subprocess.run([sys.executable, '-c', f"{statement}; import sys; print(*sys.modules)"],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    # The module list is the last line; anything printed while importing comes before it
+    return set(result.stdout.splitlines()[-1].split())
+
+
+def wall_time(args, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT_DIR, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(quick: bool = False) -> Dict:
+    repeats = 3 if quick else 10
+    modules = importtime('import main')
+    engine = importtime('import src.human_typer')
+    loaded = loaded_modules('import main')
+    interpreter = wall_time(['-c', 'pass'], repeats)
+    help_time = wall_time([os.path.join(ROOT_DIR, 'main.py'), '--help'], repeats)
+    return {
+        'import_main_ms': modules.get('main', 0) / 1e3,
+        'import_human_typer_ms': engine.get('src.human_typer', 0) / 1e3,
+        'help_wall_ms': 1e3 * help_time,
+        'help_over_interpreter_ms': 1e3 * (help_time - interpreter),
+        'heavy_imports': sorted(name for name in HEAVY_MODULES if name in loaded),
+    }
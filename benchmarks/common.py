@@ -0,0 +1,66 @@
+"""
+Shared helpers for the benchmark suite.
+
+Every benchmark module exposes run(quick: bool) -> Dict of plain numbers,
+so results can be written as JSON and compared across commits.
+"""
+
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+SAMPLE_WORDS = ("the quick brown fox jumps over the lazy dog while five boxing "
+                "wizards pack my box with a dozen liquor jugs").split()
+
+
+def sample_text(words: int) -> str:
+    """Deterministic text of `words` words."""
+    return ' '.join(SAMPLE_WORDS[i % len(SAMPLE_WORDS)] for i in range(words))
+
+
+def best_of(function: Callable[[], object], repeats: int) -> float:
+    """Shortest wall time of `repeats` calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of `values` (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def environment() -> Dict:
+    """Where the results were measured."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'numpy': numpy_version,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite and write the results as JSON.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick --only planning keystroke
+    python benchmarks/run.py --compare baseline.json --output results.json
+
+With --compare, every numeric result is printed next to the baseline
+value and their ratio, so hot-loop regressions show up between commits.
+With --check, the run fails if a result exceeds its module's LIMITS.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import environment
+
+import bench_keystroke
+import bench_planning
+import bench_progress
+import bench_scheduler
+import bench_startup
+
+BENCHMARKS = {
+    'planning': bench_planning,
+    'keystroke': bench_keystroke,
+    'scheduler': bench_scheduler,
+    'progress': bench_progress,
+    'startup': bench_startup,
+}
+
+
+def flatten(results: Dict, prefix: str = '') -> Iterator[Tuple[str, float]]:
+    """Yield (dotted.name, value) for every numeric result."""
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(baseline: Dict, current: Dict):
+    """Print current results against a baseline run."""
+    old = dict(flatten(baseline.get('results', {})))
+    print(f"{'benchmark':60} {'baseline':>14} {'current':>14} {'ratio':>8}", file=sys.stderr)
+    for name, value in flatten(current['results']):
+        if name in old:
+            ratio = value / old[name] if old[name] else float('nan')
+            print(f"{name:60} {old[name]:14.3f} {value:14.3f} {ratio:8.2f}", file=sys.stderr)
+
+
+def check(name: str, results: Dict) -> list:
+    """Descriptions of the results of benchmark `name` that exceed its LIMITS."""
+    limits = getattr(BENCHMARKS[name], 'LIMITS', {})
+    return [f"{name}.{key}: {results[key]:.3f} > {limit}"
+            for key, limit in limits.items() if results.get(key, 0) > limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Human Typer engine benchmarks')
+    parser.add_argument('--quick', action='store_true', help='Smaller inputs and fewer repeats')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run')
+    parser.add_argument('--output', type=str, help='Write JSON results here instead of stdout')
+    parser.add_argument('--compare', type=str, help='Baseline JSON results to compare against')
+    parser.add_argument('--check', action='store_true', help='Fail if a result exceeds its limit')
+    args = parser.parse_args()
+
+    report = {'environment': environment(), 'quick': args.quick, 'results': {}}
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...", file=sys.stderr)
+        report['results'][name] = BENCHMARKS[name].run(quick=args.quick)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            compare(json.load(file), report)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+    if args.check:
+        failures = [failure for name, results in report['results'].items()
+                    for failure in check(name, results)]
+        for failure in failures:
+            print(f"Over limit: {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,31 +6,135 @@ This is the main entry point for the Human Typer application.
 It automatically detects the best interface to use (GUI or CLI).
 """
 
+import importlib.util
 import sys
 
-try:
-    import tkinter
-    GUI_AVAILABLE = True
-except ImportError:
-    GUI_AVAILABLE = False
+# Heavy modules (tkinter, pynput, NumPy) are imported only on the paths that
+# use them, so scripted CLI runs start quickly
+GUI_AVAILABLE = importlib.util.find_spec('tkinter') is not None
 
-from src.human_typer import PYNPUT_AVAILABLE
+
+def float_list(value: str):
+    """Parse a comma-separated list of numbers."""
+    return [float(item) for item in value.split(',')]
+
+
+def generate_dataset(args):
+    """Run the dataset subcommand."""
+    from src.dataset import generate_dataset as generate, read_corpus
+    from src.layouts import LAYOUT_NAMES
+    
+    unknown = [layout for layout in args.layouts if layout not in LAYOUT_NAMES]
+    if unknown:
+        sys.exit(f"Unknown keyboard layout(s): {', '.join(unknown)}")
+    texts = read_corpus(args.corpus)
+    
+    def progress(done, total):
+        print(f"\r{done}/{total} sessions", end='', file=sys.stderr, flush=True)
+    
+    try:
+        manifest = generate(texts, args.out, speeds=args.speeds, error_rates=args.error_rates,
+                            layouts=args.layouts, repeats=args.repeats, seed=args.seed,
+                            workers=args.workers, chunk_sessions=args.chunk_sessions,
+                            compress=args.compress, progress=progress)
+    except ValueError as error:
+        sys.exit(str(error))
+    print(file=sys.stderr)
+    print(f"Wrote {manifest['sessions']} sessions ({manifest['events']} events) in "
+          f"{len(manifest['files'])} files to {args.out} "
+          f"({manifest['sessions_per_hour']:.0f} sessions/hour)")
+
+
+def record_profile(path: str, layout: str):
+    """Record the user's typing until Esc and save the fitted profile."""
+    from src.profiles import ProfileRecorder
+    
+    recorder = ProfileRecorder()
+    try:
+        recorder.start()
+    except RuntimeError as error:
+        sys.exit(str(error))
+    print("Recording... type a few paragraphs naturally, then press Esc to finish.")
+    recorder.wait()
+    try:
+        profile = recorder.fit(layout)
+    except ValueError as error:
+        sys.exit(f"Could not fit a profile: {error}")
+    profile.save(path)
+    print(f"Saved {profile} to {path}")
 
 
 def main():
     """Main entry point - choose the best interface."""
     import argparse
+    from src.layouts import LAYOUT_NAMES
     
     parser = argparse.ArgumentParser(description='Human Typer Mimicker - Realistic typing simulation')
     parser.add_argument('--cli', action='store_true', help='Force CLI mode')
     parser.add_argument('--gui', action='store_true', help='Force GUI mode')
     parser.add_argument('--text', type=str, help='Text to type (CLI mode only)')
-    parser.add_argument('--speed', type=int, default=200, help='Typing speed in CPM')
-    parser.add_argument('--error-rate', type=float, default=0.08, help='Error rate (0.0-1.0)')
+    parser.add_argument('--file', type=str, help='Text file to type, read lazily (CLI mode only)')
+    parser.add_argument('--stdin', action='store_true', help='Type text read lazily from standard input (CLI mode only)')
+    parser.add_argument('--speed', type=int, help='Typing speed in CPM (default 200)')
+    parser.add_argument('--error-rate', type=float, help='Error rate (0.0-1.0, default 0.08)')
+    parser.add_argument('--layout', choices=LAYOUT_NAMES,
+                        help='Keyboard layout used for typos and finger travel (default qwerty)')
+    parser.add_argument('--throughput', type=int, metavar='CPM',
+                        help='Bulk entry: type in uncapped bursts at this many CPM (ignores --speed)')
+    parser.add_argument('--burst-errors', type=float, default=0.0, metavar='P',
+                        help='With --throughput, chance that a burst uses the typo model (default 0)')
+    parser.add_argument('--duration', type=float, metavar='SECONDS',
+                        help='Finish typing --text or --file in this many seconds (solves speed and pauses)')
+    parser.add_argument('--estimate', action='store_true',
+                        help='Print the expected duration and keystrokes of the text instead of typing it')
+    parser.add_argument('--profile', type=str,
+                        help='Typing profile to apply; --speed, --error-rate and --layout override it')
+    parser.add_argument('--record-profile', type=str, metavar='PATH',
+                        help='Record your own typing until Esc and save it as a profile')
+    parser.add_argument('--seed', type=int, help='Seed for typing decisions (same seed and text give the same keystrokes)')
     parser.add_argument('--no-keyboard', action='store_true', help='Disable keyboard simulation')
+    parser.add_argument('--output', type=str, help='Append keystrokes to this file instead of typing them')
+    parser.add_argument('--progress-rate', type=float, default=30.0,
+                        help='Progress display refreshes per second (0 hides the CLI progress bar)')
+    parser.add_argument('--stats', type=str,
+                        help='Write session statistics to this file (Prometheus text format for .prom, JSON otherwise)')
+    parser.add_argument('--trace', type=str,
+                        help='Write a Chrome trace (open in ui.perfetto.dev) of the session to this file')
+    parser.add_argument('--log', type=str, metavar='PATH',
+                        help='Append every keystroke sent, with its timing, to this binary session log')
+    parser.add_argument('--replay', type=str, metavar='PATH',
+                        help='Re-send the keystrokes of a session log at their recorded times (CLI mode only)')
+    
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    dataset = commands.add_parser('dataset', help='Generate a synthetic keystroke dataset',
+                                  description='Plan sessions for every corpus line and parameter '
+                                              'combination in parallel and write them as .npz chunks')
+    dataset.add_argument('--corpus', required=True, help='Text file with one session text per line')
+    dataset.add_argument('--out', required=True, help='Output directory')
+    dataset.add_argument('--speeds', type=float_list, default=[200.0], help='Comma-separated CPM values')
+    dataset.add_argument('--error-rates', type=float_list, default=[0.08],
+                         help='Comma-separated typo probabilities')
+    dataset.add_argument('--layouts', type=lambda value: value.split(','), default=['qwerty'],
+                         help=f"Comma-separated layouts ({', '.join(LAYOUT_NAMES)})")
+    dataset.add_argument('--repeats', type=int, default=1, help='Sessions per text and parameter combination')
+    dataset.add_argument('--seed', type=int, default=0, help='Base seed')
+    dataset.add_argument('--workers', type=int, help='Worker processes (default: all CPUs)')
+    dataset.add_argument('--chunk-sessions', type=int, default=1000, help='Sessions per output file')
+    dataset.add_argument('--compress', action='store_true', help='Deflate the output files')
     
     args = parser.parse_args()
     
+    if args.command == 'dataset':
+        generate_dataset(args)
+        return
+    
+    if args.duration is not None and args.stdin:
+        parser.error('--duration needs a known length; use --text or --file')
+    
+    if args.record_profile:
+        record_profile(args.record_profile, args.layout or 'qwerty')
+        return
+    
     # Determine which interface to use
     use_gui = False
     use_cli = False
@@ -39,7 +143,7 @@ def main():
         use_gui = True
     elif args.cli and not args.gui:
         use_cli = True
-    elif args.text:  # Text provided, use CLI
+    elif args.text or args.file or args.stdin or args.replay or args.estimate:  # Text provided, use CLI
         use_cli = True
     elif GUI_AVAILABLE:  # Default to GUI if available
         use_gui = True
@@ -50,7 +154,7 @@ def main():
     if use_gui and GUI_AVAILABLE:
         print("Launching GUI interface...")
         from src.human_typer_gui import main as gui_main
-        gui_main()
+        gui_main(progress_rate=args.progress_rate or 30.0)
     else:
         if use_gui and not GUI_AVAILABLE:
             print("GUI not available (tkinter not found). Using CLI mode.")
@@ -59,21 +163,122 @@ def main():
         from src.human_typer import HumanTyper
         
         # Create typer
-        use_keyboard = not args.no_keyboard
-        typer = HumanTyper(use_keyboard=use_keyboard)
+        use_keyboard = not args.no_keyboard and not args.output
+        sink = None
+        if args.output:
+            from src.sinks import FileSink
+            sink = FileSink(args.output)
+        typer = HumanTyper(use_keyboard=use_keyboard, sink=sink, seed=args.seed,
+                           profile=args.profile)
         
         # Configure settings
-        typer.set_speed(args.speed)
-        typer.set_error_rate(args.error_rate)
+        if args.speed is not None:
+            typer.set_speed(args.speed)
+        if args.error_rate is not None:
+            typer.set_error_rate(args.error_rate)
+        if args.layout:
+            typer.set_keyboard_layout(args.layout)
+        if args.throughput:
+            typer.set_throughput_mode(args.throughput, error_probability=args.burst_errors)
+        
+        # Estimating needs only the settings; nothing is typed
+        if args.estimate:
+            from src.estimator import TypingEstimator
+            from src.text_stream import iter_file_chunks, iter_stream_chunks
+            estimator = TypingEstimator(typer)
+            if args.file:
+                chunks = iter_file_chunks(args.file)
+            elif args.stdin:
+                chunks = iter_stream_chunks(sys.stdin)
+            else:
+                chunks = [args.text or '']
+            for chunk in chunks:
+                estimator.feed(chunk)
+            estimate = estimator.estimate()
+            print(f"{estimate['characters']} characters: {estimate['duration']:.1f} "
+                  f"± {estimate['duration_std']:.1f} s, {estimate['keystrokes']:.0f} "
+                  f"± {estimate['keystrokes_std']:.0f} keystrokes")
+            return
+        
+        if args.trace:
+            typer.enable_tracing()
+        if args.log:
+            typer.enable_session_log(args.log)
         
-        if args.text:
+        # Typing into a file leaves the terminal free for a progress bar
+        progress_bar = None
+        if args.output and args.progress_rate > 0 and (args.text or args.file or args.stdin):
+            from src.progress import ProgressBar
+            unit = 'characters' if args.text else 'bytes'
+            progress_bar = ProgressBar(typer.progress, rate=args.progress_rate, unit=unit)
+            progress_bar.start()
+        
+        def report_session():
+            """Print the summary and write the outputs of the session that just ended."""
+            stats = typer.get_session_stats()
+            if args.duration is not None and stats:
+                print(f"Finished in {stats['elapsed']:.1f} s (target {args.duration:.1f} s)")
+            if args.throughput and stats:
+                print(f"Sustained {stats['sustained_cpm']:.0f} CPM inside bursts "
+                      f"({stats['achieved_cpm']:.0f} CPM overall, target {args.throughput})")
+            if args.stats and stats:
+                from src.metrics import write_json, write_prometheus
+                write_stats = write_prometheus if args.stats.endswith('.prom') else write_json
+                write_stats(stats, args.stats)
+            if args.trace:
+                typer.tracer.dump(args.trace)
+        
+        # With the F6 hotkey, sessions run after type_text() returns, so each
+        # one is reported when it ends
+        hotkey = (typer.use_keyboard and not args.replay
+                  and bool(args.text or args.file or args.stdin))
+        if hotkey:
+            typer.set_callbacks(on_stop=report_session)
+        
+        if args.replay:
+            print(f"Replaying {args.replay}")
+            try:
+                typer.replay(args.replay)
+            except ValueError as error:
+                sys.exit(str(error))
+        elif args.text:
             # Type provided text
             print(f"Typing: {args.text[:50]}{'...' if len(args.text) > 50 else ''}")
-            typer.type_text(args.text, use_hotkey=use_keyboard, show_progress=True)
+            try:
+                typer.type_text(args.text, use_hotkey=use_keyboard, show_progress=True,
+                                target_duration=args.duration)
+            except ValueError as error:
+                sys.exit(str(error))
+        elif args.file:
+            # Stream the file instead of loading it up front
+            try:
+                typer.type_file(args.file, use_hotkey=use_keyboard, show_progress=True,
+                                target_duration=args.duration)
+            except ValueError as error:
+                sys.exit(str(error))
+        elif args.stdin:
+            from src.text_stream import iter_stream_chunks
+            typer.type_stream(iter_stream_chunks(sys.stdin), use_hotkey=use_keyboard, show_progress=True)
         else:
             # Run interactive demo
             from src.human_typer import main as cli_main
             cli_main()
+        
+        if hotkey and typer.hotkey_listener is not None:
+            # Keep listening for F6 until the user quits
+            print("Press Ctrl+C to quit")
+            try:
+                typer.hotkey_listener.join()
+            except KeyboardInterrupt:
+                typer.stop_typing()
+        
+        if progress_bar:
+            progress_bar.stop()
+        if sink:
+            sink.close()
+        typer.disable_session_log()
+        if not hotkey:
+            report_session()
 
 
 if __name__ == '__main__':
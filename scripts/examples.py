@@ -9,6 +9,12 @@ from human_typer import HumanTyper
 import time
 
 
+def type_after_delay(typer: HumanTyper, text: str, delay: float = 3.0):
+    """Give the user time to switch windows, then type `text` and wait for it to finish."""
+    time.sleep(delay)
+    typer.execute_plan(typer.compile_plan(text))
+
+
 def basic_example():
     """Basic usage example."""
     print("=== Basic Example ===")
@@ -18,7 +24,7 @@ def basic_example():
     text = "Hello! This is a basic typing example with realistic human behavior."
     
     input("Press Enter when ready (switch to target app after pressing Enter)...")
-    typer.type_text(text, delay_before_start=3.0)
+    type_after_delay(typer, text)
 
 
 def custom_settings_example():
@@ -36,7 +42,7 @@ def custom_settings_example():
     text = "This text will be typed faster with more mistakes and corrections to demonstrate realistic human typing patterns."
     
     input("Press Enter when ready for fast typing with errors...")
-    typer.type_text(text, delay_before_start=3.0)
+    type_after_delay(typer, text)
 
 
 def slow_careful_typing_example():
@@ -54,7 +60,7 @@ def slow_careful_typing_example():
     text = "This message will be typed slowly and carefully, with minimal errors, like someone being very deliberate."
     
     input("Press Enter when ready for slow, careful typing...")
-    typer.type_text(text, delay_before_start=3.0)
+    type_after_delay(typer, text)
 
 
 def programming_code_example():
@@ -76,7 +82,7 @@ def programming_code_example():
     return calculate_fibonacci(n-1) + calculate_fibonacci(n-2)'''
     
     input("Press Enter when ready to type Python code...")
-    typer.type_text(code, delay_before_start=3.0)
+    type_after_delay(typer, code)
 
 
 def long_text_example():
@@ -96,7 +102,7 @@ natural patterns to create realistic typing behavior that can be used for testin
 automation, or demonstration purposes. The key is balancing realism with accuracy."""
     
     input("Press Enter when ready for long text typing...")
-    typer.type_text(text, delay_before_start=3.0)
+    type_after_delay(typer, text)
 
 
 def interactive_custom_text():
@@ -123,7 +129,7 @@ def interactive_custom_text():
     
     print(f"\nWill type: '{custom_text[:50]}{'...' if len(custom_text) > 50 else ''}'")
     input("Press Enter when ready (switch to target app after pressing Enter)...")
-    typer.type_text(custom_text, delay_before_start=3.0)
+    type_after_delay(typer, custom_text)
 
 
 def main():
@@ -163,7 +169,7 @@ def main():
         print("\n" + "=" * 40)
         print("All examples completed!")
         print("\nTips for using HumanTyper:")
-        print("- Use delay_before_start to give yourself time to switch apps")
+        print("- Use the F6 hotkey (type_text) to start typing once the target app is focused")
         print("- Adjust speed and error rates for different scenarios")
         print("- The final text will always match your input exactly")
         print("- Works in any application that accepts keyboard input")
@@ -0,0 +1,187 @@
+"""
+Async Human Typer
+
+AsyncHumanTyper runs typing sessions as coroutines, so many sessions can
+share one asyncio event loop instead of each holding a mostly sleeping
+OS thread. This is meant for driving many sinks at once, e.g. load
+testing a text-input service with MemorySink or custom sinks.
+
+    async def main():
+        typers = [AsyncHumanTyper(use_keyboard=False, sink=MemorySink(), seed=i)
+                  for i in range(1000)]
+        await asyncio.gather(*(typer.type_text("Hello!") for typer in typers))
+"""
+
+import asyncio
+import os
+from typing import Iterable, Callable, Optional
+
+try:
+    from .human_typer import HumanTyper, STREAM_BATCH_EVENTS
+    from .scheduler import SleepScheduler, NS_PER_SECOND
+    from .typing_plan import TypingPlan
+    from .text_stream import TOKEN_PATTERN, iter_tokens, iter_file_chunks, utf8_length
+except ImportError:
+    from human_typer import HumanTyper, STREAM_BATCH_EVENTS
+    from scheduler import SleepScheduler, NS_PER_SECOND
+    from typing_plan import TypingPlan
+    from text_stream import TOKEN_PATTERN, iter_tokens, iter_file_chunks, utf8_length
+
+# How often a paused session checks whether it has been resumed (seconds)
+PAUSE_POLL_INTERVAL = 0.01
+
+
+class AsyncDeadlineScheduler(SleepScheduler):
+    """Wait for absolute deadlines by sleeping on the event loop (no spinning)."""
+
+    mode = 'async'
+
+    async def wait_until(self, offset: float) -> int:
+        """Wait for the event scheduled at `offset` and return its lateness in ns."""
+        control = self.control
+        while True:
+            if control is not None:
+                if control.stopped:
+                    break
+                if control.paused:
+                    await self._hold_async()
+            remaining = self.origin_ns + round(offset * NS_PER_SECOND) - self.clock.now_ns()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining / NS_PER_SECOND)
+        self.last_offset = offset
+        return self._record(offset)
+
+    async def _hold_async(self):
+        """Wait out a pause on the event loop, shifting the rest of the schedule."""
+        paused_at = self.clock.now_ns()
+        while self.control.paused and not self.control.stopped:
+            await asyncio.sleep(PAUSE_POLL_INTERVAL)
+        paused = self.clock.now_ns() - paused_at
+        self.origin_ns += paused
+        self.paused_ns += paused
+
+
+class AsyncHumanTyper(HumanTyper):
+    """HumanTyper whose sessions are coroutines on a shared event loop."""
+
+    async def _run_plan_async(self, plan: TypingPlan, scheduler: AsyncDeadlineScheduler,
+                              total: int, start: bool = False) -> bool:
+        """
+        Send the events of `plan` on the scheduler's clock, returning False if stopped.
+
+        With `start`, the scheduler's clock is started first (for the first batch).
+        """
+        if start:
+            # Let sessions launched together finish planning before any clock starts
+            await asyncio.sleep(0)
+            scheduler.start()
+            if self.session_log is not None:
+                self.session_log.begin()
+
+        prepare, send = self._event_sender(plan, scheduler, total)
+        wait_until = scheduler.wait_until
+        control = self._control
+
+        for code, action, planned, completed in zip(plan.keys, plan.actions,
+                                                    plan.offsets, plan.progress):
+            if control.stopped:
+                return False
+            offset = prepare(planned)
+            await wait_until(offset)
+            if control.stopped:
+                return False
+            send(code, action, planned, offset, completed)
+
+        return not control.stopped
+
+    async def _execute_tokens_async(self, tokens: Iterable[str], total: int,
+                                    measure: Callable[[str], int] = len) -> bool:
+        """
+        Plan and replay a stream of tokens in small batches on the event loop.
+
+        Cancelling the task stops typing after the current keystroke; the
+        sink is flushed and the stop callback runs before CancelledError
+        propagates.
+        """
+        self.is_typing = True
+        self.should_stop = False
+        self.last_timing = None
+        if self.on_start_callback:
+            self.on_start_callback()
+
+        self._begin_session()
+        self.shadow.reset()
+        self._start_session_metrics(total)
+        scheduler = AsyncDeadlineScheduler(control=self._control)
+        plan = TypingPlan()
+        finished = True
+        typed_all = False
+        started = False  # the clock starts with the first batch
+
+        try:
+            for token in tokens:
+                self.shadow.expect(token)
+                self._plan_token(plan, token)
+                plan.completed += measure(token)
+                if len(plan) >= STREAM_BATCH_EVENTS:
+                    finished = await self._run_plan_async(plan, scheduler, total,
+                                                          start=not started)
+                    started = True
+                    if not finished:
+                        break
+                    plan = plan.continuation()
+
+            if finished:
+                finished = await self._run_plan_async(plan, scheduler, total,
+                                                      start=not started)
+            typed_all = finished
+            return finished
+        finally:
+            self.sink.flush()
+            # Sessions share the event loop thread, so no per-session CPU time
+            self._end_session(scheduler, plan.stats, typed_all, total or plan.completed,
+                              measure_cpu=False)
+            self.is_typing = False
+            if self.on_stop_callback:
+                self.on_stop_callback()
+
+    async def type_text(self, text: str) -> bool:
+        """
+        Type the given text with human-like behavior.
+
+        Args:
+            text: The text to type (will be typed exactly as specified)
+
+        Returns:
+            bool: True if the whole text was typed, False if typing was stopped
+        """
+        return await self._execute_tokens_async(TOKEN_PATTERN.findall(text), len(text))
+
+    async def type_stream(self, chunks: Iterable[str], total_bytes: Optional[int] = None) -> bool:
+        """
+        Type text from an iterator of chunks, tokenized lazily.
+
+        Args:
+            chunks: Iterable of text chunks
+            total_bytes: Size of the stream in bytes, if known
+
+        Returns:
+            bool: True if the whole stream was typed, False if typing was stopped
+        """
+        return await self._execute_tokens_async(iter_tokens(chunks), total_bytes or 0, utf8_length)
+
+    async def type_file(self, path: str, encoding: str = 'utf-8') -> bool:
+        """
+        Type the contents of a file, reading it lazily through a memory map.
+
+        Args:
+            path: Path of the text file to type
+            encoding: Text encoding of the file
+
+        Returns:
+            bool: True if the whole file was typed, False if typing was stopped
+        """
+        chunks = iter_file_chunks(path, encoding=encoding)
+        return await self._execute_tokens_async(iter_tokens(chunks), os.path.getsize(path),
+                                                utf8_length)
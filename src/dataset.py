@@ -0,0 +1,243 @@
+"""
+Synthetic Keystroke Datasets
+
+Generates keystroke-dynamics data from the typing model without typing in
+real time. Every (corpus text, parameter combination) pair is planned a
+number of times with its own seed; sessions are grouped into chunks that a
+ProcessPoolExecutor plans in parallel, and each chunk is written as soon as
+it is done to a columnar .npz file:
+
+    key        uint32   code point of each event (8 for backspace)
+    action     uint8    ACTION_PRESS or ACTION_BACKSPACE
+    time       float64  seconds since the start of the session
+    error      bool     press that is later deleted, or a correcting backspace
+    session    uint64   global index of each session in the chunk
+    offset     uint64   index of each session's first event (plus a final end)
+    text       uint32   corpus line the session typed
+    speed      float64  configured speed (CPM)
+    error_rate float64  configured typo probability
+    layout     uint8    index into the manifest's layouts
+    seed       uint64   seed the session was planned with
+    duration   float64  planned session length in seconds
+
+The files are written with zipfile and array, so NumPy is only needed to
+read them (numpy.load). A manifest.json lists the grid and the chunk files.
+Session seeds depend only on the base seed and the session index, so a
+dataset is reproducible whatever the number of workers.
+"""
+
+import itertools
+import json
+import os
+import sys
+import time
+import zipfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from .human_typer import HumanTyper
+    from .sinks import MemorySink
+    from .typing_plan import ACTION_BACKSPACE
+except ImportError:
+    from human_typer import HumanTyper
+    from sinks import MemorySink
+    from typing_plan import ACTION_BACKSPACE
+
+# Sessions planned and written per chunk file
+DEFAULT_CHUNK_SESSIONS = 1000
+
+# Session seeds are base_seed * SEED_STRIDE + session index
+SEED_STRIDE = 1 << 32
+
+# (text index, speed, error rate, layout index)
+GridPoint = Tuple[int, float, float, int]
+
+# array typecode and .npy dtype of each column
+EVENT_COLUMNS = {'key': ('I', '<u4'), 'action': ('B', '|u1'), 'time': ('d', '<f8'),
+                 'error': ('B', '|b1')}
+SESSION_COLUMNS = {'session': ('Q', '<u8'), 'offset': ('Q', '<u8'), 'text': ('I', '<u4'),
+                   'speed': ('d', '<f8'), 'error_rate': ('d', '<f8'), 'layout': ('B', '|u1'),
+                   'seed': ('Q', '<u8'), 'duration': ('d', '<f8')}
+
+
+def error_flags(keys: Sequence[int], actions: Sequence[int]) -> array:
+    """Flag presses that are later deleted and the backspaces that delete them."""
+    flags = array('B', bytes(len(actions)))
+    typed: List[int] = []
+    for index, action in enumerate(actions):
+        if action == ACTION_BACKSPACE:
+            flags[index] = 1
+            if typed:
+                flags[typed.pop()] = 1
+        else:
+            typed.append(index)
+    return flags
+
+
+def _npy_bytes(values: array, dtype: str) -> bytes:
+    """Serialize a 1-D array in the .npy format (version 1.0)."""
+    if sys.byteorder != 'little' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    # Magic, version and header length take 10 bytes; data starts 64-byte aligned
+    header += ' ' * (-(10 + len(header) + 1) % 64) + '\n'
+    return (b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little')
+            + header.encode('latin1') + values.tobytes())
+
+
+def write_npz(path: str, columns: Dict[str, Tuple[array, str]], compress: bool = False):
+    """Write named 1-D columns to `path` as a .npz archive readable by numpy.load."""
+    method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(path, 'w', compression=method) as archive:
+        for name, (values, dtype) in columns.items():
+            archive.writestr(f"{name}.npy", _npy_bytes(values, dtype))
+
+
+def parameter_grid(texts: int, speeds: Sequence[float], error_rates: Sequence[float],
+                   layouts: int) -> List[GridPoint]:
+    """Every combination of corpus text, speed, error rate and layout."""
+    return list(itertools.product(range(texts), speeds, error_rates, range(layouts)))
+
+
+def iter_chunks(grid: Sequence[GridPoint], repeats: int,
+                chunk_sessions: int) -> Iterator[Tuple[int, int]]:
+    """(first session, session count) of each chunk; session i uses grid[i % len(grid)]."""
+    total = len(grid) * repeats
+    for first in range(0, total, chunk_sessions):
+        yield first, min(chunk_sessions, total - first)
+
+
+# Per-process state set up by _init_worker
+_worker: Dict = {}
+
+
+def _init_worker(texts: List[str], grid: List[GridPoint], layouts: List[str],
+                 base_seed: int, output_dir: str, compress: bool):
+    _worker.update(texts=texts, grid=grid, layouts=layouts, base_seed=base_seed,
+                   output_dir=output_dir, compress=compress,
+                   typer=HumanTyper(use_keyboard=False, sink=MemorySink()))
+
+
+def _generate_chunk(chunk: int, first: int, count: int) -> Tuple[str, int, int]:
+    """Plan sessions first..first+count and write them; returns (file, sessions, events)."""
+    texts, grid, layouts = _worker['texts'], _worker['grid'], _worker['layouts']
+    typer: HumanTyper = _worker['typer']
+    events = {name: array(code) for name, (code, _) in EVENT_COLUMNS.items()}
+    sessions = {name: array(code) for name, (code, _) in SESSION_COLUMNS.items()}
+
+    for session in range(first, first + count):
+        text_index, speed, error_rate, layout_index = grid[session % len(grid)]
+        seed = _worker['base_seed'] * SEED_STRIDE + session
+        typer.base_speed = speed  # the dataset may explore speeds set_speed() clamps
+        typer.set_error_rate(error_rate)
+        if typer.layout.name != layouts[layout_index]:
+            typer.set_keyboard_layout(layouts[layout_index])
+        plan = typer.compile_plan(texts[text_index], seed=seed)
+
+        sessions['session'].append(session)
+        sessions['offset'].append(len(events['key']))
+        sessions['text'].append(text_index)
+        sessions['speed'].append(speed)
+        sessions['error_rate'].append(error_rate)
+        sessions['layout'].append(layout_index)
+        sessions['seed'].append(seed)
+        sessions['duration'].append(plan.duration)
+        events['key'].extend(plan.keys)
+        events['action'].extend(plan.actions)
+        events['time'].extend(plan.offsets)
+        events['error'].extend(error_flags(plan.keys, plan.actions))
+    sessions['offset'].append(len(events['key']))
+
+    name = f"part-{chunk:05d}.npz"
+    columns = {column: (events[column], dtype) for column, (_, dtype) in EVENT_COLUMNS.items()}
+    columns.update((column, (sessions[column], dtype))
+                   for column, (_, dtype) in SESSION_COLUMNS.items())
+    write_npz(os.path.join(_worker['output_dir'], name), columns, _worker['compress'])
+    return name, count, len(events['key'])
+
+
+def generate_dataset(texts: List[str], output_dir: str, speeds: Sequence[float] = (200,),
+                     error_rates: Sequence[float] = (0.08,), layouts: Sequence[str] = ('qwerty',),
+                     repeats: int = 1, seed: int = 0, workers: Optional[int] = None,
+                     chunk_sessions: int = DEFAULT_CHUNK_SESSIONS, compress: bool = False,
+                     progress=None) -> Dict:
+    """
+    Plan `repeats` sessions of every text and parameter combination in parallel.
+
+    Args:
+        texts: Corpus texts, one session each per grid point and repeat
+        output_dir: Directory for the chunk files and manifest.json
+        speeds: Typing speeds (CPM) to cover
+        error_rates: Typo probabilities to cover
+        layouts: Keyboard layouts to cover
+        repeats: Sessions per text and parameter combination
+        seed: Base seed in [0, SEED_STRIDE); session i is planned with
+              seed * SEED_STRIDE + i
+        workers: Worker processes (defaults to the number of CPUs)
+        chunk_sessions: Sessions per chunk file
+        compress: Deflate the chunk files
+        progress: Called with (sessions done, total sessions) as chunks finish
+
+    Returns:
+        Dict: The manifest, also written to output_dir/manifest.json
+    """
+    if not texts:
+        raise ValueError("The corpus has no texts")
+    if repeats < 1 or chunk_sessions < 1:
+        raise ValueError("repeats and chunk_sessions must be at least 1")
+    if not all(speed > 0 for speed in speeds):
+        raise ValueError("Speeds must be positive")
+    if not 0 <= seed < SEED_STRIDE:
+        raise ValueError(f"The base seed must be in [0, {SEED_STRIDE}) to fit the uint64 "
+                         f"session seeds, got {seed}")
+    os.makedirs(output_dir, exist_ok=True)
+    grid = parameter_grid(len(texts), speeds, error_rates, len(layouts))
+    total = len(grid) * repeats
+    chunks = list(iter_chunks(grid, repeats, chunk_sessions))
+
+    started = time.perf_counter()
+    files = [None] * len(chunks)
+    done = events = 0
+    initargs = (list(texts), grid, list(layouts), seed, output_dir, compress)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as executor:
+        futures = {executor.submit(_generate_chunk, index, first, count): index
+                   for index, (first, count) in enumerate(chunks)}
+        for future in as_completed(futures):
+            name, count, chunk_events = future.result()
+            files[futures[future]] = name
+            done += count
+            events += chunk_events
+            if progress:
+                progress(done, total)
+    elapsed = time.perf_counter() - started
+
+    manifest = {
+        'sessions': total,
+        'events': events,
+        'texts': len(texts),
+        'speeds': list(speeds),
+        'error_rates': list(error_rates),
+        'layouts': list(layouts),
+        'repeats': repeats,
+        'seed': seed,
+        'seed_stride': SEED_STRIDE,
+        'event_columns': list(EVENT_COLUMNS),
+        'session_columns': list(SESSION_COLUMNS),
+        'files': files,
+        'elapsed': elapsed,
+        'sessions_per_hour': 3600 * total / elapsed if elapsed > 0 else 0.0,
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+        file.write('\n')
+    return manifest
+
+
+def read_corpus(path: str, encoding: str = 'utf-8') -> List[str]:
+    """Non-empty lines of a corpus file, one text per line."""
+    with open(path, encoding=encoding) as file:
+        return [line.strip() for line in file if line.strip()]
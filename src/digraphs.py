@@ -0,0 +1,145 @@
+"""
+Digraph Timing
+
+The delay between two keystrokes depends on which keys they are: the same
+finger hitting two different keys is slow, alternating hands is fast, and
+jumping rows or reaching for shift costs extra. A DigraphModel stores a
+relative delay factor for every (previous character, next character) pair
+of a keyboard layout in one dense array, so a lookup during planning is two
+dict reads and an index.
+
+The built-in tables are derived from key geometry; a user table (for
+example one fitted from a recorded typing profile) overrides single pairs.
+Factors multiply the sampled delay, so 1.0 keeps the configured speed.
+"""
+
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+try:
+    from .layouts import KeyboardLayout, get_layout
+except ImportError:
+    from layouts import KeyboardLayout, get_layout
+
+# Horizontal shift of each row (number row first) that lines its keys up with
+# the home-row columns they are typed from, and the x position of column 0
+ROW_COLUMN_SHIFT = (0.5, 0.25, 0.0, -0.5)
+HOME_COLUMN_START = 1.75
+
+# Finger for each home-row column from the left pinky: 0-3 left pinky to
+# index, 4-7 right index to pinky; columns further right stay on the pinky
+COLUMN_FINGERS = (0, 1, 2, 3, 3, 4, 4, 5, 6, 7)
+THUMB = 8
+
+# Delay factors by how the two keys are typed
+SAME_KEY_FACTOR = 0.9
+SAME_FINGER_FACTOR = 1.4
+SAME_HAND_FACTOR = 1.0
+ALTERNATE_HAND_FACTOR = 0.85
+THUMB_FACTOR = 0.95
+
+# Extra delay per row jumped with the same hand, and for reaching for shift
+ROW_JUMP_FACTOR = 0.06
+SHIFT_FACTOR = 1.15
+
+# Divides every built-in factor so that running English text keeps an
+# average factor of about 1.0 on QWERTY
+NORMALIZATION = 0.98
+
+# Bounds on any factor, built in or user supplied
+DIGRAPH_FACTOR_RANGE = (0.3, 3.0)
+
+
+def _finger(layout: KeyboardLayout, key: int) -> int:
+    """Touch-typing finger of a physical key."""
+    if key == layout.key_count - 1:
+        return THUMB
+    x, y = layout.positions[key]
+    column = int(x + ROW_COLUMN_SHIFT[int(y)] - HOME_COLUMN_START)
+    return COLUMN_FINGERS[min(max(column, 0), len(COLUMN_FINGERS) - 1)]
+
+
+class DigraphModel:
+    """Dense table of delay factors for consecutive characters."""
+
+    def __init__(self, layout: KeyboardLayout, overrides: Optional[Mapping[str, float]] = None):
+        """
+        Build the table for `layout`.
+
+        Args:
+            layout: Keyboard layout the built-in factors are derived from
+            overrides: Factors for specific pairs, keyed by two-character
+                       strings (e.g. {'th': 0.7}); characters outside the
+                       layout get their own rows
+        """
+        self.layout = layout
+        overrides = dict(overrides or {})
+        low, high = DIGRAPH_FACTOR_RANGE
+        for pair, factor in overrides.items():
+            if not isinstance(pair, str) or len(pair) != 2:
+                raise ValueError(f"Digraph keys must be two characters, got {pair!r}")
+            if not factor > 0:
+                raise ValueError(f"Digraph factor for {pair!r} must be positive")
+        self.overrides: Mapping[str, float] = MappingProxyType(overrides)
+
+        # Character -> row/column; the last slot stands for any other character
+        slots: Dict[str, int] = {}
+        for char in layout.key_index:
+            slots[char] = len(slots)
+        for pair in overrides:
+            for char in pair:
+                slots.setdefault(char, len(slots))
+        self.other = len(slots)
+        self.size = n = len(slots) + 1
+        self.slots: Mapping[str, int] = MappingProxyType(slots)
+
+        table = array('d', [1.0]) * (n * n)
+        key_index = layout.key_index
+        keys = [key_index.get(char) for char in slots]
+        fingers = [None if key is None else _finger(layout, key) for key in keys]
+        shifted = [layout.needs_shift(char) for char in slots]
+        for i, (key_a, finger_a) in enumerate(zip(keys, fingers)):
+            if key_a is None:
+                continue
+            for j, (key_b, finger_b) in enumerate(zip(keys, fingers)):
+                if key_b is None:
+                    continue
+                factor = self._key_factor(layout, key_a, finger_a, key_b, finger_b)
+                if shifted[j] and not shifted[i]:
+                    factor *= SHIFT_FACTOR
+                table[i * n + j] = min(high, max(low, factor / NORMALIZATION))
+        for (first, second), factor in overrides.items():
+            table[slots[first] * n + slots[second]] = min(high, max(low, factor))
+        self.table = memoryview(table).toreadonly()
+
+    @staticmethod
+    def _key_factor(layout: KeyboardLayout, key_a: int, finger_a: int,
+                    key_b: int, finger_b: int) -> float:
+        """Built-in factor for moving from physical key `key_a` to `key_b`."""
+        if key_a == key_b:
+            return SAME_KEY_FACTOR
+        travel = layout.travel_factors[key_a * layout.key_count + key_b]
+        if finger_a == THUMB or finger_b == THUMB:
+            return THUMB_FACTOR
+        if (finger_a < 4) != (finger_b < 4):
+            return ALTERNATE_HAND_FACTOR * travel
+        rows = abs(layout.positions[key_a][1] - layout.positions[key_b][1])
+        base = SAME_FINGER_FACTOR if finger_a == finger_b else SAME_HAND_FACTOR
+        return base * (1.0 + ROW_JUMP_FACTOR * rows) * travel
+
+    def factor(self, previous: str, char: str) -> float:
+        """Delay factor for typing `char` right after `previous`."""
+        slots = self.slots
+        return self.table[slots.get(previous, self.other) * self.size
+                          + slots.get(char, self.other)]
+
+    def __repr__(self) -> str:
+        return f"DigraphModel({self.layout.name!r}, overrides={len(self.overrides)})"
+
+
+@lru_cache(maxsize=None)
+def get_digraph_model(layout_name: str) -> DigraphModel:
+    """Return the shared built-in digraph model for a keyboard layout."""
+    return DigraphModel(get_layout(layout_name))
@@ -0,0 +1,257 @@
+"""
+Duration Estimates
+
+TypingEstimator predicts how long a text will take to type and how many
+keystrokes it will emit, as an expected value and a variance, without
+planning it. The planner's decisions are independent draws, so the cost of
+a word depends only on its length and the settings:
+
+- every keystroke delay is a uniform draw clipped at the minimum delay
+- a character costs one press, plus two keystrokes for a double-typed
+  character and two for a typo, each with its own correction delays
+- a word may have two characters swapped, which costs the characters from
+  the swap point twice, a backspace each and a correction pause
+- every word and space may be preceded by a thinking pause
+
+The moments of each word length are computed once per setting change, and
+the text only contributes a histogram of word lengths, so an estimate takes
+microseconds per KB of text and updating it after a slider moves does not
+touch the text at all. Digraph factors are taken as 1.0, their average
+over running text.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+
+try:
+    from .sampling import TypingSampler
+except ImportError:
+    from sampling import TypingSampler
+
+# (mean, variance) of a random cost
+Moments = Tuple[float, float]
+
+
+def add(*parts: Moments) -> Moments:
+    """Moments of a sum of independent costs."""
+    return sum(part[0] for part in parts), sum(part[1] for part in parts)
+
+
+def scale(part: Moments, count: float) -> Moments:
+    """Moments of the sum of `count` independent copies of a cost."""
+    return part[0] * count, part[1] * count
+
+
+def mixture(branches: Iterable[Tuple[float, Moments]]) -> Moments:
+    """Moments of a cost that takes branch i with probability p_i."""
+    mean = second = 0.0
+    for probability, (branch_mean, branch_variance) in branches:
+        mean += probability * branch_mean
+        second += probability * (branch_variance + branch_mean * branch_mean)
+    return mean, max(0.0, second - mean * mean)
+
+
+def clipped_uniform(low: float, high: float, floor: float) -> Moments:
+    """Moments of max(floor, U(low, high))."""
+    if high <= floor:
+        return floor, 0.0
+    if low >= floor:
+        return (low + high) / 2, (high - low) ** 2 / 12
+    clipped = (floor - low) / (high - low)
+    mean = clipped * floor + (1 - clipped) * (floor + high) / 2
+    second = clipped * floor ** 2 + (1 - clipped) * (floor ** 2 + floor * high + high ** 2) / 3
+    return mean, max(0.0, second - mean * mean)
+
+
+class TypingEstimator:
+    """Expected duration and keystroke count of typing a text, with variances."""
+
+    def __init__(self, typer=None):
+        """
+        Args:
+            typer: HumanTyper whose settings are used (call update_settings()
+                   after they change)
+        """
+        self.words: Counter = Counter()  # word length -> number of words
+        self.spaces = 0
+        self._tail = 0  # length of the partial word at the end of the text fed so far
+        self._lengths: Dict[int, Tuple[Moments, Moments]] = {}
+        if typer is not None:
+            self.update_settings(typer)
+
+    def update_settings(self, typer):
+        """Snapshot the typer's settings; the text histogram is kept."""
+        sampler = TypingSampler(typer, use_numpy=False)
+        self.delay = clipped_uniform(sampler.base_delay - sampler.delay_spread,
+                                     sampler.base_delay + sampler.delay_spread,
+                                     sampler.min_delay)
+        self.throughput = typer.throughput_cpm is not None
+        self.burst_length = typer.burst_length
+        self.burst_error_probability = sampler.burst_error_probability
+        self.burst_pause = self._pause(1.0, sampler.burst_pause_range)
+        self.pause = self._pause(sampler.pause_probability, sampler.pause_range)
+        self.typo_probability = sampler.typo_probability
+        self.correction_probability = sampler.correction_probability
+        self.double_char_probability = sampler.double_char_probability
+        self.char_swap_probability = sampler.char_swap_probability
+        self.char = self._char_moments()
+        self._lengths.clear()
+
+    @staticmethod
+    def _pause(probability: float, pause_range: Tuple[float, float]) -> Moments:
+        low, high = pause_range
+        return mixture(((probability, ((low + high) / 2, (high - low) ** 2 / 12)),
+                        (1 - probability, (0.0, 0.0))))
+
+    def _delays(self, *factors: float) -> Moments:
+        """Moments of a sum of independent delays, each scaled by its factor."""
+        mean, variance = self.delay
+        return mean * sum(factors), variance * sum(f * f for f in factors)
+
+    def _char_moments(self) -> Tuple[Moments, Moments]:
+        """(time, keystrokes) moments of one character (HumanTyper._type_character)."""
+        nothing = (0.0, 0.0)
+        correct = self.correction_probability
+        double = mixture(((self.double_char_probability, self._delays(1, 0.5)),
+                          (1 - self.double_char_probability, nothing)))
+        typo = mixture(((self.typo_probability,
+                         mixture(((correct, self._delays(1, 0.5)),
+                                  (1 - correct, self._delays(1, 0.3, 0.5))))),
+                        (1 - self.typo_probability, nothing)))
+        time = add(self._delays(1), double, typo)
+        keys = add((1.0, 0.0),
+                   mixture(((self.double_char_probability, (2.0, 0.0)),
+                            (1 - self.double_char_probability, nothing))),
+                   mixture(((self.typo_probability, (2.0, 0.0)),
+                            (1 - self.typo_probability, nothing))))
+        return time, keys
+
+    def _word_moments(self, length: int) -> Tuple[Moments, Moments]:
+        """(time, keystrokes) moments of a word (HumanTyper._type_word), cached by length."""
+        cached = self._lengths.get(length)
+        if cached is not None:
+            return cached
+        char_time, char_keys = self.char
+        plain = (scale(char_time, length), scale(char_keys, length))
+        if length < 2 or not self.char_swap_probability:
+            self._lengths[length] = plain
+            return plain
+
+        # The swap point is uniform over the first length - 1 characters, so
+        # the m characters deleted and typed again are uniform over 2..length.
+        # A branch's mean is linear in m and its second moment quadratic, so
+        # the mixture over all m equals an even mixture of the two points
+        # m = mean(m) -/+ std(m), which keeps this O(1) in the word length
+        middle = (length + 2) / 2
+        spread = ((length - 1) ** 2 - 1) ** 0.5 / (12 ** 0.5)
+        swapped = [self._swap_moments(length, middle + sign * spread) for sign in (-1, 1)]
+        swap = self.char_swap_probability
+        moments = (mixture(((swap, mixture((0.5, branch[0]) for branch in swapped)),
+                            (1 - swap, plain[0]))),
+                   mixture(((swap, mixture((0.5, branch[1]) for branch in swapped)),
+                            (1 - swap, plain[1]))))
+        self._lengths[length] = moments
+        return moments
+
+    def _swap_moments(self, length: int, retyped: float) -> Tuple[Moments, Moments]:
+        """(time, keystrokes) moments of a swapped word that retypes `retyped` characters."""
+        char_time, char_keys = self.char
+        mean, variance = self.delay
+        correct = self.correction_probability
+        # Noticed swaps: a 0.3 delay per backspace and a 2 delay pause; late
+        # ones: a 0.2 delay per backspace
+        deletes = mixture(((correct, (mean * (0.3 * retyped + 2), variance * (0.09 * retyped + 4))),
+                           (1 - correct, (mean * 0.2 * retyped, variance * 0.04 * retyped))))
+        time = add(scale(char_time, length + retyped), self._delays(1, 1), deletes)
+        keys = scale(char_keys, length + retyped)
+        return time, (keys[0] + retyped, keys[1])
+
+    def set_text(self, text: str):
+        """Replace the text being estimated."""
+        self.words = Counter()
+        self.spaces = 0
+        self._tail = 0
+        self.feed(text)
+
+    def feed(self, chunk: str):
+        """
+        Append a chunk of text, as when a file is loaded piece by piece.
+
+        A word split across chunks is counted once: the length of the
+        chunk's last partial word is carried into the next chunk (or counted
+        as is by estimate()).
+        """
+        first = chunk.find(' ')
+        if first < 0:
+            self._tail += len(chunk)
+            return
+        lengths = Counter(map(len, chunk.split(' ')))
+        # The first piece continues the carried word and the last one is
+        # carried on; empty pieces are runs of spaces
+        head, tail = self._tail + first, len(chunk) - chunk.rfind(' ') - 1
+        lengths[first] -= 1
+        lengths[tail] -= 1
+        lengths[head] += 1
+        lengths.pop(0, None)
+        self.words.update(+lengths)
+        self.spaces += chunk.count(' ')
+        self._tail = tail
+
+    def estimate(self) -> Dict:
+        """
+        Expected duration and keystrokes of typing the current text.
+
+        Returns:
+            Dict: characters, words, duration and keystrokes (expected
+                  values) and their standard deviations and variances
+        """
+        histogram = self.words
+        if self._tail:
+            histogram = histogram.copy()
+            histogram[self._tail] += 1
+        characters = self.spaces + sum(length * count for length, count in histogram.items())
+        words = sum(histogram.values())
+        if self.throughput:
+            time, keys = self._throughput_moments(characters, histogram)
+        else:
+            parts = [self._word_moments(length) for length in histogram]
+            time = add(scale(add(self.delay, self.pause), self.spaces),
+                       scale(self.pause, words),
+                       *(scale(part[0], count) for part, count in zip(parts, histogram.values())))
+            keys = add((float(self.spaces), 0.0),
+                       *(scale(part[1], count) for part, count in zip(parts, histogram.values())))
+        return {
+            'characters': characters,
+            'words': words,
+            'duration': time[0],
+            'duration_std': time[1] ** 0.5,
+            'duration_variance': time[1],
+            'keystrokes': keys[0],
+            'keystrokes_std': keys[1] ** 0.5,
+            'keystrokes_variance': keys[1],
+        }
+
+    def _throughput_moments(self, characters: int,
+                            histogram: Counter) -> Tuple[Moments, Moments]:
+        """(time, keystrokes) moments in throughput mode: bursts with or without errors."""
+        if not characters:
+            return (0.0, 0.0), (0.0, 0.0)
+        bursts = characters / self.burst_length
+        errors = self.burst_error_probability
+        char_time, char_keys = self.char
+        # Bursts with errors plan words, so they also swap characters; each
+        # word's swap cost is spread evenly over the text's characters
+        swap_time = swap_keys = (0.0, 0.0)
+        for length, count in histogram.items():
+            word_time, word_keys = self._word_moments(length)
+            share = count * self.burst_length / characters
+            swap_time = add(swap_time, scale(add(word_time, scale(char_time, -length)), share))
+            swap_keys = add(swap_keys, scale(add(word_keys, scale(char_keys, -length)), share))
+        burst_time = mixture(((errors, add(scale(char_time, self.burst_length), swap_time)),
+                              (1 - errors, scale(self.delay, self.burst_length))))
+        burst_keys = mixture(((errors, add(scale(char_keys, self.burst_length), swap_keys)),
+                              (1 - errors, (float(self.burst_length), 0.0))))
+        pauses = max(0.0, -(-characters // self.burst_length) - 1)
+        return (add(scale(burst_time, bursts), scale(self.burst_pause, pauses)),
+                scale(burst_keys, bursts))
+
@@ -8,43 +8,90 @@ simulation to work with any application.
 Cross-platform support for Windows, macOS, and Linux.
 """
 
+import os
 import random
 import time
-import sys
 import threading
-import platform
-from typing import List, Dict, Optional, Callable
+from typing import Dict, Iterable, Mapping, Optional, Callable, Union
 
 try:
-    from pynput import keyboard
-    from pynput.keyboard import Key, Listener, KeyCode
-    PYNPUT_AVAILABLE = True
+    from .typing_plan import TypingPlan, ACTION_PRESS, ACTION_BACKSPACE
+    from .scheduler import SCHEDULERS, DeadlineScheduler, SessionControl, VirtualClock
+    from .text_stream import TOKEN_PATTERN, iter_tokens, iter_file_chunks, utf8_length
+    from .sinks import OutputSink, KeyboardSink, ConsoleSink, PYNPUT_AVAILABLE
+    from .sampling import TypingSampler, PAUSE_RANGE, BURST_LENGTH, BURST_PAUSE_RANGE
+    from .progress import ProgressCounter
+    from .metrics import SessionMetrics
+    from .tracing import Tracer, DEFAULT_CAPACITY
+    from .session_log import SessionLog, DEFAULT_LOG_CAPACITY, replay
+    from .shadow import ShadowDocument
+    from .estimator import TypingEstimator
+    from .pacing import (PaceController, PACE_SCALE_RANGE, SOLVER_SAMPLE_CHARS,
+                         TIME_BUDGET_SPEED_RANGE, TIME_BUDGET_TOLERANCE)
+    from .layouts import KeyboardLayout, get_layout
+    from .digraphs import DigraphModel, get_digraph_model
+    from .profiles import TypingProfile, load_profile
 except ImportError:
-    PYNPUT_AVAILABLE = False
-    print("Warning: pynput not installed. Install with: pip install pynput")
-    print("Falling back to console output mode.")
+    from typing_plan import TypingPlan, ACTION_PRESS, ACTION_BACKSPACE
+    from scheduler import SCHEDULERS, DeadlineScheduler, SessionControl, VirtualClock
+    from text_stream import TOKEN_PATTERN, iter_tokens, iter_file_chunks, utf8_length
+    from sinks import OutputSink, KeyboardSink, ConsoleSink, PYNPUT_AVAILABLE
+    from sampling import TypingSampler, PAUSE_RANGE, BURST_LENGTH, BURST_PAUSE_RANGE
+    from progress import ProgressCounter
+    from metrics import SessionMetrics
+    from tracing import Tracer, DEFAULT_CAPACITY
+    from session_log import SessionLog, DEFAULT_LOG_CAPACITY, replay
+    from shadow import ShadowDocument
+    from estimator import TypingEstimator
+    from pacing import (PaceController, PACE_SCALE_RANGE, SOLVER_SAMPLE_CHARS,
+                        TIME_BUDGET_SPEED_RANGE, TIME_BUDGET_TOLERANCE)
+    from layouts import KeyboardLayout, get_layout
+    from digraphs import DigraphModel, get_digraph_model
+    from profiles import TypingProfile, load_profile
+
+# Events planned ahead of the keyboard when typing a stream
+STREAM_BATCH_EVENTS = 512
 
 
 class HumanTyper:
     """Simulates human typing with realistic behavior patterns using actual keyboard input."""
     
-    def __init__(self, use_keyboard: bool = True):
+    def __init__(self, use_keyboard: bool = True, sink: Optional[OutputSink] = None,
+                 seed: Optional[int] = None,
+                 profile: Optional[Union[TypingProfile, str]] = None):
         """
         Initialize the HumanTyper.
         
         Args:
             use_keyboard: Whether to use actual keyboard simulation (requires pynput)
+            sink: Where keystrokes are sent. Defaults to the keyboard, or a
+                  buffered console when keyboard simulation is unavailable.
+            seed: Seed for typing decisions. With a seed, every session of the
+                  same text produces the same keystroke sequence.
+            profile: Recorded typing profile (or the path of a profile file)
+                     whose speed, errors, pauses and digraph timing are applied
         """
-        # Initialize keyboard controller if available
-        self.use_keyboard = use_keyboard and PYNPUT_AVAILABLE
-        if self.use_keyboard:
-            self.keyboard_controller = keyboard.Controller()
-        else:
-            self.keyboard_controller = None
-            if use_keyboard:
-                print("Note: Keyboard simulation not available. Using console output.")
+        # Initialize keyboard controller if available; pynput is imported
+        # here rather than at module import so console-only use never loads it
+        self.keyboard_controller = None
+        if use_keyboard and PYNPUT_AVAILABLE:
+            try:
+                from pynput.keyboard import Controller
+                self.keyboard_controller = Controller()
+            except ImportError:  # installed, but no usable backend (e.g. no display)
+                pass
+        self.use_keyboard = self.keyboard_controller is not None
+        if use_keyboard and not self.use_keyboard:
+            print("Note: Keyboard simulation not available (pip install pynput). "
+                  "Using console output.")
         
-        # Hotkey control
+        # Output destination for keystrokes
+        if sink is None:
+            sink = KeyboardSink(self.keyboard_controller) if self.use_keyboard else ConsoleSink()
+        self.sink = sink
+        
+        # Hotkey control; stop and pause wake the typing thread immediately
+        self._control = SessionControl()
         self.is_typing = False
         self.should_stop = False
         self.typing_thread = None
@@ -55,23 +102,35 @@ class HumanTyper:
         self.on_stop_callback: Optional[Callable] = None
         self.on_progress_callback: Optional[Callable[[int, int], None]] = None
         
-        # Define keyboard layout for adjacent key errors (QWERTY)
-        self.keyboard_layout = {
-            'q': ['w', 'a', 's'], 'w': ['q', 'e', 's', 'd'], 'e': ['w', 'r', 'd', 'f'],
-            'r': ['e', 't', 'f', 'g'], 't': ['r', 'y', 'g', 'h'], 'y': ['t', 'u', 'h', 'j'],
-            'u': ['y', 'i', 'j', 'k'], 'i': ['u', 'o', 'k', 'l'], 'o': ['i', 'p', 'l'],
-            'p': ['o', 'l'], 'a': ['q', 's', 'z'], 's': ['a', 'd', 'z', 'x'],
-            'd': ['s', 'f', 'x', 'c'], 'f': ['d', 'g', 'c', 'v'], 'g': ['f', 'h', 'v', 'b'],
-            'h': ['g', 'j', 'b', 'n'], 'j': ['h', 'k', 'n', 'm'], 'k': ['j', 'l', 'm'],
-            'l': ['k', 'o', 'p'], 'z': ['a', 's', 'x'], 'x': ['z', 's', 'd', 'c'],
-            'c': ['x', 'd', 'f', 'v'], 'v': ['c', 'f', 'g', 'b'], 'b': ['v', 'g', 'h', 'n'],
-            'n': ['b', 'h', 'j', 'm'], 'm': ['n', 'j', 'k'], ' ': ['n', 'b', 'v', 'c']
-        }
+        # Latest progress, for displays that poll at their own frame rate
+        self.progress = ProgressCounter()
+        
+        # What the target should contain after the keystrokes sent so far,
+        # and the type_text() text it is meant to end up with
+        self.shadow = ShadowDocument()
+        self._session_text: Optional[str] = None
+        
+        # Instrumentation of the current or last session
+        self._metrics: Optional[SessionMetrics] = None
+        self._matched_before = 0  # shadow.matched when the session started
+        self.tracer: Optional[Tracer] = None  # set by enable_tracing()
+        self.session_log: Optional[SessionLog] = None  # set by enable_session_log()
+        
+        # Typing decisions are drawn in batches from a per-session sampler
+        # seeded from this instance, never from the shared random module
+        self.seed = seed
+        self._sampler: Optional[TypingSampler] = None
+        
+        # Keyboard geometry for adjacent key errors and finger travel; layouts
+        # are built once per process and shared by all instances
+        self.layout: KeyboardLayout = get_layout('qwerty')
+        self.digraphs: DigraphModel = get_digraph_model('qwerty')
         
         # Typing speed configuration (characters per minute)
         self.base_speed = 200  # Base typing speed
         self.speed_variance = 50  # Speed can vary by this amount
         self.pause_probability = 0.05  # Probability of a thinking pause
+        self.pause_range = PAUSE_RANGE  # Shortest and longest thinking pause (seconds)
         
         # Error configuration
         self.typo_probability = 0.08  # Probability of making a typo
@@ -79,205 +138,612 @@ class HumanTyper:
         self.double_char_probability = 0.03  # Probability of double-typing a character
         self.char_swap_probability = 0.02  # Probability of swapping adjacent characters
         
+        # Throughput mode for bulk entry (off while throughput_cpm is None):
+        # uncapped speed in bursts, with the error model on some bursts only
+        self.throughput_cpm: Optional[float] = None
+        self.burst_length = BURST_LENGTH
+        self.burst_pause_range = BURST_PAUSE_RANGE
+        self.burst_error_probability = 0.0
+        self._burst_remaining = 0
+        self._burst_errors = False
+        
+        # Timing configuration
+        self.timing_mode = 'deadline'  # 'deadline' (absolute, drift-free) or 'relative'
+        self.last_timing: Optional[Dict] = None  # Scheduler report from the last run
+        self.time_budget: Optional[Dict] = None  # Settings solved by solve_time_budget()
+        self._budget_settings: Dict = {}  # attribute -> solved value, for budgeted sessions
+        
+        if profile is not None:
+            self.apply_profile(profile)
+        self.last_stop_latency: Optional[float] = None  # Seconds the last stop_typing() took
+    
+    @property
+    def should_stop(self) -> bool:
+        """Whether the current session has been asked to stop."""
+        return self._control.stopped
+    
+    @should_stop.setter
+    def should_stop(self, value: bool):
+        if value:
+            self._control.stop()
+        else:
+            self._control.reset()
+    
+    @property
+    def keyboard_layout(self):
+        """Read-only map of each character to its neighboring keys."""
+        return self.layout.neighbors
+    
+    @property
+    def is_paused(self) -> bool:
+        """Whether typing is paused."""
+        return self._control.paused
+        
     def _get_typing_delay(self) -> float:
         """Calculate realistic typing delay between characters."""
-        # Base delay from typing speed (convert CPM to seconds per character)
-        base_delay = 60.0 / self.base_speed
-        
-        # Add natural variation
-        variation = random.uniform(-self.speed_variance/self.base_speed, 
-                                 self.speed_variance/self.base_speed)
-        delay = base_delay + variation
-        
-        # Ensure minimum delay
-        return max(0.05, delay)
-    
-    def _should_make_typo(self) -> bool:
-        """Determine if a typo should be made."""
-        return random.random() < self.typo_probability
-    
-    def _get_adjacent_key_error(self, char: str) -> str:
-        """Get a random adjacent key for the given character."""
-        char_lower = char.lower()
-        if char_lower in self.keyboard_layout:
-            adjacent_keys = self.keyboard_layout[char_lower]
-            error_char = random.choice(adjacent_keys)
-            return error_char.upper() if char.isupper() else error_char
-        return char
+        return self._sampler.delay()
     
-    def _simulate_thinking_pause(self):
-        """Simulate a natural thinking pause."""
-        if random.random() < self.pause_probability:
-            pause_duration = random.uniform(0.5, 2.0)
-            time.sleep(pause_duration)
+    def _get_adjacent_key_error(self, char: str, pick: float) -> str:
+        """
+        Get an adjacent key for the given character.
+        
+        Args:
+            char: The intended character
+            pick: Uniform draw in [0, 1) selecting which neighbor is hit
+        """
+        neighbors = self.layout.neighbors
+        adjacent_keys = neighbors.get(char)
+        if adjacent_keys:
+            return adjacent_keys[int(pick * len(adjacent_keys))]
+        
+        # Capitals the layout can't shift directly (e.g. 'É' on AZERTY)
+        adjacent_keys = neighbors.get(char.lower())
+        if adjacent_keys:
+            return adjacent_keys[int(pick * len(adjacent_keys))].upper()
+        return char
     
-    def _output_character(self, char: str):
-        """Output a character either via keyboard simulation or console."""
-        if self.should_stop:
-            return
-            
-        if self.use_keyboard and self.keyboard_controller:
-            try:
-                # Handle special characters based on platform
-                if char == '\n':
-                    self.keyboard_controller.press(Key.enter)
-                    self.keyboard_controller.release(Key.enter)
-                elif char == '\t':
-                    self.keyboard_controller.press(Key.tab)
-                    self.keyboard_controller.release(Key.tab)
-                else:
-                    self.keyboard_controller.press(char)
-                    self.keyboard_controller.release(char)
-            except Exception as e:
-                print(f"Error typing character '{char}': {e}")
-        else:
-            print(char, end='', flush=True)
+    def _simulate_thinking_pause(self, plan: TypingPlan):
+        """Plan a natural thinking pause."""
+        pause_duration = self._sampler.pause()
+        if pause_duration:
+            plan.pause(pause_duration)
+            if self.tracer is not None:
+                self.tracer.instant('thinking_pause', {'seconds': pause_duration})
     
-    def _output_backspace(self):
-        """Output a backspace either via keyboard simulation or console."""
-        if self.should_stop:
-            return
-            
-        if self.use_keyboard and self.keyboard_controller:
-            self.keyboard_controller.press(Key.backspace)
-            self.keyboard_controller.release(Key.backspace)
-        else:
-            print('\b \b', end='', flush=True)
+    def _press(self, plan: TypingPlan, char: str):
+        """Plan a key press, scaling the gap before it by the digraph factor from the last key."""
+        if plan.actions:
+            if plan.actions[-1] == ACTION_PRESS:
+                plan.stretch_gap(self.digraphs.factor(chr(plan.keys[-1]), char))
+        elif plan.previous is not None and plan.previous[1] == ACTION_PRESS:
+            # First key of a continued batch: the gap runs from the previous batch
+            plan.stretch_gap(self.digraphs.factor(chr(plan.previous[0]), char))
+        plan.press(char)
     
-    def _type_character(self, char: str, target_char: str) -> bool:
+    def _type_character(self, plan: TypingPlan, char: str, target_char: str) -> bool:
         """
-        Type a single character with potential errors.
+        Plan a single character with potential errors.
         
         Args:
+            plan: The plan receiving the keystroke events
             char: The character to type (may include errors)
             target_char: The target character we want to end up with
             
         Returns:
             bool: True if we ended up with the correct character
         """
-        if self.should_stop:
-            return False
-            
+        delay = self._sampler.delay
+        double_char, typo, correct_now, pick = self._sampler.char_decision()
+        
         # Check for double character
-        if random.random() < self.double_char_probability:
-            self._output_character(char)
-            time.sleep(self._get_typing_delay())
+        if double_char:
+            self._press(plan, char)
+            plan.wait(delay())
             # Output backspace to remove the double character
-            self._output_backspace()
-            time.sleep(self._get_typing_delay() * 0.5)
+            plan.backspace()
+            plan.wait(delay() * 0.5)
+            plan.stats['double_chars'] += 1
+            plan.stats['corrections'] += 1
+            if self.tracer is not None:
+                self.tracer.instant('double_char', {'char': char})
         
         # Check for typo
-        if self._should_make_typo() and char == target_char:
+        if typo and char == target_char:
             # Type wrong character first
-            wrong_char = self._get_adjacent_key_error(char)
-            self._output_character(wrong_char)
-            time.sleep(self._get_typing_delay())
+            wrong_char = self._get_adjacent_key_error(char, pick)
+            self._press(plan, wrong_char)
+            plan.wait(delay())
+            plan.stats['typos'] += 1
+            if self.tracer is not None:
+                self.tracer.instant('typo', {'char': char, 'typed': wrong_char})
             
             # Always correct the typo to ensure we end up with the right text
-            if random.random() < self.correction_probability:
+            if correct_now:
                 # Backspace and correct immediately
-                self._output_backspace()
-                time.sleep(self._get_typing_delay() * 0.5)
+                plan.backspace()
+                plan.wait(delay() * 0.5)
             else:
                 # Still need to correct to match target, just with a slight delay
-                time.sleep(self._get_typing_delay() * 0.3)
-                self._output_backspace()
-                time.sleep(self._get_typing_delay() * 0.5)
+                plan.wait(delay() * 0.3)
+                plan.backspace()
+                plan.wait(delay() * 0.5)
+            plan.stats['corrections'] += 1
         
         # Type the correct character
-        self._output_character(target_char)
-        time.sleep(self._get_typing_delay())
+        self._press(plan, target_char)
+        plan.wait(delay())
         
         return True
     
-    def _type_word(self, word: str) -> bool:
+    def _type_word(self, plan: TypingPlan, word: str) -> bool:
         """
-        Type a complete word with potential character swapping.
+        Plan a complete word with potential character swapping.
         
         Args:
+            plan: The plan receiving the keystroke events
             word: The target word to type
             
         Returns:
-            bool: True if word was typed successfully
+            bool: True if word was planned successfully
         """
-        if self.should_stop:
-            return False
-            
         if len(word) < 2:
             for char in word:
-                if self.should_stop:
-                    return False
-                self._type_character(char, char)
+                self._type_character(plan, char, char)
             return True
         
         # Check for character swapping within the word
-        if random.random() < self.char_swap_probability:
+        swap, pick, correct_now = self._sampler.swap_decision()
+        if swap:
             # Choose two adjacent characters to swap
-            swap_index = random.randint(0, len(word) - 2)
+            swap_index = int(pick * (len(word) - 1))
+            plan.stats['swaps'] += 1
+            if self.tracer is not None:
+                self.tracer.instant('swap', {'word': word, 'index': swap_index})
             
             # Type characters up to the swap point normally
             for i in range(swap_index):
-                if self.should_stop:
-                    return False
-                self._type_character(word[i], word[i])
+                self._type_character(plan, word[i], word[i])
             
             # Type the swapped characters
-            self._type_character(word[swap_index + 1], word[swap_index + 1])
-            time.sleep(self._get_typing_delay())
-            self._type_character(word[swap_index], word[swap_index])
-            time.sleep(self._get_typing_delay())
+            self._type_character(plan, word[swap_index + 1], word[swap_index + 1])
+            plan.wait(self._get_typing_delay())
+            self._type_character(plan, word[swap_index], word[swap_index])
+            plan.wait(self._get_typing_delay())
             
             # Type the rest normally
             for i in range(swap_index + 2, len(word)):
-                if self.should_stop:
-                    return False
-                self._type_character(word[i], word[i])
+                self._type_character(plan, word[i], word[i])
             
-            # Maybe notice and correct the swap
-            if random.random() < self.correction_probability:
-                # Backspace to the swap point
-                chars_to_delete = len(word) - swap_index
+            # Backspace to the swap point; noticed swaps are fixed a bit more
+            # deliberately than ones caught late
+            chars_to_delete = len(word) - swap_index
+            if correct_now:
                 for _ in range(chars_to_delete):
-                    if self.should_stop:
-                        return False
-                    self._output_backspace()
-                    time.sleep(self._get_typing_delay() * 0.3)
+                    plan.backspace()
+                    plan.wait(self._get_typing_delay() * 0.3)
                 
                 # Brief pause before retyping
-                time.sleep(self._get_typing_delay() * 2)
-                
-                # Retype correctly from the swap point
-                for i in range(swap_index, len(word)):
-                    if self.should_stop:
-                        return False
-                    self._type_character(word[i], word[i])
+                plan.wait(self._get_typing_delay() * 2)
             else:
-                # Still need to correct to ensure final text matches
-                # Backspace the swapped portion and retype correctly
-                chars_to_delete = len(word) - swap_index
                 for _ in range(chars_to_delete):
-                    if self.should_stop:
-                        return False
-                    self._output_backspace()
-                    time.sleep(self._get_typing_delay() * 0.2)
-                
-                # Retype correctly
-                for i in range(swap_index, len(word)):
-                    if self.should_stop:
-                        return False
-                    self._type_character(word[i], word[i])
+                    plan.backspace()
+                    plan.wait(self._get_typing_delay() * 0.2)
+            plan.stats['corrections'] += 1
+            
+            # Retype correctly from the swap point
+            for i in range(swap_index, len(word)):
+                self._type_character(plan, word[i], word[i])
             
             return True
         else:
             # Type normally
             for char in word:
-                if self.should_stop:
-                    return False
-                self._type_character(char, char)
+                self._type_character(plan, char, char)
             return True
     
-    def _typing_worker(self, text: str):
+    def _begin_session(self, seed: Optional[int] = None):
+        """
+        Snapshot the current settings into a fresh sampler for a new session.
+        
+        Args:
+            seed: Seed for this session only (defaults to the instance seed;
+                  unseeded sessions draw fresh entropy)
+        """
+        if seed is None:
+            seed = self.seed
+        self._sampler = TypingSampler(self, random.Random(seed))
+        self._burst_remaining = 0
+    
+    def _plan_burst_token(self, plan: TypingPlan, token: str):
+        """
+        Append the keystroke events for one token in throughput mode.
+        
+        The token is split where bursts end; in bursts typed with errors each
+        piece is planned as a word, so it may get typos and swaps.
+        """
+        delay = self._sampler.delay
+        stats = plan.stats
+        stats.setdefault('burst_pause_time', 0.0)
+        start = 0
+        while start < len(token):
+            if not self._burst_remaining:
+                pause, self._burst_errors = self._sampler.burst_decision()
+                if plan.offsets or plan.duration:
+                    plan.pause(pause)
+                    stats['burst_pause_time'] += pause
+                self._burst_remaining = self.burst_length
+            piece = token[start:start + self._burst_remaining]
+            start += len(piece)
+            self._burst_remaining -= len(piece)
+            if self._burst_errors:
+                self._type_word(plan, piece)
+            else:
+                for char in piece:
+                    self._press(plan, char)
+                    plan.wait(delay())
+    
+    def _plan_token(self, plan: TypingPlan, token: str):
+        """Append the keystroke events for one word or space to `plan`."""
+        if self.throughput_cpm is not None:
+            self._plan_burst_token(plan, token)
+            return
+        
+        # Add thinking pauses occasionally
+        self._simulate_thinking_pause(plan)
+        
+        if token == ' ':
+            # Handle space
+            self._press(plan, ' ')
+            plan.wait(self._get_typing_delay())
+        elif self.tracer is not None:
+            started = self.tracer.now()
+            self._type_word(plan, token)
+            self.tracer.complete('plan_word', started, args={'word': token[:64]})
+        else:
+            self._type_word(plan, token)
+    
+    def compile_plan(self, text: str, seed: Optional[int] = None) -> TypingPlan:
+        """
+        Compile text into a keystroke plan using the current settings.
+        
+        All random decisions are made here, so the plan can be replayed
+        with execute_plan() without any work between keystrokes.
+        
+        Args:
+            text: The text to plan (the plan always ends with exactly this text)
+            seed: Seed for this plan only (defaults to the instance seed)
+            
+        Returns:
+            TypingPlan: The compiled timeline of keystroke events
+        """
+        self._begin_session(seed)
+        plan = TypingPlan()
+        for token in TOKEN_PATTERN.findall(text):
+            self._plan_token(plan, token)
+            plan.completed += len(token)
+        return plan
+    
+    def _event_sender(self, plan: TypingPlan, scheduler, total: int,
+                      pace: Optional[PaceController] = None):
+        """
+        Per-event steps of running `plan`, shared by the threaded and asyncio executors.
+        
+        Returns:
+            tuple: prepare(planned) maps a planned offset to the scheduler
+                   offset to wait for, flushing the sink before long waits;
+                   send(code, action, planned, offset, completed) emits the
+                   event once the wait is over and records and publishes it
+        """
+        sink = self.sink
+        flush = sink.flush
+        output_character = sink.write
+        output_backspace = sink.backspace
+        publish_progress = self.progress.publish
+        publish_eta = self.progress.publish_eta
+        on_progress = self.on_progress_callback
+        record = self._metrics.record
+        clock_ns = time.perf_counter_ns
+        tracer = self.tracer
+        session_log = self.session_log
+        scheduler_ns = scheduler.clock.now_ns
+        shadow_write = self.shadow.write
+        shadow_backspace = self.shadow.backspace
+        # The pace controller gets the exact end once the last batch is planned
+        planned_end = plan.offsets[-1] if plan.offsets and plan.completed >= total else None
+        
+        # Buffered sinks are flushed before any wait long enough to be noticed
+        flush_interval = sink.flush_interval
+        if flush_interval is None:
+            flush_interval = float('inf')
+        last_offset = scheduler.last_offset
+        last_progress = -1
+        wait_started = 0
+        
+        def prepare(planned: float) -> float:
+            nonlocal last_offset, wait_started
+            offset = planned if pace is None else pace.map(planned)
+            if offset - last_offset >= flush_interval:
+                flush()
+            last_offset = offset
+            if tracer is not None:
+                wait_started = clock_ns()
+            return offset
+        
+        def send(code: int, action: int, planned: float, offset: float, completed: int):
+            nonlocal last_progress
+            sent_ns = clock_ns()
+            if action == ACTION_BACKSPACE:
+                output_backspace()
+                done_ns = clock_ns()
+                shadow_backspace()
+            else:
+                output_character(chr(code))
+                done_ns = clock_ns()
+                shadow_write(chr(code))
+            record(offset, sent_ns, done_ns)
+            if session_log is not None:
+                session_log.record(code, action, scheduler_ns() - scheduler.origin_ns)
+            if tracer is not None:
+                tracer.complete('wait', wait_started, sent_ns, {'offset': offset})
+                tracer.complete('output', sent_ns, done_ns,
+                                {'key': '\b' if action == ACTION_BACKSPACE else chr(code)})
+            
+            # Update progress
+            if completed != last_progress:
+                last_progress = completed
+                if pace is not None:
+                    pace.update(completed, planned, scheduler.elapsed(), planned_end)
+                    publish_eta(pace.eta)
+                publish_progress(completed, total)
+                if on_progress:
+                    on_progress(completed, total)
+        
+        return prepare, send
+    
+    def _run_plan(self, plan: TypingPlan, scheduler, total: int,
+                  pace: Optional[PaceController] = None) -> bool:
+        """
+        Send the events of `plan` on the scheduler's clock, returning False if stopped.
+        
+        With a pace controller, planned offsets are mapped onto its real
+        timeline, and it is updated (and the ETA published) as progress is made.
+        """
+        prepare, send = self._event_sender(plan, scheduler, total, pace)
+        wait_until = scheduler.wait_until
+        control = self._control
+        
+        for code, action, planned, completed in zip(plan.keys, plan.actions,
+                                                    plan.offsets, plan.progress):
+            if control.stopped:
+                return False
+            offset = prepare(planned)
+            wait_until(offset)
+            if control.stopped:
+                return False
+            send(code, action, planned, offset, completed)
+        
+        return not control.stopped
+    
+    def _run_batch(self, plan: TypingPlan, scheduler, total: int,
+                   pace: Optional[PaceController] = None) -> bool:
+        """Run one batch of a streamed session, traced as a span when tracing."""
+        if self.tracer is None:
+            return self._run_plan(plan, scheduler, total, pace)
+        started = self.tracer.now()
+        try:
+            return self._run_plan(plan, scheduler, total, pace)
+        finally:
+            self.tracer.complete('run_batch', started, args={'events': len(plan)})
+    
+    def _start_session_metrics(self, total: int):
+        """
+        Reset progress and instrumentation for a new session.
+        
+        Call it once the shadow document is set up for the session: the
+        characters typed are counted from its matched prefix.
+        """
+        self.progress.reset(total)
+        self._matched_before = self.shadow.matched
+        self._metrics = SessionMetrics(self.throughput_cpm or self.base_speed)
+    
+    def _end_session(self, scheduler, stats: Dict, finished: bool, done: int,
+                     measure_cpu: bool = True):
+        """Record the timing report, final progress and metrics of a session."""
+        self.last_timing = scheduler.report()
+        if self.session_log is not None:
+            self.session_log.flush()
+        if finished:
+            if self.progress.eta() is not None:
+                self.progress.publish_eta(0.0)
+            self.progress.publish(done, done)
+            if self.on_progress_callback:
+                self.on_progress_callback(done, done)
+        # Characters, not progress units (bytes for streams)
+        self._metrics.finish(stats, self.shadow.matched - self._matched_before, measure_cpu)
+    
+    def _start_scheduler(self):
+        """Create a scheduler for the configured timing mode and start its clock."""
+        scheduler = SCHEDULERS[self.timing_mode](control=self._control)
+        self.last_timing = None
+        scheduler.start()
+        if self.session_log is not None:
+            self.session_log.begin()
+        return scheduler
+    
+    def execute_plan(self, plan: TypingPlan) -> bool:
+        """
+        Replay a compiled plan in the calling thread.
+        
+        Args:
+            plan: A plan produced by compile_plan()
+            
+        Returns:
+            bool: True if every event was sent, False if typing was stopped
+        """
+        self.sink.prepare({chr(code) for code, action in zip(plan.keys, plan.actions)
+                           if action == ACTION_PRESS})
+        self.shadow.reset(plan.final_text())
+        self._start_session_metrics(plan.completed)
+        self.is_typing = True
+        self.should_stop = False
+        try:
+            scheduler = self._start_scheduler()
+            try:
+                finished = self._run_plan(plan, scheduler, plan.completed)
+            finally:
+                self.sink.flush()
+            
+            self._end_session(scheduler, plan.stats, finished, plan.completed)
+        finally:
+            self.is_typing = False
+        return finished
+    
+    def replay(self, log: Union[str, bytes]) -> bool:
+        """
+        Re-send a logged session's keystrokes at their recorded times.
+        
+        No planning or random draws are involved, so the sink receives
+        exactly the logged keystroke stream. With a session log enabled the
+        replay is logged too, for a byte-for-byte comparison.
+        
+        Args:
+            log: Log file path or contents (the log must not be this
+                 typer's own session log)
+            
+        Returns:
+            bool: True if every keystroke was sent, False if typing was stopped
+        """
+        scheduler = SCHEDULERS[self.timing_mode](control=self._control)
+        self.is_typing = True
+        self.should_stop = False
+        try:
+            report = replay(log, self.sink, scheduler, self.session_log)
+        finally:
+            self.is_typing = False
+        self.last_timing = scheduler.report()
+        return report['finished']
+    
+    def simulate(self, text: str, seed: Optional[int] = None) -> Dict:
+        """
+        Dry-run typing `text` on a virtual clock without sleeping or output.
+        
+        The text is planned as usual and replayed through a deadline
+        scheduler whose sleeps only advance a virtual clock. Keystrokes are
+        applied to a shadow document of the target, so it runs thousands of
+        times faster than real time and checks the result as it goes.
+        
+        Args:
+            text: The text to simulate
+            seed: Seed for this run only (defaults to the instance seed)
+            
+        Returns:
+            Dict: The event timeline as (time, key, action) tuples, the final
+                  buffer text, whether it equals `text`, the simulated
+                  duration in seconds and the error and correction counts
+        """
+        plan = self.compile_plan(text, seed)
+        clock = VirtualClock()
+        scheduler = DeadlineScheduler(clock=clock, spin_window=0)
+        scheduler.start()
+        
+        sink = ShadowDocument(text)
+        events = []
+        
+        for code, action, offset in zip(plan.keys, plan.actions, plan.offsets):
+            scheduler.wait_until(offset)
+            
+            if action == ACTION_BACKSPACE:
+                sink.backspace()
+            else:
+                sink.write(chr(code))
+            events.append((clock.now(), chr(code), action))
+        
+        return dict(
+            plan.stats,
+            events=events,
+            text=sink.text(),
+            correct=sink.is_correct,
+            duration=plan.duration,
+            keystrokes=len(plan),
+        )
+    
+    def _execute_tokens(self, tokens: Iterable[str], total: int,
+                        measure: Callable[[str], int] = len, resume: bool = False,
+                        target_duration: Optional[float] = None) -> bool:
+        """
+        Plan and replay a stream of tokens in small batches.
+        
+        Only one batch of events is held at a time, so typing starts right
+        away and memory stays flat however long the stream is.
+        
+        Args:
+            tokens: Words and single spaces, as produced by iter_tokens()
+            total: Total progress units in the stream (0 if unknown)
+            measure: Progress units contributed by a token (characters or bytes)
+            resume: Continue the shadow document's session: delete what the
+                    target holds past the matching prefix, then type `tokens`
+                    (the rest of its intended text)
+            target_duration: Pace the session to end after this many seconds
+                             (needs a known total)
+            
+        Returns:
+            bool: True if the whole stream was typed, False if typing was stopped
+        """
+        # A budgeted session is sampled with the solved settings; the sampler
+        # and metrics snapshot them, so the typer's own settings come back
+        # right after
+        budget = self._budget_settings if target_duration else {}
+        saved = {name: getattr(self, name) for name in budget}
+        try:
+            for name, value in budget.items():
+                setattr(self, name, value)
+            self._begin_session()
+            shadow = self.shadow
+            if not resume:
+                shadow.reset()
+            self._start_session_metrics(total)
+        finally:
+            for name, value in saved.items():
+                setattr(self, name, value)
+        scheduler = self._start_scheduler()
+        plan = TypingPlan()
+        finished = True
+        pace = PaceController(target_duration, total) if target_duration and total else None
+        if resume:
+            plan.completed = shadow.matched
+            for _ in range(shadow.excess):
+                plan.backspace()
+                plan.wait(self._get_typing_delay() * 0.3)
+            if shadow.excess:
+                plan.stats['corrections'] += 1
+        
+        try:
+            for token in tokens:
+                if not resume:
+                    shadow.expect(token)
+                self._plan_token(plan, token)
+                plan.completed += measure(token)
+                if len(plan) >= STREAM_BATCH_EVENTS:
+                    finished = self._run_batch(plan, scheduler, total, pace)
+                    if not finished:
+                        break
+                    plan = plan.continuation()
+            
+            if finished:
+                finished = self._run_batch(plan, scheduler, total, pace)
+        finally:
+            self.sink.flush()
+        
+        self._end_session(scheduler, plan.stats, finished, total or plan.completed)
+        return finished
+    
+    def _typing_worker(self, open_tokens: Callable[[], Iterable[str]], total: int,
+                       measure: Callable[[str], int] = len, resume: bool = False,
+                       target_duration: Optional[float] = None):
         """Worker function that runs in a separate thread for typing."""
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.begin('session', {'total': total})
         try:
             self.is_typing = True
             self.should_stop = False
@@ -285,45 +751,47 @@ class HumanTyper:
             if self.on_start_callback:
                 self.on_start_callback()
             
-            # Split into words but preserve spaces
-            char_count = 0
-            total_chars = len(text)
-            i = 0
-            
-            while i < len(text) and not self.should_stop:
-                # Add thinking pauses occasionally
-                self._simulate_thinking_pause()
-                
-                if text[i] == ' ':
-                    # Handle space
-                    self._output_character(' ')
-                    time.sleep(self._get_typing_delay())
-                    i += 1
-                    char_count += 1
-                else:
-                    # Find the end of the current word
-                    word_start = i
-                    while i < len(text) and text[i] != ' ':
-                        i += 1
-                    word = text[word_start:i]
-                    
-                    # Type the word
-                    if not self._type_word(word):
-                        break
-                    char_count += len(word)
-                
-                # Update progress
-                if self.on_progress_callback:
-                    self.on_progress_callback(char_count, total_chars)
+            self._execute_tokens(open_tokens(), total, measure, resume, target_duration)
             
         except Exception as e:
             print(f"Typing error: {e}")
         finally:
+            if tracer is not None:
+                tracer.end('session')
             self.is_typing = False
             if self.on_stop_callback:
                 self.on_stop_callback()
     
-    def type_text(self, text: str, use_hotkey: bool = True, show_progress: bool = True):
+    def _announce(self, description: str, use_hotkey: bool):
+        """Print what is about to be typed and how to start it."""
+        if self.use_keyboard:
+            if use_hotkey:
+                print(f"Text ready to type: {description}")
+                print("Press F6 to start typing! (F6 again to stop, F7 to pause/resume)")
+                print("=" * 50)
+            else:
+                print(f"Will start typing immediately...")
+                print(f"Target text: {description}")
+                print("=" * 50)
+        else:
+            print(f"Simulating typing: {description}")
+            print("=" * 50)
+    
+    def _start_typing(self, worker_args: tuple, use_hotkey: bool):
+        """Run the typing worker now, or arm the F6 hotkey to run it."""
+        if use_hotkey and self.use_keyboard:
+            self._start_hotkey_listener(*worker_args)
+        else:
+            # Start typing immediately
+            self.typing_thread = threading.Thread(target=self._typing_worker, args=worker_args)
+            self.typing_thread.daemon = True
+            self.typing_thread.start()
+            
+            if not self.use_keyboard:
+                self.typing_thread.join()  # Wait for completion in console mode
+    
+    def type_text(self, text: str, use_hotkey: bool = True, show_progress: bool = True,
+                  target_duration: Optional[float] = None):
         """
         Type the given text with human-like behavior using keyboard simulation.
         
@@ -331,48 +799,257 @@ class HumanTyper:
             text: The text to type (will be typed exactly as specified)
             use_hotkey: If True, wait for F6 key press to start typing
             show_progress: Whether to show progress messages
+            target_duration: Finish in this many seconds: the speed and pauses
+                             are solved with solve_time_budget() and the session
+                             corrects its pace as it goes
         """
+        if target_duration is not None:
+            self.solve_time_budget(text, target_duration)
+        untypable = self.sink.prepare(text)
         if show_progress:
-            if self.use_keyboard:
-                if use_hotkey:
-                    print(f"Text ready to type: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-                    print("Press F6 to start typing! (F6 again to stop)")
-                    print("=" * 50)
-                else:
-                    print(f"Will start typing immediately...")
-                    print(f"Target text: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-                    print("=" * 50)
-            else:
-                print(f"Simulating typing: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-                print("=" * 50)
+            self._announce(f"'{text[:50]}{'...' if len(text) > 50 else ''}'", use_hotkey)
+            if target_duration is not None:
+                self._announce_time_budget()
+            if untypable:
+                print(f"Warning: cannot type {', '.join(map(repr, untypable))}; "
+                      f"these characters will be skipped")
         
-        if use_hotkey and self.use_keyboard:
-            self._start_hotkey_listener(text)
+        open_tokens = lambda: TOKEN_PATTERN.findall(text)
+        self.shadow.reset()
+        self._session_text = text
+        self._start_typing((open_tokens, len(text), len, False, target_duration), use_hotkey)
+    
+    def estimate(self, text: str) -> Dict:
+        """
+        Predict the duration and keystrokes of typing `text` without planning it.
+        
+        Args:
+            text: The text to estimate
+            
+        Returns:
+            Dict: Expected duration (seconds) and keystrokes with their
+                  standard deviations (see TypingEstimator.estimate())
+        """
+        estimator = TypingEstimator(self)
+        estimator.set_text(text)
+        return estimator.estimate()
+    
+    def solve_time_budget(self, text: str, target_duration: float,
+                          document_scale: float = 1.0) -> Dict:
+        """
+        Set the speed and pauses so that typing `text` takes `target_duration`.
+        
+        The text (up to SOLVER_SAMPLE_CHARS of it) is planned with the
+        current settings at two speeds. Keystroke delays scale with 1/speed
+        and pauses do not, so the two durations give both parts of the cost.
+        The speed is solved from them, and pauses are scaled when the speed
+        would leave TIME_BUDGET_SPEED_RANGE. In throughput mode the throughput
+        rate and burst pauses are solved. The typer's settings are left as
+        they are: sessions started with a target_duration use the solved ones.
+        
+        Args:
+            text: The text to be typed, or a sample of it
+            target_duration: Seconds the whole document should take
+            document_scale: How many times longer the document is than `text`
+            
+        Returns:
+            Dict: The target, solved speed and pause scale, and the predicted
+                  duration (also stored in time_budget)
+            
+        Raises:
+            ValueError: If the settings cannot get close enough to the target
+        """
+        if not target_duration > 0:
+            raise ValueError("target_duration must be positive")
+        if not text:
+            raise ValueError("Cannot solve a time budget for empty text")
+        sample = text[:SOLVER_SAMPLE_CHARS]
+        scale = document_scale * len(text) / len(sample)
+        if self.throughput_cpm is None:
+            speed_attr, pause_attr = 'base_speed', 'pause_range'
+            low, high = TIME_BUDGET_SPEED_RANGE
         else:
-            # Start typing immediately
-            self.typing_thread = threading.Thread(target=self._typing_worker, args=(text,))
-            self.typing_thread.daemon = True
-            self.typing_thread.start()
+            speed_attr, pause_attr = 'throughput_cpm', 'burst_pause_range'
+            low, high = TIME_BUDGET_SPEED_RANGE[0], float('inf')
+        seed = 0 if self.seed is None else self.seed
+        pauses = getattr(self, pause_attr)
+        original_speed = getattr(self, speed_attr)
+        
+        def planned(speed: float, pause_scale: float) -> float:
+            setattr(self, speed_attr, speed)
+            setattr(self, pause_attr, (pauses[0] * pause_scale, pauses[1] * pause_scale))
+            try:
+                return self.compile_plan(sample, seed).duration * scale
+            finally:
+                setattr(self, speed_attr, original_speed)
+                setattr(self, pause_attr, pauses)
+        
+        # Same seed, same decisions: only the keystroke time changes with speed
+        speed_1 = min(high, max(low, original_speed))
+        speed_2 = speed_1 * 2 if speed_1 * 2 <= high else speed_1 / 2
+        duration_1, duration_2 = planned(speed_1, 1.0), planned(speed_2, 1.0)
+        keystroke_time = (duration_1 - duration_2) / (1 - speed_1 / speed_2)
+        pause_time = max(0.0, duration_1 - keystroke_time)
+        
+        pause_scale = 1.0
+        if target_duration > pause_time:
+            speed = keystroke_time * speed_1 / (target_duration - pause_time)
+        else:
+            speed = float('inf')
+        if not low <= speed <= high:
+            speed = min(high, max(low, speed))
+            if pause_time > 0:
+                typing = keystroke_time * speed_1 / speed
+                pause_scale = max(0.0, (target_duration - typing) / pause_time)
+        predicted = planned(speed, pause_scale)
+        
+        # One correction step for what does not scale exactly (the delay floor)
+        pauses_left = pause_time * pause_scale
+        if abs(predicted - target_duration) > TIME_BUDGET_TOLERANCE * target_duration:
+            if low < speed < high and target_duration > pauses_left:
+                speed = min(high, max(low, speed * (predicted - pauses_left)
+                                      / (target_duration - pauses_left)))
+                predicted = planned(speed, pause_scale)
+            elif pause_time > 0:
+                pause_scale = max(0.0, pause_scale + (target_duration - predicted) / pause_time)
+                predicted = planned(speed, pause_scale)
+        
+        # The pace controller can stretch or squeeze the rest
+        slowest, fastest = PACE_SCALE_RANGE
+        if not slowest <= target_duration / predicted <= fastest:
+            raise ValueError(f"Cannot type this in {target_duration:.0f} s with the current "
+                             f"settings (the closest is about {predicted:.0f} s)")
+        self._budget_settings = {
+            speed_attr: speed,
+            pause_attr: (pauses[0] * pause_scale, pauses[1] * pause_scale),
+        }
+        self.time_budget = {
+            'target_duration': target_duration,
+            'speed': speed,
+            'pause_scale': pause_scale,
+            'predicted': predicted,
+        }
+        return self.time_budget
+    
+    def _announce_time_budget(self):
+        """Print the settings solved for a time budget."""
+        budget = self.time_budget
+        print(f"Time budget {budget['target_duration']:.0f} s: {budget['speed']:.0f} CPM, "
+              f"pauses x{budget['pause_scale']:.2f} (planned {budget['predicted']:.0f} s)")
+    
+    def _resume_args(self) -> Optional[tuple]:
+        """Worker arguments that finish the last type_text() session, or None if it is done."""
+        text = self._session_text
+        if text is None or self.is_typing:
+            return None
+        shadow = self.shadow
+        shadow.expect(text[shadow.expected:])
+        if shadow.is_correct:
+            return None
+        open_tokens = lambda: TOKEN_PATTERN.findall(self.shadow.remaining())
+        return (open_tokens, len(text), len, True)
+    
+    def continue_typing(self, use_hotkey: bool = True, show_progress: bool = True) -> bool:
+        """
+        Finish a stopped type_text() session from where the target really is.
+        
+        The shadow document shows what the stop left behind (for example a
+        half-corrected swap); those characters are deleted and the rest of
+        the text is typed. F6 does the same after a stop.
+        
+        Args:
+            use_hotkey: If True, wait for F6 key press to start typing
+            show_progress: Whether to show progress messages
             
-            if not self.use_keyboard:
-                self.typing_thread.join()  # Wait for completion in console mode
+        Returns:
+            bool: False if there is nothing left to type
+        """
+        worker_args = self._resume_args()
+        if worker_args is None:
+            return False
+        if show_progress:
+            diff = self.shadow.diff()
+            self._announce(f"deleting {self.shadow.excess} and typing "
+                           f"{len(diff['missing'])} characters", use_hotkey)
+        self._start_typing(worker_args, use_hotkey)
+        return True
+    
+    def type_stream(self, chunks: Iterable[str], total_bytes: Optional[int] = None,
+                    use_hotkey: bool = True, show_progress: bool = True):
+        """
+        Type text from an iterator of chunks without reading it all first.
+        
+        Words are tokenized lazily, so typing starts immediately and memory
+        stays flat. Progress is reported in UTF-8 bytes consumed.
+        
+        Args:
+            chunks: Iterable of text chunks (e.g. iter_stream_chunks(sys.stdin))
+            total_bytes: Size of the stream in bytes, if known
+            use_hotkey: If True, wait for F6 key press to start typing
+            show_progress: Whether to show progress messages
+        """
+        if show_progress:
+            self._announce("<stream>", use_hotkey)
+        
+        open_tokens = lambda: iter_tokens(chunks)
+        self._session_text = None
+        self._start_typing((open_tokens, total_bytes or 0, utf8_length), use_hotkey)
     
-    def _start_hotkey_listener(self, text: str):
+    def type_file(self, path: str, encoding: str = 'utf-8', use_hotkey: bool = True,
+                  show_progress: bool = True, target_duration: Optional[float] = None):
+        """
+        Type the contents of a file, reading it lazily through a memory map.
+        
+        Progress is reported as bytes consumed against the file size.
+        
+        Args:
+            path: Path of the text file to type
+            encoding: Text encoding of the file
+            use_hotkey: If True, wait for F6 key press to start typing
+            show_progress: Whether to show progress messages
+            target_duration: Finish in this many seconds (the settings are
+                             solved from the start of the file)
+        """
+        total_bytes = os.path.getsize(path)
+        if target_duration is not None:
+            with open(path, encoding=encoding) as file:
+                sample = file.read(SOLVER_SAMPLE_CHARS)
+            self.solve_time_budget(sample, target_duration,
+                                   total_bytes / max(1, utf8_length(sample)))
+        if show_progress:
+            self._announce(f"{path} ({total_bytes} bytes)", use_hotkey)
+            if target_duration is not None:
+                self._announce_time_budget()
+        
+        open_tokens = lambda: iter_tokens(iter_file_chunks(path, encoding=encoding))
+        self._session_text = None
+        self._start_typing((open_tokens, total_bytes, utf8_length, False, target_duration),
+                           use_hotkey)
+    
+    def _start_hotkey_listener(self, *worker_args):
         """Start listening for F6 hotkey."""
-        if not PYNPUT_AVAILABLE:
+        if not self.use_keyboard:
             return
+        from pynput.keyboard import Key, Listener
             
         def on_press(key):
             try:
                 if key == Key.f6:
                     if not self.is_typing:
-                        # Start typing
-                        self.typing_thread = threading.Thread(target=self._typing_worker, args=(text,))
+                        # Start typing, or finish a stopped text from where it was left
+                        args = (self.shadow.typed and self._resume_args()) or worker_args
+                        self.typing_thread = threading.Thread(target=self._typing_worker, args=args)
                         self.typing_thread.daemon = True
                         self.typing_thread.start()
                     else:
                         # Stop typing
                         self.stop_typing()
+                elif key == Key.f7 and self.is_typing:
+                    # Pause or resume typing
+                    if self.is_paused:
+                        self.resume_typing()
+                    else:
+                        self.pause_typing()
             except AttributeError:
                 pass
         
@@ -386,11 +1063,35 @@ class HumanTyper:
         self.hotkey_listener.start()
     
     def stop_typing(self):
-        """Stop typing if currently in progress."""
+        """
+        Stop typing if currently in progress.
+        
+        Any wait in progress (including a pause) is interrupted, so the
+        typing thread exits right away. The time it took is stored in
+        last_stop_latency.
+        """
         if self.is_typing:
+            stop_requested = time.perf_counter()
             self.should_stop = True
-            if self.typing_thread and self.typing_thread.is_alive():
-                self.typing_thread.join(timeout=1.0)
+            thread = self.typing_thread
+            if (thread and thread.is_alive()
+                    and thread is not threading.current_thread()):
+                thread.join(timeout=1.0)
+                self.last_stop_latency = time.perf_counter() - stop_requested
+    
+    def pause_typing(self):
+        """
+        Pause typing after the current keystroke.
+        
+        The session keeps its exact position; time spent paused is added to
+        the rest of the schedule rather than skipped.
+        """
+        if self.is_typing:
+            self._control.pause()
+    
+    def resume_typing(self):
+        """Resume typing where it was paused."""
+        self._control.resume()
     
     def stop_hotkey_listener(self):
         """Stop the hotkey listener."""
@@ -402,6 +1103,137 @@ class HumanTyper:
         """Set the base typing speed in characters per minute."""
         self.base_speed = max(50, min(500, cpm))
     
+    def set_timing_mode(self, mode: str):
+        """
+        Set how keystrokes are scheduled.
+        
+        Args:
+            mode: 'deadline' to wait for absolute deadlines (no accumulated drift)
+                  or 'relative' to sleep for the gap between keystrokes
+        """
+        if mode not in SCHEDULERS:
+            raise ValueError(f"Unknown timing mode '{mode}', expected one of: {', '.join(SCHEDULERS)}")
+        self.timing_mode = mode
+    
+    def set_throughput_mode(self, cpm: Optional[float], burst_length: int = BURST_LENGTH,
+                            burst_pause_range: tuple = BURST_PAUSE_RANGE,
+                            error_probability: float = 0.0):
+        """
+        Type in uncapped bursts for bulk data entry.
+        
+        The set_speed() range and the minimum delay between keystrokes don't
+        apply; keystrokes come in bursts separated by short humanized pauses,
+        and get_session_stats() reports the rate sustained inside bursts.
+        
+        Args:
+            cpm: Target speed in characters per minute (None turns the mode off)
+            burst_length: Characters typed per burst
+            burst_pause_range: Shortest and longest pause between bursts (seconds)
+            error_probability: Chance that a burst is typed with the usual
+                               typo, swap and correction model
+        """
+        if cpm is not None:
+            if cpm <= 0:
+                raise ValueError("Throughput must be a positive number of characters per minute")
+            if burst_length < 1:
+                raise ValueError("Bursts must be at least one character long")
+            low, high = burst_pause_range
+            if not 0 <= low <= high:
+                raise ValueError(f"Invalid burst pause range {burst_pause_range!r}")
+            self.burst_length = burst_length
+            self.burst_pause_range = (low, high)
+            self.burst_error_probability = max(0.0, min(1.0, error_probability))
+        self.throughput_cpm = cpm
+    
+    def enable_tracing(self, capacity: int = DEFAULT_CAPACITY) -> Tracer:
+        """
+        Record a trace of planning and output events.
+        
+        Args:
+            capacity: Number of events kept in the ring buffer
+            
+        Returns:
+            Tracer: The tracer; call its dump(path) to write Chrome trace JSON
+        """
+        self.tracer = Tracer(capacity)
+        return self.tracer
+    
+    def disable_tracing(self):
+        """Stop recording trace events."""
+        self.tracer = None
+    
+    def enable_session_log(self, path: str, capacity: int = DEFAULT_LOG_CAPACITY) -> SessionLog:
+        """
+        Append every keystroke sent from now on to a binary session log.
+        
+        Args:
+            path: Log file (appended to if it exists)
+            capacity: Records buffered in memory between writes
+            
+        Returns:
+            SessionLog: The log; replay it with replay()
+        """
+        self.disable_session_log()
+        self.session_log = SessionLog(path, capacity)
+        return self.session_log
+    
+    def disable_session_log(self):
+        """Flush and close the session log."""
+        if self.session_log is not None:
+            self.session_log.close()
+            self.session_log = None
+    
+    def set_keyboard_layout(self, name: str):
+        """
+        Set the keyboard layout used for typos and finger travel.
+        
+        Args:
+            name: One of 'qwerty', 'azerty', 'qwertz', 'dvorak' or 'colemak'
+        """
+        self.layout = get_layout(name)
+        if self.digraphs.overrides:
+            self.digraphs = DigraphModel(self.layout, self.digraphs.overrides)
+        else:
+            self.digraphs = get_digraph_model(name)
+    
+    def set_digraph_factors(self, factors: Optional[Mapping[str, float]]):
+        """
+        Override the delay factors of specific key pairs.
+        
+        Args:
+            factors: Relative delay for typing the second character right after
+                     the first, keyed by two-character strings (e.g. {'th': 0.7};
+                     1.0 is the configured speed), or None for the built-in table
+        """
+        if factors:
+            self.digraphs = DigraphModel(self.layout, factors)
+        else:
+            self.digraphs = get_digraph_model(self.layout.name)
+    
+    def apply_profile(self, profile: Union[TypingProfile, str]):
+        """
+        Apply a recorded typing profile.
+        
+        Args:
+            profile: A TypingProfile, or the path of a saved profile
+        """
+        if isinstance(profile, str):
+            profile = load_profile(profile)
+        # Set directly: a fitted speed is not limited to the set_speed()
+        # range, and speed_variance was fitted against it uncapped
+        self.base_speed = profile.base_speed
+        self.speed_variance = profile.speed_variance
+        self.pause_probability = profile.pause_probability
+        self.pause_range = profile.pause_range
+        self.set_error_rate(profile.typo_probability)
+        self.set_correction_rate(profile.correction_probability)
+        self.set_keyboard_layout(profile.layout)
+        self.set_digraph_factors(profile.digraphs)
+    
+    def set_seed(self, seed: Optional[int]):
+        """Set the seed for typing decisions (None for a fresh random sequence each session)."""
+        self.seed = seed
+    
     def set_error_rate(self, rate: float):
         """Set the typo probability (0.0 to 1.0)."""
         self.typo_probability = max(0.0, min(1.0, rate))
@@ -418,14 +1250,31 @@ class HumanTyper:
         self.on_stop_callback = on_stop
         self.on_progress_callback = on_progress
     
+    def get_session_stats(self) -> Dict:
+        """
+        Get statistics of the current or last typing session.
+        
+        Returns:
+            Dict: Keystroke and error counts, elapsed and CPU time, achieved
+                  CPM/WPM against the configured speed, and histograms of
+                  intended vs actual inter-key delay and sink call latency
+                  (empty before the first session)
+        """
+        return self._metrics.summary() if self._metrics else {}
+    
     def get_current_settings(self) -> Dict:
         """Get the current configuration settings."""
         return {
             'speed': self.base_speed,
             'error_rate': self.typo_probability,
             'correction_rate': self.correction_probability,
+            'timing_mode': self.timing_mode,
+            'throughput_cpm': self.throughput_cpm,
+            'keyboard_layout': self.layout.name,
+            'digraph_overrides': len(self.digraphs.overrides),
+            'seed': self.seed,
             'use_keyboard': self.use_keyboard,
-            'platform': platform.system(),
+            'platform': _platform_name(),
             'pynput_available': PYNPUT_AVAILABLE
         }
     
@@ -435,10 +1284,16 @@ class HumanTyper:
         self.stop_hotkey_listener()
 
 
+def _platform_name() -> str:
+    """Operating system name ('Windows', 'Darwin', 'Linux', ...)."""
+    import platform  # only needed for display, so kept off the import path
+    return platform.system()
+
+
 def main():
     """Demo the human typer with sample text."""
     # Platform detection
-    current_platform = platform.system()
+    current_platform = _platform_name()
     print(f"Human Typer Mimicker - Cross-Platform Edition")
     print(f"Platform: {current_platform}")
     print("=" * 50)
@@ -8,6 +8,7 @@ Features F6 hotkey support and cross-platform compatibility.
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
+import queue
 import time
 import platform
 import sys
@@ -20,16 +21,52 @@ if src_dir not in sys.path:
 
 try:
     from human_typer import HumanTyper, PYNPUT_AVAILABLE
+    from progress import DEFAULT_REFRESH_RATE
+    from text_stream import iter_file_chunks, utf8_length
+    from estimator import TypingEstimator
+    from sinks import MemorySink
 except ImportError:
     # Fallback for different project structures
     sys.path.insert(0, os.path.dirname(src_dir))
     from human_typer import HumanTyper, PYNPUT_AVAILABLE
+    from progress import DEFAULT_REFRESH_RATE
+    from text_stream import iter_file_chunks, utf8_length
+    from estimator import TypingEstimator
+    from sinks import MemorySink
+
+# Loading files into the editor: bytes decoded per chunk, chunks read ahead
+# of the editor, and the longest time (seconds) the Tk thread spends
+# inserting text before handling other events
+LOAD_CHUNK_SIZE = 16 * 1024
+LOAD_QUEUE_SIZE = 8
+LOAD_FRAME_BUDGET = 0.015
+LOAD_POLL_INTERVAL = 10  # ms
+
+# Pause in editing (ms) before the duration estimate is recomputed
+ESTIMATE_DELAY = 250
+
+
+def format_duration(seconds: float) -> str:
+    """Seconds as '42 s', '3 min 20 s' or '2 h 05 min'."""
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
 
 
 class HumanTyperGUI:
     """Cross-platform graphical interface for the Human Typer Mimicker."""
     
-    def __init__(self, root):
+    def __init__(self, root, progress_rate: float = DEFAULT_REFRESH_RATE):
+        """
+        Args:
+            root: Tk root window
+            progress_rate: Progress display refreshes per second
+        """
         self.root = root
         self.root.title(f"Human Typer Mimicker - {platform.system()}")
         self.root.geometry("850x750")
@@ -45,6 +82,28 @@ class HumanTyperGUI:
         self.characters_typed = 0
         self.total_characters = 0
         
+        # Progress is polled from the typer at a fixed rate rather than pushed
+        # to the event queue for every word
+        self.progress_interval = max(1, int(1000 / progress_rate))
+        self.progress_job = None
+        self.progress_unit = "characters"
+        
+        # Files are read on a worker thread and inserted in chunks; an
+        # unmodified loaded file is typed straight from disk
+        self.loaded_file = None
+        self.load_job = None
+        self.load_queue = None
+        self.load_cancelled = None
+        self.load_path = None
+        self.load_size = 0
+        self.load_bytes = 0
+        
+        # The estimate next to the sliders is computed from the slider values
+        # on a keyboard-less typer, and updated as the text or sliders change
+        self.estimate_typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+        self.estimator = TypingEstimator()
+        self.estimate_job = None
+        
         # Sample texts
         self.sample_texts = {
             "Lorem Ipsum": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.",
@@ -58,6 +117,8 @@ class HumanTyperGUI:
         # Create main interface
         self.create_widgets()
         self.update_status()
+        self.update_estimate_settings()
+        self.refresh_estimate()
         
         # Set up window close handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -131,13 +192,15 @@ class HumanTyperGUI:
         # Default text
         default_text = "Hello! This is the Human Typer Mimicker with F6 hotkey support. Press F6 to start typing!"
         self.text_input.insert('1.0', default_text)
+        self.text_input.bind('<KeyRelease>', self.schedule_estimate)
         
         # Button frame for text operations
         text_button_frame = ttk.Frame(text_frame)
         text_button_frame.grid(row=1, column=0, sticky=tk.W, pady=(0, 10))
         
-        ttk.Button(text_button_frame, text="Load from File", 
-                  command=self.load_text_file).pack(side=tk.LEFT, padx=(0, 5))
+        self.load_button = ttk.Button(text_button_frame, text="Load from File", 
+                                     command=self.load_text_file)
+        self.load_button.pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(text_button_frame, text="Clear Text", 
                   command=self.clear_text).pack(side=tk.LEFT, padx=(0, 5))
         
@@ -190,11 +253,16 @@ class HumanTyperGUI:
         self.correction_label = ttk.Label(correction_frame, text="85%", width=10)
         self.correction_label.pack(side=tk.RIGHT, padx=(10, 0))
         
+        # Expected duration of the text with these settings
+        ttk.Label(settings_frame, text="Estimated Time:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.estimate_label = ttk.Label(settings_frame, text="")
+        self.estimate_label.grid(row=3, column=1, sticky=tk.W, padx=(10, 0), pady=2)
+        
         # Keyboard simulation checkbox
         self.keyboard_var = tk.BooleanVar(value=PYNPUT_AVAILABLE)
         keyboard_check = ttk.Checkbutton(settings_frame, text="Use Keyboard Simulation", 
                                         variable=self.keyboard_var)
-        keyboard_check.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        keyboard_check.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
         if not PYNPUT_AVAILABLE:
             keyboard_check.configure(state='disabled')
         
@@ -202,7 +270,7 @@ class HumanTyperGUI:
         self.hotkey_var = tk.BooleanVar(value=True)
         hotkey_check = ttk.Checkbutton(settings_frame, text="Use F6 Hotkey (recommended)", 
                                       variable=self.hotkey_var)
-        hotkey_check.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        hotkey_check.grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
         if not PYNPUT_AVAILABLE:
             hotkey_check.configure(state='disabled')
         
@@ -251,16 +319,51 @@ class HumanTyperGUI:
         """Update the speed label when scale changes."""
         speed = int(float(value))
         self.speed_label.config(text=f"{speed} CPM")
+        self.update_estimate_settings()
         
     def update_error_label(self, value):
         """Update the error rate label when scale changes."""
         error = int(float(value))
         self.error_label.config(text=f"{error}%")
+        self.update_estimate_settings()
         
     def update_correction_label(self, value):
         """Update the correction rate label when scale changes."""
         correction = int(float(value))
         self.correction_label.config(text=f"{correction}%")
+        self.update_estimate_settings()
+    
+    def update_estimate_settings(self):
+        """Re-estimate the current text with the slider values."""
+        self.estimate_typer.set_speed(int(float(self.speed_var.get())))
+        self.estimate_typer.set_error_rate(float(self.error_var.get()) / 100)
+        self.estimate_typer.set_correction_rate(float(self.correction_var.get()) / 100)
+        self.estimator.update_settings(self.estimate_typer)
+        self.show_estimate()
+    
+    def schedule_estimate(self, event=None):
+        """Re-estimate the text once editing pauses."""
+        if self.estimate_job is not None:
+            self.root.after_cancel(self.estimate_job)
+        self.estimate_job = self.root.after(ESTIMATE_DELAY, self.refresh_estimate)
+    
+    def refresh_estimate(self):
+        """Re-read the editor's text into the estimator."""
+        self.estimate_job = None
+        if self.load_job is not None:
+            return  # loaded chunks are fed as they arrive
+        self.estimator.set_text(self.text_input.get('1.0', 'end-1c'))
+        self.show_estimate()
+    
+    def show_estimate(self):
+        """Display the expected duration and keystrokes."""
+        estimate = self.estimator.estimate()
+        if not estimate['characters']:
+            self.estimate_label.config(text="-")
+            return
+        self.estimate_label.config(
+            text=f"{format_duration(estimate['duration'])} ± {format_duration(estimate['duration_std'])}"
+                 f" ({estimate['keystrokes']:,.0f} keystrokes)")
         
     def update_status(self):
         """Update the status display."""
@@ -270,40 +373,140 @@ class HumanTyperGUI:
             self.status_label.config(text="Not Available ✗", foreground="red")
     
     def load_text_file(self):
-        """Load text from a file."""
+        """Load text from a file, or cancel the load in progress."""
+        if self.load_job is not None:
+            self.cancel_loading()
+            return
+        
         file_path = filedialog.askopenfilename(
             title="Select Text File",
             filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
         )
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    self.text_input.delete('1.0', tk.END)
-                    self.text_input.insert('1.0', content)
-                messagebox.showinfo("Success", f"Loaded text from {file_path}")
+                self.start_loading(file_path)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load file: {str(e)}")
     
+    def start_loading(self, path: str):
+        """Read `path` on a worker thread and insert it into the editor in chunks."""
+        self.load_size = os.path.getsize(path)
+        self.load_bytes = 0
+        self.load_path = path
+        self.loaded_file = None
+        self.load_queue = queue.Queue(maxsize=LOAD_QUEUE_SIZE)
+        self.load_cancelled = threading.Event()
+        
+        self.text_input.delete('1.0', tk.END)
+        self.estimator.set_text('')
+        self.load_button.config(text="Cancel Loading")
+        self.start_button.config(state='disabled')
+        
+        threading.Thread(target=self._read_file_worker,
+                         args=(path, self.load_queue, self.load_cancelled),
+                         daemon=True).start()
+        self.poll_loading()
+    
+    @staticmethod
+    def _read_file_worker(path: str, chunks: queue.Queue, cancelled: threading.Event):
+        """Decode `path` into `chunks`, ending with None (or the exception raised)."""
+        try:
+            for chunk in iter_file_chunks(path, chunk_size=LOAD_CHUNK_SIZE):
+                # Block while the editor catches up, but notice a cancel
+                while not cancelled.is_set():
+                    try:
+                        chunks.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if cancelled.is_set():
+                    return
+            chunks.put(None)
+        except Exception as e:
+            chunks.put(e)
+    
+    def poll_loading(self):
+        """Insert loaded chunks for up to one frame, then schedule the next poll."""
+        deadline = time.perf_counter() + LOAD_FRAME_BUDGET
+        while time.perf_counter() < deadline:
+            try:
+                chunk = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None or isinstance(chunk, Exception):
+                self.finish_loading(chunk)
+                return
+            self.text_input.insert(tk.END, chunk)
+            self.estimator.feed(chunk)
+            self.load_bytes += utf8_length(chunk)
+        self.show_estimate()
+        
+        percentage = min(100.0, 100.0 * self.load_bytes / max(1, self.load_size))
+        self.progress_var.set(f"Loading {os.path.basename(self.load_path)}: {percentage:.1f}%")
+        self.progress_bar.config(value=percentage)
+        self.load_job = self.root.after(LOAD_POLL_INTERVAL, self.poll_loading)
+    
+    def finish_loading(self, error: Exception = None):
+        """Restore the controls after a load completes or fails."""
+        self.load_job = None
+        self.load_button.config(text="Load from File")
+        self.start_button.config(state='normal')
+        
+        if error is not None:
+            self.text_input.delete('1.0', tk.END)
+            self.progress_var.set("Ready to type...")
+            self.progress_bar.config(value=0)
+            self.refresh_estimate()
+            messagebox.showerror("Error", f"Failed to load file: {str(error)}")
+            return
+        
+        # Typing an unmodified file streams it from disk instead of the editor
+        self.loaded_file = self.load_path
+        self.text_input.edit_modified(False)
+        self.progress_var.set(f"Loaded {self.load_path}")
+        self.progress_bar.config(value=100)
+    
+    def cancel_loading(self):
+        """Stop loading a file and discard the partly loaded text."""
+        if self.load_job is None:
+            return
+        self.load_cancelled.set()
+        self.root.after_cancel(self.load_job)
+        self.load_job = None
+        self.load_button.config(text="Load from File")
+        self.start_button.config(state='normal')
+        self.text_input.delete('1.0', tk.END)
+        self.refresh_estimate()
+        self.progress_var.set("Loading cancelled")
+        self.progress_bar.config(value=0)
+    
     def clear_text(self):
         """Clear the text input area."""
+        self.loaded_file = None
         self.text_input.delete('1.0', tk.END)
+        self.refresh_estimate()
     
     def load_sample_text(self, event=None):
         """Load selected sample text."""
         selected = self.sample_var.get()
         if selected in self.sample_texts:
+            self.loaded_file = None
             self.text_input.delete('1.0', tk.END)
             self.text_input.insert('1.0', self.sample_texts[selected])
+            self.refresh_estimate()
     
     def start_typing(self):
         """Start the typing process."""
-        if self.is_typing:
+        if self.is_typing or self.load_job is not None:
             return
         
-        # Get text to type
-        text = self.text_input.get('1.0', tk.END).strip()
-        if not text:
+        # Get text to type; an unmodified loaded file is streamed from disk
+        # rather than copied out of the editor
+        source_file = self.loaded_file
+        if source_file and self.text_input.edit_modified():
+            source_file = self.loaded_file = None
+        text = '' if source_file else self.text_input.get('1.0', tk.END).strip()
+        if not (text or source_file and os.path.getsize(source_file)):
             messagebox.showwarning("Warning", "Please enter some text to type.")
             return
         
@@ -320,11 +523,10 @@ class HumanTyperGUI:
         self.typer.set_error_rate(error_rate)
         self.typer.set_correction_rate(correction_rate)
         
-        # Set up callbacks
+        # Set up callbacks; progress is polled instead of using a callback
         self.typer.set_callbacks(
             on_start=self.on_typing_start,
-            on_stop=self.on_typing_stop,
-            on_progress=self.on_typing_progress
+            on_stop=self.on_typing_stop
         )
         
         # Start typing
@@ -340,14 +542,21 @@ class HumanTyperGUI:
             self.stop_button.config(state='normal')
         
         # Start in separate thread to avoid blocking GUI
-        self.typing_thread = threading.Thread(
-            target=lambda: self.typer.type_text(text, use_hotkey=use_hotkey, show_progress=False),
-            daemon=True
-        )
+        if source_file:
+            self.progress_unit = "bytes"
+            self.total_characters = os.path.getsize(source_file)
+            target = lambda: self.typer.type_file(source_file, use_hotkey=use_hotkey,
+                                                  show_progress=False)
+        else:
+            self.progress_unit = "characters"
+            self.total_characters = len(text)
+            target = lambda: self.typer.type_text(text, use_hotkey=use_hotkey,
+                                                  show_progress=False)
+        self.typing_thread = threading.Thread(target=target, daemon=True)
         self.typing_thread.start()
         
-        self.total_characters = len(text)
         self.characters_typed = 0
+        self.start_progress_polling()
     
     def stop_typing(self):
         """Stop the typing process."""
@@ -360,26 +569,59 @@ class HumanTyperGUI:
     def on_typing_start(self):
         """Called when typing starts."""
         self.is_typing = True
-        self.root.after(0, lambda: self.progress_var.set("Typing in progress..."))
-        self.root.after(0, lambda: self.progress_bar.config(mode='determinate'))
+        self.root.after(0, self.show_typing_started)
+    
+    def show_typing_started(self):
+        """Show that typing has started (runs on the Tk thread)."""
+        self.progress_var.set("Typing in progress...")
+        self.progress_bar.config(mode='determinate')
+        # Stopping cancels the poll, so every session (F6 restarts included)
+        # starts it again
+        self.start_progress_polling()
     
     def on_typing_stop(self):
         """Called when typing stops."""
         self.is_typing = False
-        self.root.after(0, lambda: self.progress_var.set("Typing complete!"))
-        self.root.after(0, lambda: self.start_button.config(state='normal'))
-        self.root.after(0, lambda: self.stop_button.config(state='disabled'))
-        self.root.after(0, lambda: self.progress_bar.config(value=100))
+        self.root.after(0, self.show_typing_stopped)
+    
+    def show_typing_stopped(self):
+        """Show that typing has finished (runs on the Tk thread)."""
+        self.stop_progress_polling()
+        self.progress_var.set("Typing complete!")
+        self.start_button.config(state='normal')
+        self.stop_button.config(state='disabled')
+        self.progress_bar.config(value=100)
+    
+    def start_progress_polling(self):
+        """Start refreshing the progress display from the typer."""
+        self.stop_progress_polling()
+        self.characters_typed = -1
+        self.poll_progress()
+    
+    def stop_progress_polling(self):
+        """Stop refreshing the progress display."""
+        if self.progress_job is not None:
+            self.root.after_cancel(self.progress_job)
+            self.progress_job = None
+    
+    def poll_progress(self):
+        """Redraw progress if it changed, then schedule the next poll."""
+        typed, total = self.typer.progress.snapshot()
+        if typed != self.characters_typed and total > 0:
+            self.characters_typed = typed
+            self.on_typing_progress(typed, total)
+        self.progress_job = self.root.after(self.progress_interval, self.poll_progress)
     
     def on_typing_progress(self, typed: int, total: int):
-        """Called to update typing progress."""
-        if total > 0:
-            percentage = (typed / total) * 100
-            self.root.after(0, lambda: self.progress_var.set(f"Typing: {typed}/{total} characters ({percentage:.1f}%)"))
-            self.root.after(0, lambda: self.progress_bar.config(value=percentage))
+        """Update the progress display."""
+        percentage = (typed / total) * 100
+        self.progress_var.set(f"Typing: {typed}/{total} {self.progress_unit} ({percentage:.1f}%)")
+        self.progress_bar.config(value=percentage)
     
     def on_closing(self):
         """Handle window closing."""
+        self.stop_progress_polling()
+        self.cancel_loading()
         if self.is_typing:
             self.stop_typing()
         
@@ -393,10 +635,10 @@ class HumanTyperGUI:
         self.root.mainloop()
 
 
-def main():
+def main(progress_rate: float = DEFAULT_REFRESH_RATE):
     """Run the GUI application."""
     root = tk.Tk()
-    app = HumanTyperGUI(root)
+    app = HumanTyperGUI(root, progress_rate=progress_rate)
     app.run()
 
 
@@ -0,0 +1,184 @@
+"""
+Keyboard Layouts
+
+Keyboards are defined by the physical position of their keys, in key
+widths from the left edge of the number row. Each layout is built once per
+process and shared by every HumanTyper: neighbor lists for typos, a
+key-to-key distance matrix and a matching table of travel factors that
+stretch the delay before a keystroke by how far the finger has to move.
+
+Shifted characters share the position of their base key, so a typo on '!'
+hits a neighbor of '1' with shift still held ('@' or 'Q' on QWERTY).
+"""
+
+import math
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Keys whose centers are at most this far apart (in key widths) are neighbors
+NEIGHBOR_DISTANCE = 1.3
+
+# Vertical position of the space bar and its horizontal extent (key widths)
+SPACE_ROW = 4
+SPACE_SPAN = (3.75, 10.0)
+
+# How strongly finger travel stretches or shortens the delay before a key,
+# and the bounds on the resulting factor
+TRAVEL_WEIGHT = 0.15
+TRAVEL_FACTOR_RANGE = (0.8, 1.25)
+
+# Typical distance between consecutive letters of running text (key
+# widths); transitions of this length keep the planned delay unchanged
+TYPICAL_TRAVEL = 3.2
+
+# Row definitions: (unshifted keys, shifted keys, x offset of the first key).
+# A space in the shifted row means the key has no shifted character.
+LAYOUT_ROWS: Dict[str, Tuple[Tuple[str, str, float], ...]] = {
+    'qwerty': (
+        ("`1234567890-=", "~!@#$%^&*()_+", 0.0),
+        ("qwertyuiop[]\\", "QWERTYUIOP{}|", 1.5),
+        ("asdfghjkl;'", "ASDFGHJKL:\"", 1.75),
+        ("zxcvbnm,./", "ZXCVBNM<>?", 2.25),
+    ),
+    'azerty': (
+        ("²&é\"'(-è_çà)=", " 1234567890°+", 0.0),
+        ("azertyuiop^$", "AZERTYUIOP¨£", 1.5),
+        ("qsdfghjklmù*", "QSDFGHJKLM%µ", 1.75),
+        ("<wxcvbn,;:!", ">WXCVBN?./§", 1.25),
+    ),
+    'qwertz': (
+        ("^1234567890ß´", "°!\"§$%&/()=?`", 0.0),
+        ("qwertzuiopü+", "QWERTZUIOPÜ*", 1.5),
+        ("asdfghjklöä#", "ASDFGHJKLÖÄ'", 1.75),
+        ("<yxcvbnm,.-", ">YXCVBNM;:_", 1.25),
+    ),
+    'dvorak': (
+        ("`1234567890[]", "~!@#$%^&*(){}", 0.0),
+        ("',.pyfgcrl/=\\", "\"<>PYFGCRL?+|", 1.5),
+        ("aoeuidhtns-", "AOEUIDHTNS_", 1.75),
+        (";qjkxbmwvz", ":QJKXBMWVZ", 2.25),
+    ),
+    'colemak': (
+        ("`1234567890-=", "~!@#$%^&*()_+", 0.0),
+        ("qwfpgjluy;[]\\", "QWFPGJLUY:{}|", 1.5),
+        ("arstdhneio'", "ARSTDHNEIO\"", 1.75),
+        ("zxcvbkm,./", "ZXCVBKM<>?", 2.25),
+    ),
+}
+
+LAYOUT_NAMES = tuple(LAYOUT_ROWS)
+
+
+class KeyboardLayout:
+    """Precomputed, read-only geometry tables for one keyboard layout."""
+
+    def __init__(self, name: str, rows: Tuple[Tuple[str, str, float], ...]):
+        self.name = name
+
+        # Physical keys: (unshifted, shifted or None, x, y); space is last
+        keys: List[Tuple[str, Optional[str], float, float]] = []
+        for y, (plain, shifted, offset) in enumerate(rows):
+            if len(plain) != len(shifted):
+                raise ValueError(f"Layout '{name}' row {y} has mismatched shifted keys")
+            for column, (char, shifted_char) in enumerate(zip(plain, shifted)):
+                keys.append((char, None if shifted_char == ' ' else shifted_char,
+                             offset + column + 0.5, float(y)))
+        keys.append((' ', None, sum(SPACE_SPAN) / 2, float(SPACE_ROW)))
+        self.key_count = len(keys)
+        self.positions: Tuple[Tuple[float, float], ...] = tuple((x, y) for _, _, x, y in keys)
+
+        # Character -> physical key index, and whether shift is needed
+        key_index: Dict[str, int] = {}
+        self._shifted: Dict[str, bool] = {}
+        for index, (char, shifted_char, _, _) in enumerate(keys):
+            for symbol, shift in ((char, False), (shifted_char, True)):
+                if symbol is None:
+                    continue
+                if symbol in key_index:
+                    raise ValueError(f"Layout '{name}' maps '{symbol}' to two keys")
+                key_index[symbol] = index
+                self._shifted[symbol] = shift
+        self.key_index: Mapping[str, int] = MappingProxyType(key_index)
+
+        # Distance matrix between physical keys (row-major, key_count x key_count)
+        n = self.key_count
+        distances = array('d', bytes(8 * n * n))
+        for i in range(n):
+            for j in range(n):
+                distances[i * n + j] = self._key_distance(keys[i], keys[j])
+        self.distances = memoryview(distances).toreadonly()
+
+        # Delay factor for moving from one key to the next; the thumb on the
+        # space bar moves independently, so transitions involving it are neutral
+        low, high = TRAVEL_FACTOR_RANGE
+        factors = array('d', [1.0]) * (n * n)
+        for i in range(n - 1):
+            for j in range(n - 1):
+                travel = 1.0 + TRAVEL_WEIGHT * (distances[i * n + j] / TYPICAL_TRAVEL - 1.0)
+                factors[i * n + j] = min(high, max(low, travel))
+        self.travel_factors = memoryview(factors).toreadonly()
+
+        # Neighbor lists for every character, nearest first, keeping shift state
+        neighbors: Dict[str, Tuple[str, ...]] = {}
+        for symbol, index in key_index.items():
+            shift = self._shifted[symbol]
+            close = sorted((distances[index * n + other], other) for other in range(n)
+                           if other != index
+                           and distances[index * n + other] <= NEIGHBOR_DISTANCE)
+            chars = []
+            for _, other in close:
+                char, shifted_char, _, _ = keys[other]
+                char = shifted_char if shift and shifted_char else char
+                if char not in chars:
+                    chars.append(char)
+            if chars:
+                neighbors[symbol] = tuple(chars)
+        self.neighbors: Mapping[str, Tuple[str, ...]] = MappingProxyType(neighbors)
+
+    @staticmethod
+    def _key_distance(a, b) -> float:
+        """Distance between two keys; the space bar counts from its nearest point."""
+        (char_a, _, xa, ya), (char_b, _, xb, yb) = a, b
+        if char_a == ' ' and char_b == ' ':
+            return 0.0
+        if char_a == ' ' or char_b == ' ':
+            x = xb if char_a == ' ' else xa
+            nearest = min(max(x, SPACE_SPAN[0]), SPACE_SPAN[1])
+            return math.hypot(x - nearest, ya - yb)
+        return math.hypot(xa - xb, ya - yb)
+
+    def distance(self, a: str, b: str) -> Optional[float]:
+        """Distance in key widths between the keys typing `a` and `b` (None if unknown)."""
+        i = self.key_index.get(a)
+        j = self.key_index.get(b)
+        if i is None or j is None:
+            return None
+        return self.distances[i * self.key_count + j]
+
+    def travel_factor(self, previous: str, char: str) -> float:
+        """Delay factor for typing `char` right after `previous` (1.0 if unknown)."""
+        i = self.key_index.get(previous)
+        j = self.key_index.get(char)
+        if i is None or j is None:
+            return 1.0
+        return self.travel_factors[i * self.key_count + j]
+
+    def needs_shift(self, char: str) -> bool:
+        """Whether typing `char` needs the shift key."""
+        return self._shifted.get(char, False)
+
+    def __repr__(self) -> str:
+        return f"KeyboardLayout({self.name!r})"
+
+
+@lru_cache(maxsize=None)
+def get_layout(name: str) -> KeyboardLayout:
+    """Return the shared, precomputed layout called `name`."""
+    try:
+        rows = LAYOUT_ROWS[name]
+    except KeyError:
+        raise ValueError(f"Unknown keyboard layout '{name}', expected one of: "
+                         f"{', '.join(LAYOUT_NAMES)}") from None
+    return KeyboardLayout(name, rows)
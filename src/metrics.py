@@ -0,0 +1,222 @@
+"""
+Session Metrics
+
+SessionMetrics records what happened during one typing session: intended
+versus actual delay between keystrokes, how long each sink call took
+(for KeyboardSink, the pynput press/release pair), error counts, achieved
+speed and the typing thread's CPU time. Summaries are plain dicts that can
+be written as JSON or in the Prometheus text format.
+"""
+
+import json
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from .scheduler import NS_PER_SECOND
+except ImportError:
+    from scheduler import NS_PER_SECOND
+
+# Upper bounds (seconds) of the inter-key delay histogram buckets
+DELAY_BUCKETS = (0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75,
+                 1.0, 1.5, 2.0, 3.0, 5.0)
+
+# Upper bounds (seconds) of the sink call latency histogram buckets
+OUTPUT_BUCKETS = (1e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                  1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1)
+
+# Error counters copied from the plan stats
+ERROR_KINDS = ('typos', 'double_chars', 'swaps', 'corrections', 'backspaces')
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the `fraction` quantile (max for +Inf)."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'bounds': list(self.bounds),
+            'counts': list(self.counts),
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+        }
+
+
+class SessionMetrics:
+    """Instrumentation for one typing session."""
+
+    def __init__(self, base_speed: float):
+        """
+        Args:
+            base_speed: Configured typing speed (CPM) to compare against
+        """
+        self.base_speed = base_speed
+        self.intended_delay = LatencyHistogram(DELAY_BUCKETS)
+        self.actual_delay = LatencyHistogram(DELAY_BUCKETS)
+        self.output_latency = LatencyHistogram(OUTPUT_BUCKETS)
+        self.keystrokes = 0
+        self.characters = 0
+        self.errors = dict.fromkeys(ERROR_KINDS, 0)
+        self.started = time.perf_counter()
+        self.cpu_started: Optional[float] = time.thread_time()
+        self.elapsed: Optional[float] = None
+        self.cpu_time: Optional[float] = None
+        self.burst_pause_time: Optional[float] = None  # throughput mode only
+        self._last_offset = 0.0
+        self._last_sent_ns = 0
+
+    def record(self, offset: float, sent_ns: int, done_ns: int):
+        """
+        Record one keystroke.
+
+        Args:
+            offset: Planned time of the keystroke (seconds into the session)
+            sent_ns: perf_counter_ns() just before the sink was called
+            done_ns: perf_counter_ns() just after the sink returned
+        """
+        if self._last_sent_ns:
+            self.intended_delay.observe(offset - self._last_offset)
+            self.actual_delay.observe((sent_ns - self._last_sent_ns) / NS_PER_SECOND)
+        self._last_offset = offset
+        self._last_sent_ns = sent_ns
+        self.output_latency.observe((done_ns - sent_ns) / NS_PER_SECOND)
+        self.keystrokes += 1
+
+    def finish(self, stats: Dict, characters: int, measure_cpu: bool = True):
+        """
+        Close the session.
+
+        Args:
+            stats: Error counts of the session's plan
+            characters: Characters of the intended text typed (not bytes,
+                        even for streams measured in bytes)
+            measure_cpu: Whether the session ran on the calling thread, so
+                         its CPU time can be read with time.thread_time()
+        """
+        self.elapsed = time.perf_counter() - self.started
+        if measure_cpu:
+            self.cpu_time = time.thread_time() - self.cpu_started
+        self.characters = characters
+        self.burst_pause_time = stats.get('burst_pause_time')
+        for kind in ERROR_KINDS:
+            self.errors[kind] = stats.get(kind, 0)
+
+    def summary(self) -> Dict:
+        """Session statistics as a JSON-friendly dict."""
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        achieved_cpm = 60.0 * self.characters / elapsed if elapsed > 0 else 0.0
+        extra = {}
+        if self.burst_pause_time is not None:
+            # Keystroke rate the backend sustained outside the planned pauses
+            busy = elapsed - self.burst_pause_time
+            extra['sustained_cpm'] = 60.0 * self.keystrokes / busy if busy > 0 else 0.0
+        return dict(
+            self.errors,
+            keystrokes=self.keystrokes,
+            characters=self.characters,
+            elapsed=elapsed,
+            cpu_time=self.cpu_time,
+            target_cpm=self.base_speed,
+            achieved_cpm=achieved_cpm,
+            achieved_wpm=achieved_cpm / 5,
+            speed_ratio=achieved_cpm / self.base_speed if self.base_speed else 0.0,
+            **extra,
+            histograms={
+                'intended_delay': self.intended_delay.to_dict(),
+                'actual_delay': self.actual_delay.to_dict(),
+                'output_latency': self.output_latency.to_dict(),
+            },
+        )
+
+
+def write_json(stats: Dict, path: str):
+    """Write session statistics to `path` as JSON."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(stats, file, indent=2)
+        file.write('\n')
+
+
+def to_prometheus(stats: Dict, prefix: str = 'human_typer') -> str:
+    """Format session statistics in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{key}="{label}"' for key, label in labels)
+            label_text = f"{{{label_text}}}" if label_text else ''
+            lines.append(f"{prefix}_{name}{suffix}{label_text} {value}")
+
+    metric('keystrokes_total', 'counter', 'Keystrokes sent, including corrections.',
+           [('', (), stats['keystrokes'])])
+    metric('errors_total', 'counter', 'Typing errors and corrections by kind.',
+           [('', (('kind', kind),), stats[kind]) for kind in ERROR_KINDS])
+    metric('elapsed_seconds', 'gauge', 'Wall time of the session.',
+           [('', (), stats['elapsed'])])
+    if stats['cpu_time'] is not None:
+        metric('cpu_seconds', 'gauge', 'CPU time of the typing thread.',
+               [('', (), stats['cpu_time'])])
+    metric('target_cpm', 'gauge', 'Configured typing speed in characters per minute.',
+           [('', (), stats['target_cpm'])])
+    metric('achieved_cpm', 'gauge', 'Achieved typing speed in characters per minute.',
+           [('', (), stats['achieved_cpm'])])
+
+    descriptions = {
+        'intended_delay': 'Planned delay between consecutive keystrokes.',
+        'actual_delay': 'Measured delay between consecutive keystrokes.',
+        'output_latency': 'Time spent in each output sink call.',
+    }
+    for name, histogram in stats['histograms'].items():
+        samples = []
+        cumulative = 0
+        for bound, count in zip(histogram['bounds'] + ['+Inf'], histogram['counts']):
+            cumulative += count
+            samples.append(('_bucket', (('le', bound),), cumulative))
+        samples.append(('_sum', (), histogram['sum']))
+        samples.append(('_count', (), histogram['count']))
+        metric(f'{name}_seconds', 'histogram', descriptions.get(name, name), samples)
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(stats: Dict, path: str):
+    """Write session statistics to `path` in the Prometheus text format."""
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(to_prometheus(stats))
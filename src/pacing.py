@@ -0,0 +1,90 @@
+"""
+Time-Budget Pacing
+
+A time-budget session has to finish a document in a given duration. The
+speed and pause settings are solved up front from planned durations (see
+HumanTyper.solve_time_budget()), but real sessions still drift: output
+latency, pauses and the random decisions of the actual session all differ
+from the estimate. A PaceController closes the loop while typing. Planned
+offsets are mapped onto the real timeline through a time scale, and the
+scale is re-solved after every word from the time left and the planned
+cost of the remaining text. It also yields a live ETA.
+"""
+
+from typing import Optional, Tuple
+
+# Slowest and fastest speeds (CPM) the solver may choose outside throughput
+# mode; above about 1200 CPM the minimum keystroke delay takes over
+TIME_BUDGET_SPEED_RANGE = (30.0, 1200.0)
+
+# Relative error the solved settings aim for
+TIME_BUDGET_TOLERANCE = 0.02
+
+# Bounds on the closed-loop time scale, so a bad estimate early in the
+# session never makes typing jump to an absurd speed
+PACE_SCALE_RANGE = (0.5, 2.0)
+
+# Characters of a long text that are planned to solve its settings; the
+# cost of the rest is extrapolated
+SOLVER_SAMPLE_CHARS = 20000
+
+
+class PaceController:
+    """Maps planned offsets to real ones so a session ends on a target duration."""
+
+    __slots__ = ('target_duration', 'total', 'scale', 'scale_range', 'plan_anchor',
+                 'real_anchor', 'eta')
+
+    def __init__(self, target_duration: float, total: int,
+                 scale_range: Tuple[float, float] = PACE_SCALE_RANGE):
+        """
+        Args:
+            target_duration: Seconds the session should take
+            total: Progress units in the session
+            scale_range: Smallest and largest time scale applied to the plan
+        """
+        self.target_duration = target_duration
+        self.total = total
+        self.scale_range = scale_range
+        self.scale = 1.0
+        self.plan_anchor = 0.0  # planned offset and real offset the scale is applied from
+        self.real_anchor = 0.0
+        self.eta: Optional[float] = None  # seconds left, once progress has been made
+
+    def map(self, offset: float) -> float:
+        """Real session offset for planned `offset`."""
+        return self.real_anchor + (offset - self.plan_anchor) * self.scale
+
+    def update(self, done: int, offset: float, elapsed: float,
+               planned_end: Optional[float] = None):
+        """
+        Re-solve the time scale after progress.
+
+        Args:
+            done: Progress units completed
+            offset: Planned offset of the event that completed them
+            elapsed: Real seconds since the session started
+            planned_end: Planned offset of the session's last keystroke, once
+                         the rest of the session has been planned
+        """
+        if done <= 0 or offset <= 0:
+            return
+        self.real_anchor = self.map(offset)
+        self.plan_anchor = offset
+        # Planned cost of the rest of the text, or an estimate at the rate
+        # planned so far
+        remaining = max(0, self.total - done)
+        if planned_end is not None:
+            remaining_plan = max(0.0, planned_end - offset)
+        else:
+            remaining_plan = offset / done * remaining
+        # The rest starts at the mapped offset, or now if the session is late.
+        # Lateness that builds up (relative timing, slow sinks) is expected
+        # to keep growing at the rate seen so far
+        start = max(self.real_anchor, elapsed)
+        lag = max(0.0, elapsed - self.real_anchor) / done * remaining
+        if remaining_plan > 0:
+            low, high = self.scale_range
+            wanted = (self.target_duration - start - lag) / remaining_plan
+            self.scale = min(high, max(low, wanted))
+        self.eta = start - elapsed + remaining_plan * self.scale + lag
@@ -0,0 +1,291 @@
+"""
+Typing Profiles
+
+A TypingProfile holds the parameters fitted from a real operator's typing:
+speed and its spread, digraph delay factors, typo and correction rates and
+the thinking pause distribution. ProfileRecorder captures key-down and
+key-up timestamps with a pynput Listener, and fit_profile() turns them into
+a profile.
+
+Profiles are stored in a small versioned binary format instead of the raw
+events, so loading one is a handful of struct reads:
+
+    header   '<4sHH'      magic b'HTPF', format version, flags (0)
+    params   '<7d16sII'   speed, variance, pause probability, pause min,
+                          pause max, typo and correction probabilities,
+                          layout name, digraph count, keystrokes fitted
+    factors  'd' * count  digraph delay factors (8-byte aligned)
+    firsts   'I' * count  code point of each digraph's first character
+    seconds  'I' * count  code point of each digraph's second character
+"""
+
+import mmap
+import struct
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .sampling import PAUSE_RANGE
+except ImportError:
+    from sampling import PAUSE_RANGE
+
+PROFILE_MAGIC = b'HTPF'
+PROFILE_VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_PARAMS = struct.Struct('<7d16sII')
+
+# Gaps this long (seconds) are thinking pauses rather than typing rhythm
+PAUSE_THRESHOLD = PAUSE_RANGE[0]
+
+# Fewest typing intervals a profile is fitted from, and fewest samples of a
+# digraph before it gets its own factor
+MIN_INTERVALS = 20
+MIN_DIGRAPH_SAMPLES = 3
+
+# Key name recorded for backspace presses
+BACKSPACE = '\b'
+
+# (perf_counter_ns timestamp, key, True for key down / False for key up)
+KeyEvent = Tuple[int, str, bool]
+
+
+class TypingProfile:
+    """Fitted typing parameters of one operator."""
+
+    def __init__(self, base_speed: float = 200.0, speed_variance: float = 50.0,
+                 pause_probability: float = 0.05,
+                 pause_range: Tuple[float, float] = PAUSE_RANGE,
+                 typo_probability: float = 0.08, correction_probability: float = 0.85,
+                 layout: str = 'qwerty', digraphs: Optional[Dict[str, float]] = None,
+                 keystrokes: int = 0):
+        self.base_speed = base_speed
+        self.speed_variance = speed_variance
+        self.pause_probability = pause_probability
+        self.pause_range = tuple(pause_range)
+        self.typo_probability = typo_probability
+        self.correction_probability = correction_probability
+        self.layout = layout
+        self.digraphs = dict(digraphs or {})
+        self.keystrokes = keystrokes
+
+    def to_bytes(self) -> bytes:
+        """Serialize the profile in the binary profile format."""
+        layout = self.layout.encode('ascii')
+        if len(layout) > 16:
+            raise ValueError(f"Layout name '{self.layout}' is too long for a profile")
+        pairs = list(self.digraphs.items())
+        factors = array('d', (factor for _, factor in pairs))
+        firsts = array('I', (ord(pair[0]) for pair, _ in pairs))
+        seconds = array('I', (ord(pair[1]) for pair, _ in pairs))
+        params = _PARAMS.pack(self.base_speed, self.speed_variance, self.pause_probability,
+                              self.pause_range[0], self.pause_range[1],
+                              self.typo_probability, self.correction_probability,
+                              layout, len(pairs), self.keystrokes)
+        return b''.join((_HEADER.pack(PROFILE_MAGIC, PROFILE_VERSION, 0), params,
+                         factors.tobytes(), firsts.tobytes(), seconds.tobytes()))
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'TypingProfile':
+        """Parse a profile from bytes, or any buffer such as an mmap."""
+        if len(buffer) < _HEADER.size + _PARAMS.size:
+            raise ValueError("Not a typing profile (file too short)")
+        magic, version, _ = _HEADER.unpack_from(buffer)
+        if magic != PROFILE_MAGIC:
+            raise ValueError("Not a typing profile (bad magic)")
+        if version != PROFILE_VERSION:
+            raise ValueError(f"Unsupported typing profile version {version}")
+        (base_speed, speed_variance, pause_probability, pause_min, pause_max,
+         typo_probability, correction_probability, layout, count,
+         keystrokes) = _PARAMS.unpack_from(buffer, _HEADER.size)
+
+        start = _HEADER.size + _PARAMS.size
+        if len(buffer) != start + 16 * count:
+            raise ValueError("Corrupt typing profile (digraph table size mismatch)")
+        factors = struct.unpack_from(f'<{count}d', buffer, start)
+        codes = struct.unpack_from(f'<{2 * count}I', buffer, start + 8 * count)
+        firsts, seconds = codes[:count], codes[count:]
+        digraphs = {chr(a) + chr(b): factor for a, b, factor in zip(firsts, seconds, factors)}
+        return cls(base_speed, speed_variance, pause_probability, (pause_min, pause_max),
+                   typo_probability, correction_probability,
+                   layout.rstrip(b'\0').decode('ascii'), digraphs, keystrokes)
+
+    def save(self, path: str):
+        """Write the profile to `path`."""
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    def __repr__(self) -> str:
+        return (f"TypingProfile(base_speed={self.base_speed:.0f}, layout={self.layout!r}, "
+                f"digraphs={len(self.digraphs)}, keystrokes={self.keystrokes})")
+
+
+def load_profile(path: str) -> TypingProfile:
+    """Load a profile written by TypingProfile.save(), memory-mapping the file."""
+    with open(path, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            raise ValueError(f"Not a typing profile: {path}") from None
+    with mapped:
+        return TypingProfile.from_buffer(mapped)
+
+
+def fit_profile(events: Iterable[KeyEvent], layout: str = 'qwerty') -> TypingProfile:
+    """
+    Fit a profile to recorded key events.
+
+    Only key-down events of characters and backspace shape the profile;
+    modifier keys are skipped so a shifted capital is timed from the
+    previous character. Runs of backspaces count as one correction each,
+    and a correction of a single character counts as an immediate one.
+
+    Args:
+        events: (timestamp_ns, key, is_down) tuples in time order
+        layout: Keyboard layout the operator typed on
+
+    Returns:
+        TypingProfile: The fitted parameters
+    """
+    import statistics
+
+    downs = [(timestamp, key) for timestamp, key, is_down in events
+             if is_down and len(key) == 1]
+
+    intervals: List[float] = []
+    by_digraph: Dict[str, List[float]] = {}
+    pauses: List[float] = []
+    word_starts = 0
+    characters = 0
+    corrections = 0
+    immediate = 0
+    run = 0
+    for index, (timestamp, key) in enumerate(downs):
+        if key == BACKSPACE:
+            run += 1
+            continue
+        characters += 1
+        if run:
+            corrections += 1
+            immediate += run == 1
+            run = 0
+        if index == 0:
+            continue
+        previous_time, previous = downs[index - 1]
+        gap = (timestamp - previous_time) / 1e9
+        if previous == ' ' and key != ' ':
+            word_starts += 1
+            if gap >= PAUSE_THRESHOLD:
+                pauses.append(gap)
+                continue
+        if previous == BACKSPACE or gap >= PAUSE_THRESHOLD:
+            continue
+        intervals.append(gap)
+        by_digraph.setdefault(previous + key, []).append(gap)
+
+    if len(intervals) < MIN_INTERVALS:
+        raise ValueError(f"Need at least {MIN_INTERVALS} typing intervals to fit a profile, "
+                         f"got {len(intervals)}")
+
+    mean_delay = statistics.fmean(intervals)
+    digraphs = {pair: statistics.median(gaps) / mean_delay
+                for pair, gaps in by_digraph.items() if len(gaps) >= MIN_DIGRAPH_SAMPLES}
+
+    # Spread left after the digraph factors; the sampler draws delays
+    # uniformly, whose half-width is sqrt(3) standard deviations
+    residuals = [gap / digraphs.get(pair, 1.0)
+                 for pair, gaps in by_digraph.items() for gap in gaps]
+    spread = 3 ** 0.5 * statistics.pstdev(residuals)
+    base_speed = 60.0 / mean_delay
+
+    typo_probability = corrections / characters if characters else 0.0
+
+    # A pause before a word comes on top of the usual delay after the space
+    pause_range = PAUSE_RANGE
+    if pauses:
+        pause_range = (max(0.0, min(pauses) - mean_delay), max(pauses) - mean_delay)
+    return TypingProfile(
+        base_speed=base_speed,
+        speed_variance=min(spread, 0.9 * mean_delay) * base_speed,
+        pause_probability=len(pauses) / word_starts if word_starts else 0.0,
+        pause_range=pause_range,
+        typo_probability=typo_probability,
+        correction_probability=immediate / corrections if corrections else 1.0,
+        layout=layout,
+        digraphs=digraphs,
+        keystrokes=len(downs),
+    )
+
+
+class ProfileRecorder:
+    """Records key-down and key-up timestamps with a pynput Listener."""
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.keys: List[str] = []
+        self.pressed = array('B')
+        self.listener = None
+
+    @staticmethod
+    def _key_name(key) -> str:
+        """Character typed by `key`, BACKSPACE, or the special key's name."""
+        from pynput.keyboard import Key
+
+        if key == Key.backspace:
+            return BACKSPACE
+        if key == Key.space:
+            return ' '
+        char = getattr(key, 'char', None)
+        if char:
+            return char
+        return getattr(key, 'name', None) or str(key)
+
+    def _record(self, key, pressed: bool):
+        self.timestamps.append(time.perf_counter_ns())
+        self.keys.append(self._key_name(key))
+        self.pressed.append(pressed)
+
+    def start(self, stop_on_escape: bool = True):
+        """
+        Start recording in the background.
+
+        Args:
+            stop_on_escape: Finish the recording when Esc is pressed
+        """
+        try:
+            from pynput.keyboard import Key, Listener
+        except ImportError:
+            raise RuntimeError("Recording a profile requires pynput "
+                               "(pip install pynput)") from None
+
+        def on_press(key):
+            if stop_on_escape and key == Key.esc:
+                return False
+            self._record(key, True)
+
+        def on_release(key):
+            self._record(key, False)
+
+        self.listener = Listener(on_press=on_press, on_release=on_release)
+        self.listener.daemon = True
+        self.listener.start()
+
+    def wait(self):
+        """Block until the recording is finished with Esc or stop()."""
+        if self.listener:
+            self.listener.join()
+
+    def stop(self):
+        """Stop recording."""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+
+    def events(self) -> List[KeyEvent]:
+        """Recorded (timestamp_ns, key, is_down) tuples."""
+        return list(zip(self.timestamps, self.keys, map(bool, self.pressed)))
+
+    def fit(self, layout: str = 'qwerty') -> TypingProfile:
+        """Fit a profile to everything recorded so far."""
+        return fit_profile(self.events(), layout)
@@ -0,0 +1,117 @@
+"""
+Progress Reporting
+
+The typing thread publishes progress into a ProgressCounter with a single
+reference assignment; displays poll it at their own frame rate instead of
+being called for every word. This keeps the cost on the typing thread
+constant however fast it types, and lets the GUI and CLI redraw at most
+a fixed number of times per second.
+"""
+
+import sys
+import threading
+from typing import Optional, TextIO, Tuple
+
+# Default number of progress redraws per second
+DEFAULT_REFRESH_RATE = 30.0
+
+
+class ProgressCounter:
+    """Latest (done, total) progress of a session, safe to read from any thread."""
+
+    __slots__ = ('_state', '_eta')
+
+    def __init__(self):
+        self._state: Tuple[int, int] = (0, 0)
+        self._eta: Optional[float] = None
+
+    def reset(self, total: int = 0):
+        """Start counting a new session of `total` units (0 if unknown)."""
+        self._state = (0, total)
+        self._eta = None
+
+    def publish(self, done: int, total: int):
+        """Record progress (called by the typing thread)."""
+        # Replacing the tuple is a single atomic store, so readers never see
+        # a half-updated pair and no lock is needed
+        self._state = (done, total)
+
+    def publish_eta(self, seconds: Optional[float]):
+        """Record the estimated seconds left (called by the typing thread)."""
+        self._eta = seconds
+
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the session ends (None if not estimated)."""
+        return self._eta
+
+    def snapshot(self) -> Tuple[int, int]:
+        """Return the latest (done, total) pair."""
+        return self._state
+
+    def fraction(self) -> float:
+        """Completed fraction between 0.0 and 1.0 (0.0 if the total is unknown)."""
+        done, total = self._state
+        return min(1.0, done / total) if total > 0 else 0.0
+
+
+class ProgressBar:
+    """Text progress bar redrawn from a background thread at a fixed rate."""
+
+    def __init__(self, counter: ProgressCounter, stream: Optional[TextIO] = None,
+                 rate: float = DEFAULT_REFRESH_RATE, width: int = 40, unit: str = 'characters'):
+        """
+        Args:
+            counter: Progress to display
+            stream: Where the bar is drawn (defaults to sys.stderr)
+            rate: Redraws per second
+            width: Width of the bar in characters
+            unit: Name of the progress units
+        """
+        self.counter = counter
+        self.stream = stream
+        self.interval = 1.0 / rate
+        self.width = width
+        self.unit = unit
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_drawn: Optional[Tuple[Tuple[int, int], Optional[float]]] = None
+
+    def start(self):
+        """Start redrawing in the background."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop redrawing, draw the final state and end the line."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.draw()
+        (self.stream or sys.stderr).write('\n')
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.draw()
+
+    def draw(self):
+        """Redraw the bar if progress changed since the last redraw."""
+        state = self.counter.snapshot()
+        eta = self.counter.eta()
+        if (state, eta) == self._last_drawn:
+            return
+        self._last_drawn = (state, eta)
+        done, total = state
+        stream = self.stream or sys.stderr
+        if total > 0:
+            filled = int(self.width * min(1.0, done / total))
+            bar = '#' * filled + '-' * (self.width - filled)
+            line = f"\r[{bar}] {100 * done / total:5.1f}% {done}/{total} {self.unit}"
+            if eta is not None:
+                minutes, seconds = divmod(int(eta + 0.5), 60)
+                line += f" ETA {minutes}:{seconds:02d}"
+            stream.write(line)
+        else:
+            stream.write(f"\r{done} {self.unit}")
+        stream.flush()
@@ -0,0 +1,189 @@
+"""
+Batched Sampling
+
+TypingSampler draws every stochastic typing decision (delays, typo,
+double-character and correction flags, adjacent-key picks, swap positions
+and thinking pauses) in batches, so planning only has to pop
+pre-computed values. Batches are vectorized with NumPy when it is
+installed and drawn with the standard random module otherwise.
+"""
+
+import importlib.util
+import random
+from typing import Iterator, List, Optional, Tuple
+
+# NumPy is imported by the first sampler that uses it, not at module import
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+# Decisions drawn per batch; batches start small and double up to BATCH_SIZE
+# so short sessions don't pay for draws they never use
+INITIAL_BATCH_SIZE = 64
+BATCH_SIZE = 4096
+
+# Shortest delay between keystrokes (seconds)
+MIN_DELAY = 0.05
+
+# Default range of a thinking pause (seconds)
+PAUSE_RANGE = (0.5, 2.0)
+
+# Throughput mode defaults: characters per burst and pause between bursts (seconds)
+BURST_LENGTH = 40
+BURST_PAUSE_RANGE = (0.1, 0.4)
+
+# (double char, typo, correct immediately, adjacent-key pick)
+CharDecision = Tuple[bool, bool, bool, float]
+
+# (swap, swap position pick, correct immediately)
+SwapDecision = Tuple[bool, float, bool]
+
+# (pause before the burst, type the burst with errors)
+BurstDecision = Tuple[float, bool]
+
+
+class TypingSampler:
+    """Batched source of typing decisions for one session."""
+
+    def __init__(self, typer, rng: Optional[random.Random] = None,
+                 batch_size: int = BATCH_SIZE, use_numpy: bool = True):
+        """
+        Snapshot the typer's settings and prepare batched draws.
+
+        Args:
+            typer: HumanTyper whose speed and error settings are sampled
+            rng: Random source (batches are seeded from it)
+            batch_size: Largest number of decisions drawn per batch
+            use_numpy: Vectorize batches with NumPy when it is available
+        """
+        self.rng = rng or random.Random()
+        self.batch_size = batch_size
+        self.np_rng = None
+        if use_numpy and NUMPY_AVAILABLE:
+            import numpy
+            self.np_rng = numpy.random.default_rng(self.rng.getrandbits(64))
+
+        self.base_delay = 60.0 / typer.base_speed
+        self.delay_spread = typer.speed_variance / typer.base_speed
+        self.min_delay = MIN_DELAY
+        if typer.throughput_cpm is not None:
+            # Throughput mode: no speed cap or delay floor, same relative spread
+            self.base_delay = 60.0 / typer.throughput_cpm
+            self.delay_spread = self.base_delay * min(1.0, typer.speed_variance / 60.0)
+            self.min_delay = 0.0
+        self.burst_pause_range = typer.burst_pause_range
+        self.burst_error_probability = typer.burst_error_probability
+        self.pause_probability = typer.pause_probability
+        self.pause_range = typer.pause_range
+        self.typo_probability = typer.typo_probability
+        self.correction_probability = typer.correction_probability
+        self.double_char_probability = typer.double_char_probability
+        self.char_swap_probability = typer.char_swap_probability
+
+        self._delays: Iterator[float] = iter(())
+        self._pauses: Iterator[float] = iter(())
+        self._chars: Iterator[CharDecision] = iter(())
+        self._swaps: Iterator[SwapDecision] = iter(())
+        self._bursts: Iterator[BurstDecision] = iter(())
+        self._batch_sizes = {}
+
+    def delay(self) -> float:
+        """Delay after a keystroke, in seconds."""
+        try:
+            return next(self._delays)
+        except StopIteration:
+            self._delays = iter(self._draw_delays())
+            return next(self._delays)
+
+    def pause(self) -> float:
+        """Thinking pause before the next word, in seconds (0.0 for none)."""
+        try:
+            return next(self._pauses)
+        except StopIteration:
+            self._pauses = iter(self._draw_pauses())
+            return next(self._pauses)
+
+    def char_decision(self) -> CharDecision:
+        """Error decisions for typing one character."""
+        try:
+            return next(self._chars)
+        except StopIteration:
+            self._chars = iter(self._draw_chars())
+            return next(self._chars)
+
+    def swap_decision(self) -> SwapDecision:
+        """Transposition decisions for typing one word."""
+        try:
+            return next(self._swaps)
+        except StopIteration:
+            self._swaps = iter(self._draw_swaps())
+            return next(self._swaps)
+
+    def burst_decision(self) -> BurstDecision:
+        """Pause and error decision for the next throughput-mode burst."""
+        try:
+            return next(self._bursts)
+        except StopIteration:
+            self._bursts = iter(self._draw_bursts())
+            return next(self._bursts)
+
+    def _next_batch_size(self, stream: str) -> int:
+        size = self._batch_sizes.get(stream, min(INITIAL_BATCH_SIZE, self.batch_size))
+        self._batch_sizes[stream] = min(2 * size, self.batch_size)
+        return size
+
+    def _draw_delays(self) -> List[float]:
+        n = self._next_batch_size('delays')
+        low = self.base_delay - self.delay_spread
+        width = 2 * self.delay_spread
+        if self.np_rng is not None:
+            delays = low + width * self.np_rng.random(n)
+            return delays.clip(min=self.min_delay).tolist()
+        rnd = self.rng.random
+        min_delay = self.min_delay
+        return [max(min_delay, low + width * rnd()) for _ in range(n)]
+
+    def _draw_pauses(self) -> List[float]:
+        n = self._next_batch_size('pauses')
+        low, high = self.pause_range
+        if self.np_rng is not None:
+            u = self.np_rng.random((2, n))
+            return ((u[0] < self.pause_probability) * (low + (high - low) * u[1])).tolist()
+        rnd = self.rng.random
+        probability = self.pause_probability
+        return [low + (high - low) * rnd() if rnd() < probability else 0.0
+                for _ in range(n)]
+
+    def _draw_chars(self) -> List[CharDecision]:
+        n = self._next_batch_size('chars')
+        if self.np_rng is not None:
+            u = self.np_rng.random((4, n))
+            return list(zip((u[0] < self.double_char_probability).tolist(),
+                            (u[1] < self.typo_probability).tolist(),
+                            (u[2] < self.correction_probability).tolist(),
+                            u[3].tolist()))
+        rnd = self.rng.random
+        double, typo, correct = (self.double_char_probability, self.typo_probability,
+                                 self.correction_probability)
+        return [(rnd() < double, rnd() < typo, rnd() < correct, rnd())
+                for _ in range(n)]
+
+    def _draw_swaps(self) -> List[SwapDecision]:
+        n = self._next_batch_size('swaps')
+        if self.np_rng is not None:
+            u = self.np_rng.random((3, n))
+            return list(zip((u[0] < self.char_swap_probability).tolist(),
+                            u[1].tolist(),
+                            (u[2] < self.correction_probability).tolist()))
+        rnd = self.rng.random
+        swap, correct = self.char_swap_probability, self.correction_probability
+        return [(rnd() < swap, rnd(), rnd() < correct) for _ in range(n)]
+
+    def _draw_bursts(self) -> List[BurstDecision]:
+        n = self._next_batch_size('bursts')
+        low, high = self.burst_pause_range
+        if self.np_rng is not None:
+            u = self.np_rng.random((2, n))
+            return list(zip((low + (high - low) * u[0]).tolist(),
+                            (u[1] < self.burst_error_probability).tolist()))
+        rnd = self.rng.random
+        errors = self.burst_error_probability
+        return [(low + (high - low) * rnd(), rnd() < errors) for _ in range(n)]
@@ -0,0 +1,222 @@
+"""
+Keystroke Scheduling
+
+Schedulers decide when each planned keystroke is sent. Offsets are
+measured from the start of the session, so a scheduler can report how far
+the real timeline drifted from the plan.
+
+- SleepScheduler sleeps for the gap between consecutive events, so sleep
+  overshoot and output latency accumulate over the session.
+- DeadlineScheduler waits for absolute time.monotonic_ns() deadlines,
+  using a coarse sleep followed by a short spin, so lateness never builds
+  up from one keystroke to the next.
+
+Both wait on a SessionControl when one is given, so stop() and pause()
+interrupt a wait immediately instead of after the current sleep.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class MonotonicClock:
+    """Real time source backed by time.monotonic_ns()."""
+
+    def now_ns(self) -> int:
+        return time.monotonic_ns()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Simulated time source: sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.time_ns = 0
+
+    def now_ns(self) -> int:
+        return self.time_ns
+
+    def now(self) -> float:
+        """Simulated seconds since the clock was created."""
+        return self.time_ns / NS_PER_SECOND
+
+    def sleep(self, seconds: float):
+        # A zero-length sleep (a yield while spinning) still takes one tick
+        self.time_ns += max(1, round(seconds * NS_PER_SECOND))
+
+
+class SessionControl:
+    """Stop and pause signals that interrupt a session's waits."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.stopped = False
+        self.paused = False
+
+    def reset(self):
+        """Clear stop and pause for a new session."""
+        with self._condition:
+            self.stopped = False
+            self.paused = False
+            self._condition.notify_all()
+
+    def stop(self):
+        """Stop the session, waking any wait immediately."""
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
+
+    def pause(self):
+        """Pause the session, waking any wait immediately."""
+        with self._condition:
+            self.paused = True
+            self._condition.notify_all()
+
+    def resume(self):
+        """Resume a paused session."""
+        with self._condition:
+            self.paused = False
+            self._condition.notify_all()
+
+    def sleep(self, seconds: float):
+        """Sleep for up to `seconds`, returning early if stopped or paused."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.stopped or self.paused, timeout=seconds)
+
+    def hold(self):
+        """Block while paused, returning when resumed or stopped."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.stopped or not self.paused)
+
+
+class SleepScheduler:
+    """Sleep for the gap between consecutive events (relative timing)."""
+
+    mode = 'relative'
+
+    def __init__(self, clock: Optional[MonotonicClock] = None,
+                 control: Optional[SessionControl] = None):
+        """
+        Args:
+            clock: Time source (defaults to time.monotonic_ns)
+            control: Stop/pause signals that interrupt waits
+        """
+        self.clock = clock or MonotonicClock()
+        self.control = control
+        self.origin_ns = 0
+        self.last_offset = 0.0
+        self.events = 0
+        self.last_lateness_ns = 0
+        self.max_lateness_ns = 0
+        self.total_lateness_ns = 0
+        self.paused_ns = 0
+
+    def start(self, offset: float = 0.0):
+        """Start the session clock, treating now as `offset` seconds in."""
+        self.origin_ns = self.clock.now_ns() - int(offset * NS_PER_SECOND)
+        self.last_offset = offset
+
+    def wait_until(self, offset: float) -> int:
+        """Wait for the event scheduled at `offset` and return its lateness in ns."""
+        gap = offset - self.last_offset
+        if gap > 0:
+            self._sleep_until(self.clock.now_ns() + int(gap * NS_PER_SECOND))
+        self.last_offset = offset
+        return self._record(offset)
+
+    def _sleep_until(self, deadline: int, spin_ns: int = 0):
+        """
+        Sleep until `deadline` (ns), spinning for the last `spin_ns`.
+
+        Returns early if the session is stopped. Time spent paused pushes the
+        deadline and the session origin back, so the rest of the plan keeps
+        its spacing.
+        """
+        now_ns = self.clock.now_ns
+        control = self.control
+        sleep = control.sleep if control is not None else self.clock.sleep
+        while True:
+            if control is not None:
+                if control.stopped:
+                    return
+                if control.paused:
+                    deadline += self._hold()
+            remaining = deadline - now_ns()
+            if remaining <= spin_ns:
+                break
+            # Coarse sleep, waking up a little before the deadline
+            sleep((remaining - spin_ns) / NS_PER_SECOND)
+            if control is None:
+                break
+        while now_ns() < deadline:
+            # Yield the GIL while spinning so other threads keep running
+            self.clock.sleep(0)
+
+    def _hold(self) -> int:
+        """Wait out a pause and return its length in ns."""
+        paused_at = self.clock.now_ns()
+        self.control.hold()
+        paused = self.clock.now_ns() - paused_at
+        self.origin_ns += paused
+        self.paused_ns += paused
+        return paused
+
+    def _record(self, offset: float) -> int:
+        lateness = self.clock.now_ns() - self.origin_ns - round(offset * NS_PER_SECOND)
+        self.events += 1
+        self.last_lateness_ns = lateness
+        self.total_lateness_ns += lateness
+        if lateness > self.max_lateness_ns:
+            self.max_lateness_ns = lateness
+        return lateness
+
+    def elapsed(self) -> float:
+        """Seconds since the session clock started."""
+        return (self.clock.now_ns() - self.origin_ns) / NS_PER_SECOND
+
+    def report(self) -> Dict:
+        """Summarize how closely the session followed the plan."""
+        events = max(1, self.events)
+        return {
+            'mode': self.mode,
+            'events': self.events,
+            'elapsed': self.elapsed(),
+            'paused': self.paused_ns / NS_PER_SECOND,
+            'drift': self.last_lateness_ns / NS_PER_SECOND,
+            'max_lateness': self.max_lateness_ns / NS_PER_SECOND,
+            'mean_lateness': self.total_lateness_ns / events / NS_PER_SECOND,
+        }
+
+
+class DeadlineScheduler(SleepScheduler):
+    """Wait for absolute deadlines with a hybrid sleep/spin strategy."""
+
+    mode = 'deadline'
+
+    def __init__(self, clock: Optional[MonotonicClock] = None,
+                 control: Optional[SessionControl] = None, spin_window: float = 0.002):
+        """
+        Args:
+            clock: Time source (defaults to time.monotonic_ns)
+            control: Stop/pause signals that interrupt waits
+            spin_window: Seconds before each deadline spent spinning instead of sleeping
+        """
+        super().__init__(clock, control)
+        self.spin_window_ns = int(spin_window * NS_PER_SECOND)
+
+    def wait_until(self, offset: float) -> int:
+        # Rounded so offsets read back from ns timestamps land on the same ns
+        self._sleep_until(self.origin_ns + round(offset * NS_PER_SECOND), self.spin_window_ns)
+        self.last_offset = offset
+        return self._record(offset)
+
+
+SCHEDULERS = {
+    SleepScheduler.mode: SleepScheduler,
+    DeadlineScheduler.mode: DeadlineScheduler,
+}
@@ -0,0 +1,206 @@
+"""
+Session Logs
+
+A SessionLog appends every keystroke a session actually sends, with its
+monotonic timestamp, to a compact binary file. Records are packed into a
+preallocated ring buffer and written to the file in bulk when the buffer
+wraps or the session ends, so logging adds one struct.pack_into per
+keystroke and no per-event I/O.
+
+    header   '<4sHH'   magic b'HTSL', format version, flags (0)
+    records  '<qIB'    time (ns), code point, action; 13 bytes each
+
+A record with ACTION_SESSION starts each session; its time is the wall
+clock (time.time_ns()) when the session started and its code is 0. Every
+other record is ACTION_PRESS or ACTION_BACKSPACE with its time in ns since
+the session started, excluding time spent paused.
+
+replay() sends a log's keystrokes to any sink at their recorded times, with
+no planning or random draws, so a known-good session can be re-run and the
+resulting logs compared byte for byte.
+"""
+
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from .typing_plan import ACTION_BACKSPACE
+    from .scheduler import NS_PER_SECOND, DeadlineScheduler
+except ImportError:
+    from typing_plan import ACTION_BACKSPACE
+    from scheduler import NS_PER_SECOND, DeadlineScheduler
+
+LOG_MAGIC = b'HTSL'
+LOG_VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+RECORD = struct.Struct('<qIB')
+
+# Record action that starts a session (presses and backspaces use the plan's actions)
+ACTION_SESSION = 2
+
+# Records buffered before they are written to the file
+DEFAULT_LOG_CAPACITY = 4096
+
+# (time_ns, code point, action)
+LogRecord = Tuple[int, int, int]
+
+
+class SessionLog:
+    """Append-only binary log of emitted keystrokes."""
+
+    def __init__(self, path: str, capacity: int = DEFAULT_LOG_CAPACITY):
+        """
+        Open `path` for appending, writing the header if the file is new.
+
+        Args:
+            path: Log file (created if missing)
+            capacity: Records buffered in memory between writes
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.path = path
+        self.file = open(path, 'ab', buffering=0)
+        if self.file.tell() == 0:
+            self.file.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, 0))
+        else:
+            with open(path, 'rb') as existing:
+                header = existing.read(_HEADER.size)
+            try:
+                _check_header(header)
+            except ValueError:
+                self.file.close()
+                raise
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._view = memoryview(self._buffer)
+        self._position = 0
+        self.origin_ns = time.monotonic_ns()
+        self.records = 0
+
+    def begin(self):
+        """Start a new session; later records are timed from now."""
+        self.origin_ns = time.monotonic_ns()
+        self._append(time.time_ns(), 0, ACTION_SESSION)
+
+    def record(self, code: int, action: int, time_ns: Optional[int] = None):
+        """
+        Log one keystroke.
+
+        Args:
+            code: Code point of the key (BACKSPACE_CODE for backspaces)
+            action: ACTION_PRESS or ACTION_BACKSPACE
+            time_ns: Nanoseconds since the session started (defaults to now)
+        """
+        if time_ns is None:
+            time_ns = time.monotonic_ns() - self.origin_ns
+        self._append(time_ns, code, action)
+
+    def _append(self, time_ns: int, code: int, action: int):
+        RECORD.pack_into(self._buffer, self._position, time_ns, code, action)
+        self._position += RECORD.size
+        self.records += 1
+        if self._position == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records to the file in one call."""
+        if self._position and not self.file.closed:
+            self.file.write(self._view[:self._position])
+            self._position = 0
+
+    def close(self):
+        """Flush and close the file."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self) -> 'SessionLog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _check_header(data: bytes):
+    """Raise ValueError unless `data` starts with a session log header."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a session log (file too short)")
+    magic, version, _ = _HEADER.unpack_from(data)
+    if magic != LOG_MAGIC:
+        raise ValueError("Not a session log (bad magic)")
+    if version != LOG_VERSION:
+        raise ValueError(f"Unsupported session log version {version}")
+
+
+def read_log(source: Union[str, bytes]) -> List[LogRecord]:
+    """
+    Read every record of a session log.
+
+    Args:
+        source: Path of a log file, or its contents
+
+    Returns:
+        List[LogRecord]: (time_ns, code, action) tuples in the order logged
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            source = file.read()
+    _check_header(source)
+    body = memoryview(source)[_HEADER.size:]
+    if len(body) % RECORD.size:
+        raise ValueError("Corrupt session log (truncated record)")
+    return list(RECORD.iter_unpack(body))
+
+
+def replay(log: Union[str, bytes, List[LogRecord]], sink, scheduler=None,
+           session_log: Optional[SessionLog] = None) -> Dict:
+    """
+    Send the keystrokes of a session log to `sink` at their recorded times.
+
+    Args:
+        log: Log file path, log contents, or records from read_log()
+        sink: OutputSink to type into
+        scheduler: Scheduler that times the keystrokes (a DeadlineScheduler
+                   by default); its control, if any, can stop the replay
+        session_log: Log the replayed keystrokes here as they are sent
+
+    Returns:
+        Dict: The scheduler's timing report plus the keystrokes sent and
+              whether the whole log was replayed
+    """
+    records = log if isinstance(log, list) else read_log(log)
+    scheduler = scheduler or DeadlineScheduler()
+    control = scheduler.control
+    now_ns = scheduler.clock.now_ns
+    write, backspace = sink.write, sink.backspace
+    sink.prepare({chr(code) for _, code, action in records if action not in
+                  (ACTION_BACKSPACE, ACTION_SESSION)})
+    scheduler.start()
+    sent = 0
+    finished = True
+    try:
+        for time_ns, code, action in records:
+            if action == ACTION_SESSION:
+                scheduler.start()
+                if session_log is not None:
+                    session_log.begin()
+                continue
+            scheduler.wait_until(time_ns / NS_PER_SECOND)
+            if control is not None and control.stopped:
+                finished = False
+                break
+            if action == ACTION_BACKSPACE:
+                backspace()
+            else:
+                write(chr(code))
+            sent += 1
+            if session_log is not None:
+                session_log.record(code, action, now_ns() - scheduler.origin_ns)
+    finally:
+        sink.flush()
+        if session_log is not None:
+            session_log.flush()
+    return dict(scheduler.report(), keystrokes=sent, finished=finished)
@@ -0,0 +1,203 @@
+"""
+Shadow Document
+
+A ShadowDocument models what the target should contain after the
+keystrokes sent so far, next to the text the session is meant to produce.
+The typed text lives in a gap buffer of code points, so each keystroke is
+an O(1) array write even in multi-megabyte documents, and the length of
+the prefix that already matches the intended text is kept up to date as
+keys are pressed and deleted.
+
+After a stop the shadow tells how many characters have to be deleted and
+what is left to type, so a session can continue from where the target
+really is; simulate() uses it to check the final text without building a
+string per keystroke.
+"""
+
+import sys
+from array import array
+from typing import Dict, Optional
+
+try:
+    from .sinks import OutputSink
+except ImportError:
+    from sinks import OutputSink
+
+# Code points are stored in native byte order
+_CODEC = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def _decode(codes: array) -> str:
+    return codes.tobytes().decode(_CODEC, 'surrogatepass')
+
+
+class GapBuffer:
+    """Sequence of code points with O(1) inserts and deletes at the cursor."""
+
+    __slots__ = ('codes', 'gap_start', 'gap_end')
+
+    def __init__(self, capacity: int = 256):
+        self.codes = array('I', bytes(4 * max(1, capacity)))
+        self.gap_start = 0  # cursor; characters before it are codes[:gap_start]
+        self.gap_end = len(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes) - (self.gap_end - self.gap_start)
+
+    @property
+    def cursor(self) -> int:
+        return self.gap_start
+
+    def insert(self, code: int):
+        """Insert a code point before the cursor."""
+        if self.gap_start == self.gap_end:
+            self._grow()
+        self.codes[self.gap_start] = code
+        self.gap_start += 1
+
+    def delete_before(self) -> Optional[int]:
+        """Delete the code point before the cursor and return it (None at the start)."""
+        if not self.gap_start:
+            return None
+        self.gap_start -= 1
+        return self.codes[self.gap_start]
+
+    def move_to(self, position: int):
+        """Move the cursor to `position` (0 to len)."""
+        if not 0 <= position <= len(self):
+            raise ValueError(f"Cursor position {position} is outside the buffer")
+        codes, start, end = self.codes, self.gap_start, self.gap_end
+        if position < start:
+            moved = start - position
+            codes[end - moved:end] = codes[position:start]
+            self.gap_start, self.gap_end = position, end - moved
+        elif position > start:
+            moved = position - start
+            codes[start:start + moved] = codes[end:end + moved]
+            self.gap_start, self.gap_end = position, end + moved
+
+    def _grow(self):
+        """Double the capacity, keeping the text on both sides of the gap."""
+        codes = self.codes
+        extra = max(len(codes), 256)
+        self.codes = codes[:self.gap_start] + array('I', bytes(4 * extra)) + codes[self.gap_end:]
+        self.gap_end += extra
+
+    def code_at(self, index: int) -> int:
+        """Code point at `index`."""
+        if index >= self.gap_start:
+            index += self.gap_end - self.gap_start
+        return self.codes[index]
+
+    def slice(self, start: int, stop: Optional[int] = None) -> str:
+        """Text from `start` up to `stop` (default the end)."""
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        gap = self.gap_end - self.gap_start
+        if stop <= self.gap_start:
+            return _decode(self.codes[start:stop])
+        if start >= self.gap_start:
+            return _decode(self.codes[start + gap:stop + gap])
+        return _decode(self.codes[start:self.gap_start] + self.codes[self.gap_end:stop + gap])
+
+    def text(self) -> str:
+        """The whole buffer."""
+        return self.slice(0)
+
+
+class ShadowDocument(OutputSink):
+    """Expected contents of the target, compared incrementally with the intended text."""
+
+    def __init__(self, intended: str = ''):
+        """
+        Args:
+            intended: Text the session should leave in the target (more can
+                      be added with expect() as a stream is planned)
+        """
+        self.reset(intended)
+
+    def reset(self, intended: str = ''):
+        """Start over with an empty target."""
+        self.buffer = GapBuffer()
+        self.intended = array('I')
+        self.matched = 0  # length of the typed prefix that equals the intended text
+        self.expect(intended)
+
+    def expect(self, text: str):
+        """Append `text` to the intended text."""
+        self.intended.extend(map(ord, text))
+        self._advance()
+
+    def _advance(self):
+        """Extend the matched prefix after the intended text grew."""
+        buffer, intended = self.buffer, self.intended
+        limit = min(len(buffer), len(intended))
+        while self.matched < limit and buffer.code_at(self.matched) == intended[self.matched]:
+            self.matched += 1
+
+    def write(self, char: str):
+        """Record a character typed at the end of the target."""
+        # GapBuffer.insert() inlined: this runs for every keystroke
+        code = ord(char)
+        buffer = self.buffer
+        position = buffer.gap_start
+        if position == buffer.gap_end:
+            buffer._grow()
+        buffer.codes[position] = code
+        buffer.gap_start = position + 1
+        if self.matched == position:
+            intended = self.intended
+            if position < len(intended) and intended[position] == code:
+                self.matched = position + 1
+
+    def backspace(self):
+        """Record a backspace at the end of the target."""
+        self.buffer.delete_before()
+        if self.matched > self.buffer.gap_start:
+            self.matched = self.buffer.gap_start
+
+    @property
+    def typed(self) -> int:
+        """Characters the target holds."""
+        return len(self.buffer)
+
+    @property
+    def expected(self) -> int:
+        """Characters of intended text."""
+        return len(self.intended)
+
+    @property
+    def excess(self) -> int:
+        """Characters after the matching prefix that have to be deleted."""
+        return len(self.buffer) - self.matched
+
+    @property
+    def is_correct(self) -> bool:
+        """Whether the target holds exactly the intended text."""
+        return self.matched == len(self.buffer) == len(self.intended)
+
+    def text(self) -> str:
+        """The text the target holds."""
+        return self.buffer.text()
+
+    def remaining(self) -> str:
+        """Intended text still to be typed once the excess is deleted."""
+        return _decode(self.intended[self.matched:])
+
+    def diff(self) -> Dict:
+        """
+        Compare the target with the intended text.
+
+        Returns:
+            Dict: Length of the matching prefix, characters typed and
+                  intended, the typed text after the prefix ('extra', to be
+                  deleted) and the intended text after it ('missing')
+        """
+        return {
+            'matched': self.matched,
+            'typed': self.typed,
+            'expected': self.expected,
+            'extra': self.buffer.slice(self.matched),
+            'missing': self.remaining(),
+            'correct': self.is_correct,
+        }
@@ -0,0 +1,198 @@
+"""
+Output Sinks
+
+A sink is where HumanTyper sends keystrokes. The engine only calls
+write(), backspace() and flush(), so it can drive the OS keyboard, a
+terminal, a file or an in-memory buffer with the same plans.
+
+- KeyboardSink: real key presses through pynput
+- ConsoleSink: terminal output, coalesced into one write per display frame
+- MemorySink: in-memory buffer that applies backspaces
+- FileSink: append-only file of the raw keystroke stream
+"""
+
+import importlib.util
+import sys
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, TextIO
+
+# pynput is only imported when a KeyboardSink is created; importing it loads
+# a platform backend that scripted and headless runs never use
+PYNPUT_AVAILABLE = importlib.util.find_spec('pynput') is not None
+
+
+class OutputSink:
+    """Destination for typed keystrokes."""
+
+    # Longest time output may sit in a buffer before the engine flushes it
+    # (None if the sink never buffers)
+    flush_interval: Optional[float] = None
+
+    def write(self, char: str):
+        """Type a single character."""
+        raise NotImplementedError
+
+    def backspace(self):
+        """Delete the character before the cursor."""
+        raise NotImplementedError
+
+    def prepare(self, chars: Iterable[str]) -> List[str]:
+        """Get ready to type `chars`, returning any this sink cannot type."""
+        return []
+
+    def flush(self):
+        """Push any buffered output to the target."""
+
+    def close(self):
+        """Flush and release the target."""
+        self.flush()
+
+
+class KeyboardSink(OutputSink):
+    """
+    Send keystrokes to the focused application through pynput.
+
+    Each distinct character is resolved once into the pynput key object to
+    press (a special Key, or KeyCode.from_char) and cached, so keystrokes
+    skip building a KeyCode per call; the platform backend still maps that
+    object to a keycode or Unicode injection on every press. '\r' and '\n'
+    each press Enter, so every planned character is one character in the
+    target and corrections delete exactly what was typed (files and stdin
+    are read with universal newlines, so '\r\n' only reaches here from
+    type_text()). Characters that cannot be typed are reported once and
+    skipped.
+    """
+
+    def __init__(self, controller=None):
+        """
+        Args:
+            controller: pynput keyboard controller (created if not given)
+        """
+        try:
+            from pynput.keyboard import Controller, Key, KeyCode
+        except ImportError as e:
+            raise RuntimeError(f"pynput not available ({e}). Install with: pip install pynput")
+        self.controller = controller or Controller()
+        self._backspace = Key.backspace
+        self._from_char = KeyCode.from_char
+        # Character -> pynput key object to press, or None for skipped characters
+        self._key_objects: Dict[str, object] = {'\n': Key.enter, '\t': Key.tab,
+                                                '\r': Key.enter}
+        self.untypable: List[str] = []
+
+    def _resolve(self, char: str):
+        """Key for `char`, or None (recorded in untypable) if it can't be typed."""
+        if unicodedata.category(char) in ('Cc', 'Cs', 'Cn'):
+            key = None
+            self.untypable.append(char)
+        else:
+            key = self._from_char(char)
+        self._key_objects[char] = key
+        return key
+
+    def prepare(self, chars: Iterable[str]) -> List[str]:
+        """Resolve each distinct character up front, returning the untypable ones."""
+        keys = self._key_objects
+        found = len(self.untypable)
+        for char in set(chars):
+            if char not in keys:
+                self._resolve(char)
+        return self.untypable[found:]
+
+    def write(self, char: str):
+        try:
+            key = self._key_objects[char]
+        except KeyError:
+            key = self._resolve(char)
+        if key is None:
+            return
+        try:
+            self.controller.press(key)
+            self.controller.release(key)
+        except Exception as e:
+            # Rejected by the platform backend: report once, skip from now on
+            self._key_objects[char] = None
+            self.untypable.append(char)
+            print(f"Error typing character {char!r}: {e}")
+
+    def backspace(self):
+        self.controller.press(self._backspace)
+        self.controller.release(self._backspace)
+
+
+class ConsoleSink(OutputSink):
+    """Terminal output that coalesces keystrokes into one write per display frame."""
+
+    def __init__(self, stream: Optional[TextIO] = None, frame_rate: float = 60.0):
+        """
+        Args:
+            stream: Text stream to write to (defaults to sys.stdout)
+            frame_rate: Maximum number of writes per second
+        """
+        self.stream = stream
+        self.flush_interval = 1.0 / frame_rate
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def write(self, char: str):
+        self._pending.append(char)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def backspace(self):
+        self.write('\b \b')
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if self._pending:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(self._pending))
+            stream.flush()
+            self._pending.clear()
+
+
+class MemorySink(OutputSink):
+    """In-memory text buffer that applies backspaces."""
+
+    def __init__(self):
+        self.buffer: List[str] = []
+
+    def write(self, char: str):
+        self.buffer.append(char)
+
+    def backspace(self):
+        if self.buffer:
+            self.buffer.pop()
+
+    def getvalue(self) -> str:
+        """Return the current buffer contents."""
+        return ''.join(self.buffer)
+
+
+class FileSink(OutputSink):
+    """Append-only file of the keystroke stream, with backspaces written as '\\b'."""
+
+    def __init__(self, path: str, encoding: str = 'utf-8', buffer_size: int = 64 * 1024):
+        """
+        Args:
+            path: File to append to (created if missing)
+            encoding: Text encoding of the file
+            buffer_size: Bytes buffered before the file is written
+        """
+        self.path = path
+        self.file = open(path, 'a', encoding=encoding, buffering=buffer_size)
+
+    def write(self, char: str):
+        self.file.write(char)
+
+    def backspace(self):
+        self.file.write('\b')
+
+    def flush(self):
+        if not self.file.closed:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
@@ -0,0 +1,109 @@
+"""
+Streaming Text Sources
+
+Lazy readers and a tokenizer that let HumanTyper start typing a document
+before it has been read completely. Memory use stays flat no matter how
+large the input is: only the current chunk and the word being assembled
+are held at any time.
+"""
+
+import codecs
+import io
+import mmap
+import os
+import re
+import sys
+from typing import Iterable, Iterator, Optional, TextIO
+
+# Characters read per chunk
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Words longer than this are emitted in pieces instead of buffered whole
+MAX_WORD_LENGTH = 4096
+
+# Words and single spaces, in the order they are typed
+TOKEN_PATTERN = re.compile(r'[^ ]+| ')
+
+
+def iter_tokens(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Split a stream of text chunks into words and single spaces.
+
+    Produces the same tokens TOKEN_PATTERN would find in the joined text,
+    even when a word straddles a chunk boundary. Only words longer than
+    MAX_WORD_LENGTH are split.
+    """
+    carry = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        tokens = TOKEN_PATTERN.findall(carry + chunk)
+        # The last word may continue in the next chunk
+        if chunk[-1] != ' ':
+            carry = tokens.pop()
+            if len(carry) > MAX_WORD_LENGTH:
+                tokens.append(carry)
+                carry = ''
+        else:
+            carry = ''
+        yield from tokens
+    if carry:
+        yield carry
+
+
+def utf8_length(token: str) -> int:
+    """Number of bytes `token` occupies in UTF-8."""
+    return len(token) if token.isascii() else len(token.encode('utf-8'))
+
+
+def iter_file_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Decode a memory-mapped file lazily, one chunk at a time.
+
+    Newlines are translated to '\\n' the same way text-mode open() does.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(errors='replace'), translate=True)
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, len(mapped), chunk_size):
+                text = decoder.decode(mapped[offset:offset + chunk_size])
+                if text:
+                    yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def iter_stream_chunks(stream: Optional[TextIO] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read a text stream (stdin by default) lazily, yielding text as it arrives.
+
+    A slow or interactive producer is not waited on for a full chunk: the
+    binary buffer under the stream is read with read1(), which returns what
+    has been written so far (up to chunk_size bytes), and decoded like
+    iter_file_chunks(). Text streams without one are read a line at a time.
+    """
+    stream = stream or sys.stdin
+    raw = getattr(stream, 'buffer', None)
+    if raw is None or not hasattr(raw, 'read1'):
+        return iter(lambda: stream.readline(chunk_size), '')
+    return _iter_available(raw, stream.encoding, getattr(stream, 'errors', None) or 'strict',
+                           chunk_size)
+
+
+def _iter_available(raw, encoding: str, errors: str, chunk_size: int) -> Iterator[str]:
+    """Decode the bytes of `raw` as read1() makes them available."""
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(errors=errors), translate=True)
+    while True:
+        data = raw.read1(chunk_size)
+        text = decoder.decode(data, final=not data)
+        if text:
+            yield text
+        if not data:
+            return
@@ -0,0 +1,89 @@
+"""
+Keystroke Tracing
+
+An opt-in Tracer records spans and instant events with monotonic
+timestamps into a fixed-size ring buffer, and exports them as Chrome trace
+JSON that can be opened in Perfetto (ui.perfetto.dev) or chrome://tracing.
+The engine only checks `tracer is not None` on its hot paths, so tracing
+costs nothing measurable while disabled.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Events kept before the oldest are dropped
+DEFAULT_CAPACITY = 1 << 16
+
+# Chrome trace phases
+PHASE_COMPLETE = 'X'
+PHASE_INSTANT = 'i'
+PHASE_BEGIN = 'B'
+PHASE_END = 'E'
+
+
+class Tracer:
+    """Ring buffer of trace events."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity: Number of events kept; older events are dropped first
+        """
+        # deque.append is atomic, so the typing and GUI threads can both record
+        self.events = deque(maxlen=capacity)
+        self.pid = os.getpid()
+
+    @staticmethod
+    def now() -> int:
+        """Monotonic timestamp in nanoseconds."""
+        return time.perf_counter_ns()
+
+    def complete(self, name: str, start_ns: int, end_ns: Optional[int] = None,
+                 args: Optional[Dict] = None):
+        """Record a span that started at `start_ns` and ended at `end_ns` (default now)."""
+        if end_ns is None:
+            end_ns = time.perf_counter_ns()
+        self.events.append((PHASE_COMPLETE, name, start_ns, end_ns - start_ns,
+                            threading.get_ident(), args))
+
+    def instant(self, name: str, args: Optional[Dict] = None):
+        """Record a point-in-time event."""
+        self.events.append((PHASE_INSTANT, name, time.perf_counter_ns(), 0,
+                            threading.get_ident(), args))
+
+    def begin(self, name: str, args: Optional[Dict] = None):
+        """Open a span on the current thread (close it with end())."""
+        self.events.append((PHASE_BEGIN, name, time.perf_counter_ns(), 0,
+                            threading.get_ident(), args))
+
+    def end(self, name: str, args: Optional[Dict] = None):
+        """Close the span most recently opened on the current thread."""
+        self.events.append((PHASE_END, name, time.perf_counter_ns(), 0,
+                            threading.get_ident(), args))
+
+    def clear(self):
+        """Drop all recorded events."""
+        self.events.clear()
+
+    def to_chrome_trace(self) -> Dict:
+        """Recorded events in the Chrome trace event format (timestamps in µs)."""
+        trace_events: List[Dict] = []
+        for phase, name, ts_ns, dur_ns, tid, args in list(self.events):
+            event = {'name': name, 'ph': phase, 'ts': ts_ns / 1e3, 'pid': self.pid, 'tid': tid}
+            if phase == PHASE_COMPLETE:
+                event['dur'] = dur_ns / 1e3
+            elif phase == PHASE_INSTANT:
+                event['s'] = 't'
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path: str):
+        """Write the trace to `path` as Chrome trace JSON."""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_chrome_trace(), file)
@@ -0,0 +1,114 @@
+"""
+Keystroke Plan
+
+Compact, array-backed timeline of keystroke events. A plan is produced
+ahead of time by HumanTyper.compile_plan() so that all random decisions
+(typos, double characters, swaps, delays and pauses) are made before any
+key is pressed. Executing a plan only has to replay the events in order.
+"""
+
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+# Event actions
+ACTION_PRESS = 0
+ACTION_BACKSPACE = 1
+
+# Key code stored for backspace events
+BACKSPACE_CODE = 0x08
+
+
+class TypingPlan:
+    """Timeline of keystroke events with scheduled offsets in seconds."""
+
+    __slots__ = ('keys', 'actions', 'offsets', 'progress', 'duration',
+                 'completed', 'stats', 'pending_pause', 'previous')
+
+    def __init__(self):
+        self.keys = array('I')       # Unicode code point of each key
+        self.actions = array('B')    # ACTION_PRESS or ACTION_BACKSPACE
+        self.offsets = array('d')    # Scheduled time since start (seconds)
+        self.progress = array('Q')   # Target characters completed at each event
+        self.duration = 0.0          # Planned clock, including the trailing delay
+        self.completed = 0           # Target characters finished so far
+        self.pending_pause = 0.0     # Pause time planned since the last event
+        self.previous: Optional[Tuple[int, int, float]] = None  # Last event of the plan continued
+        self.stats = {
+            'typos': 0,
+            'double_chars': 0,
+            'swaps': 0,
+            'corrections': 0,
+            'backspaces': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def press(self, char: str):
+        """Append a key press for `char` at the current planned time."""
+        self.keys.append(ord(char))
+        self.actions.append(ACTION_PRESS)
+        self.offsets.append(self.duration)
+        self.progress.append(self.completed)
+        self.pending_pause = 0.0
+
+    def backspace(self):
+        """Append a backspace at the current planned time."""
+        self.keys.append(BACKSPACE_CODE)
+        self.actions.append(ACTION_BACKSPACE)
+        self.offsets.append(self.duration)
+        self.progress.append(self.completed)
+        self.pending_pause = 0.0
+        self.stats['backspaces'] += 1
+
+    def wait(self, seconds: float):
+        """Advance the planned clock."""
+        self.duration += seconds
+
+    def pause(self, seconds: float):
+        """Advance the planned clock by a pause that stretch_gap() leaves alone."""
+        self.duration += seconds
+        self.pending_pause += seconds
+
+    def last_event(self) -> Optional[Tuple[int, int, float]]:
+        """(code, action, offset) of the latest event, including the plan this one continues."""
+        if self.actions:
+            return self.keys[-1], self.actions[-1], self.offsets[-1]
+        return self.previous
+
+    def stretch_gap(self, factor: float):
+        """Scale the delay planned since the last event (not pauses) by `factor` (>= 0)."""
+        last = self.offsets[-1] if self.offsets else self.previous and self.previous[2]
+        if last is not None:
+            delay = self.duration - self.pending_pause - last
+            self.duration = last + delay * factor + self.pending_pause
+
+    def continuation(self) -> 'TypingPlan':
+        """Start an empty plan that continues this one's clock, last event, progress and stats."""
+        plan = TypingPlan()
+        plan.duration = self.duration
+        plan.pending_pause = self.pending_pause
+        plan.completed = self.completed
+        plan.stats = self.stats
+        plan.previous = self.last_event()
+        return plan
+
+    def events(self) -> Iterator[Tuple[str, int, float]]:
+        """Iterate over (key, action, offset) tuples."""
+        for code, action, offset in zip(self.keys, self.actions, self.offsets):
+            yield chr(code), action, offset
+
+    def final_text(self) -> str:
+        """Return the text the target ends up with after replaying the plan."""
+        buffer = []
+        for code, action in zip(self.keys, self.actions):
+            if action == ACTION_BACKSPACE:
+                if buffer:
+                    buffer.pop()
+            else:
+                buffer.append(chr(code))
+        return ''.join(buffer)
+
+    def summary(self) -> Dict:
+        """Return event counts and the planned duration."""
+        return dict(self.stats, events=len(self), duration=self.duration)
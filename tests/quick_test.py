@@ -5,6 +5,8 @@ Quick Test Script for Human Typer
 Run this script to quickly test the human typer with a simple message.
 """
 
+import time
+
 from human_typer import HumanTyper, PYNPUT_AVAILABLE
 
 def main():
@@ -50,10 +52,10 @@ def main():
     if PYNPUT_AVAILABLE:
         print(f"\nYou have 5 seconds to switch to your target application...")
         input("Press Enter when ready...")
-        typer.type_text(text, delay_before_start=5.0)
+        time.sleep(5.0)
     else:
         input("\nPress Enter to simulate typing in console...")
-        typer.type_text(text, delay_before_start=0.0)
+    typer.execute_plan(typer.compile_plan(text))
     
     print("\nTest completed!")
 
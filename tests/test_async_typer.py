@@ -0,0 +1,89 @@
+"""
+Checks for running many typing sessions on one asyncio event loop.
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import json
+from collections import Counter
+
+from async_typer import AsyncHumanTyper
+from sinks import MemorySink
+
+TEXT = "many sessions"
+
+
+class SharedLogSink(MemorySink):
+    """Memory sink that also appends its session number to a log shared by all sessions."""
+
+    def __init__(self, number: int, log: list):
+        super().__init__()
+        self.number = number
+        self.log = log
+
+    def write(self, char):
+        super().write(char)
+        self.log.append(self.number)
+
+
+def make_typer(seed: int, sink=None) -> AsyncHumanTyper:
+    typer = AsyncHumanTyper(use_keyboard=False, sink=sink or MemorySink(), seed=seed)
+    typer.set_speed(500)
+    typer.pause_probability = 0.0
+    return typer
+
+
+def test_concurrent_sessions_share_one_loop():
+    # Lateness under load is measured by bench_scheduler
+    log = []
+    typers = [make_typer(seed, SharedLogSink(seed, log)) for seed in range(1000)]
+
+    async def run():
+        return await asyncio.gather(*(typer.type_text(TEXT) for typer in typers))
+
+    assert all(asyncio.run(run()))
+    for typer in typers:
+        assert typer.sink.getvalue() == TEXT
+    # No session blocks the loop: every one has typed before any one finishes
+    first, last = {}, {}
+    for position, number in enumerate(log):
+        first.setdefault(number, position)
+        last[number] = position
+    assert len(first) == 1000
+    assert max(first.values()) < min(last.values())
+
+
+def test_cancellation_stops_typing():
+    typer = make_typer(0)
+    stopped = []
+    typer.set_callbacks(on_stop=lambda: stopped.append(True))
+
+    async def run():
+        task = asyncio.create_task(typer.type_text(TEXT * 10))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    assert stopped == [True]
+    assert not typer.is_typing
+    assert len(typer.sink.getvalue()) < len(TEXT * 10)
+
+
+def test_async_sessions_trace_waits_and_outputs(tmp_path):
+    typer = make_typer(3)
+    typer.set_error_rate(0.3)
+    typer.enable_tracing()
+    assert asyncio.run(typer.type_text(TEXT))
+
+    path = tmp_path / "trace.json"
+    typer.tracer.dump(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    names = Counter(event['name'] for event in events if event['ph'] == 'X')
+    keystrokes = typer.get_session_stats()['keystrokes']
+    assert names['wait'] == names['output'] == keystrokes
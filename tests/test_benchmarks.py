@@ -0,0 +1,29 @@
+"""
+Smoke test for the benchmark suite: the fast benchmarks run and report numbers.
+
+Run with: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'benchmarks'))
+
+import bench_keystroke
+import bench_progress
+from run import check, flatten
+
+
+def test_fast_benchmarks_report_numbers():
+    results = {'keystroke': bench_keystroke.run(quick=True),
+               'progress': bench_progress.run(quick=True)}
+    values = dict(flatten(results))
+    assert values['keystroke.null_sink_ns_per_key'] > 0
+    assert values['progress.counter_publish_ns'] > 0
+
+
+def test_check_reports_results_over_their_limits():
+    assert check('planning', {'compile_ms_per_100kb': 1.0}) == []
+    assert check('planning', {'compile_ms_per_100kb': 1e9}) == [
+        'planning.compile_ms_per_100kb: 1000000000.000 > 750.0']
@@ -0,0 +1,78 @@
+"""
+Synthetic keystroke dataset generation.
+
+Run with: python -m pytest tests
+"""
+
+import json
+
+import pytest
+
+from dataset import error_flags, generate_dataset
+from typing_plan import ACTION_BACKSPACE, ACTION_PRESS
+
+np = pytest.importorskip("numpy")
+
+TEXTS = ["the quick brown fox", "jumps over the lazy dog", "pack my box"]
+
+
+def load(directory):
+    manifest = json.loads((directory / 'manifest.json').read_text())
+    parts = [dict(np.load(directory / name)) for name in manifest['files']]
+    return manifest, parts
+
+
+def test_error_flags_mark_deleted_presses_and_backspaces():
+    B, P = ACTION_BACKSPACE, ACTION_PRESS
+    keys = [ord(c) for c in 'abx'] + [8] + [ord('c')]
+    assert list(error_flags(keys, [P, P, P, B, P])) == [0, 0, 1, 1, 0]
+
+
+def test_sessions_cover_the_grid_and_replay_to_the_text(tmp_path):
+    manifest, parts = load_generated(tmp_path, workers=2)
+    assert manifest['sessions'] == len(TEXTS) * 2 * 2 * 3
+    assert sum(len(part['session']) for part in parts) == manifest['sessions']
+
+    for part in parts:
+        offsets = part['offset']
+        for row, session in enumerate(part['session']):
+            start, end = offsets[row], offsets[row + 1]
+            typed = []
+            for key, action in zip(part['key'][start:end], part['action'][start:end]):
+                if action == ACTION_BACKSPACE:
+                    typed.pop()
+                else:
+                    typed.append(chr(key))
+            assert ''.join(typed) == TEXTS[part['text'][row]]
+            times = part['time'][start:end]
+            assert (np.diff(times) >= 0).all()
+            kept = ~part['error'][start:end]
+            assert kept.sum() == len(TEXTS[part['text'][row]])
+
+
+def load_generated(directory, workers):
+    generate_dataset(TEXTS, str(directory), speeds=[150, 900], error_rates=[0.0, 0.2],
+                     layouts=['qwerty', 'dvorak', 'colemak'], repeats=1, seed=7,
+                     workers=workers, chunk_sessions=5)
+    return load(directory)
+
+
+def test_output_does_not_depend_on_worker_count(tmp_path):
+    _, one = load_generated(tmp_path / 'one', workers=1)
+    _, three = load_generated(tmp_path / 'three', workers=3)
+    for left, right in zip(one, three):
+        assert left.keys() == right.keys()
+        for column in left:
+            assert (left[column] == right[column]).all()
+
+
+def test_rejects_empty_corpus(tmp_path):
+    with pytest.raises(ValueError):
+        generate_dataset([], str(tmp_path))
+
+
+@pytest.mark.parametrize("seed", [-1, 1 << 32])
+def test_rejects_seeds_outside_the_session_seed_range(tmp_path, seed):
+    with pytest.raises(ValueError):
+        generate_dataset(["text"], str(tmp_path), seed=seed)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,84 @@
+"""
+Digraph delay factors.
+
+Run with: python -m pytest tests
+"""
+
+import re
+from pathlib import Path
+from statistics import mean
+
+import pytest
+
+from digraphs import DigraphModel, get_digraph_model
+from human_typer import HumanTyper
+from layouts import get_layout
+from sinks import MemorySink
+from text_stream import TOKEN_PATTERN
+from typing_plan import TypingPlan
+
+TEXT = "the quick brown fox jumps over the lazy dog"
+
+
+def test_builtin_factors_follow_finger_use():
+    model = get_digraph_model('qwerty')
+    # Hand alternation beats same hand, which beats the same finger
+    assert model.factor('t', 'h') < model.factor('a', 's') < model.factor('e', 'd')
+    assert model.factor('a', 'B') > model.factor('a', 'b')  # reaching for shift
+    assert model.factor('€', 'a') == 1.0
+    assert get_digraph_model('qwerty') is model
+
+
+def test_builtin_factors_keep_average_speed():
+    readme = Path(__file__).parent.parent / 'README.md'
+    prose = ' '.join(re.findall(r"[a-z]+", readme.read_text(encoding='utf-8')))
+    model = get_digraph_model('qwerty')
+    assert 0.95 < mean(model.factor(a, b) for a, b in zip(prose, prose[1:])) < 1.05
+
+
+def test_overrides():
+    model = DigraphModel(get_layout('qwerty'), {'th': 0.5, 'ñe': 2.0})
+    assert model.factor('t', 'h') == 0.5
+    assert model.factor('ñ', 'e') == 2.0
+    with pytest.raises(ValueError):
+        DigraphModel(get_layout('qwerty'), {'abc': 1.0})
+    with pytest.raises(ValueError):
+        DigraphModel(get_layout('qwerty'), {'ab': 0.0})
+
+
+def test_plan_gaps_use_digraph_factors():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=5)
+    typer.set_error_rate(0.0)
+    typer.double_char_probability = typer.char_swap_probability = 0.0
+    typer.pause_probability = 0.0
+    typer.speed_variance = 0
+    slow = typer.simulate(TEXT)['duration']
+    typer.set_digraph_factors({a + b: 0.5 for a, b in zip(TEXT, TEXT[1:])})
+    fast = typer.simulate(TEXT)['duration']
+    base = 60.0 / typer.base_speed
+    assert fast == pytest.approx(0.5 * base * (len(TEXT) - 1) + base)
+    assert fast < slow
+    typer.set_keyboard_layout('colemak')
+    assert typer.digraphs.factor('t', 'h') == 0.5
+    typer.set_digraph_factors(None)
+    assert typer.digraphs is get_digraph_model('colemak')
+
+
+def test_digraph_gaps_cross_batch_boundaries():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=8)
+    whole = typer.compile_plan(TEXT * 3, seed=8)
+
+    # Plan the same session in small batches, as streams and long texts are
+    typer._begin_session(8)
+    plan = TypingPlan()
+    offsets = []
+    for token in TOKEN_PATTERN.findall(TEXT * 3):
+        typer._plan_token(plan, token)
+        plan.completed += len(token)
+        if len(plan) >= 5:
+            offsets.extend(plan.offsets)
+            plan = plan.continuation()
+    offsets.extend(plan.offsets)
+
+    assert offsets == pytest.approx(list(whole.offsets), abs=1e-12)
+    assert plan.duration == pytest.approx(whole.duration)
@@ -0,0 +1,115 @@
+"""
+Closed-form duration and keystroke estimates against planned sessions.
+
+Run with: python -m pytest tests
+"""
+
+import statistics
+
+import pytest
+
+from estimator import TypingEstimator, clipped_uniform
+from human_typer import HumanTyper
+from sinks import MemorySink
+
+TEXT = ("The quick brown fox jumps over the lazy dog. Typing models need realistic "
+        "pauses, typos and corrections between words.\nA second line follows here. ") * 2
+
+
+def planned(typer, sessions=600):
+    plans = [typer.compile_plan(TEXT, seed=seed) for seed in range(sessions)]
+    durations = [plan.duration for plan in plans]
+    keystrokes = [len(plan.keys) for plan in plans]
+    return durations, keystrokes
+
+
+@pytest.mark.parametrize("setup", ["default", "sloppy", "fast", "throughput",
+                                   "sloppy-throughput"])
+def test_estimate_matches_planned_sessions(setup):
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+    if setup == "sloppy":
+        typer.set_error_rate(0.3)
+        typer.char_swap_probability = 0.3
+        typer.set_correction_rate(0.5)
+    elif setup == "fast":
+        typer.base_speed = 1500  # below the minimum delay at times
+    elif setup == "throughput":
+        typer.set_throughput_mode(3000, error_probability=0.2)
+    elif setup == "sloppy-throughput":
+        typer.set_throughput_mode(3000, burst_length=20, error_probability=0.5)
+        typer.char_swap_probability = 0.3
+    estimate = typer.estimate(TEXT)
+    durations, keystrokes = planned(typer)
+
+    assert estimate['characters'] == len(TEXT)
+    assert estimate['duration'] == pytest.approx(statistics.mean(durations), rel=0.02)
+    assert estimate['keystrokes'] == pytest.approx(statistics.mean(keystrokes), rel=0.02)
+    assert estimate['duration_std'] == pytest.approx(statistics.stdev(durations), rel=0.15)
+    assert estimate['keystrokes_std'] == pytest.approx(statistics.stdev(keystrokes), rel=0.15, abs=0.5)
+
+
+def test_clipped_uniform_moments():
+    assert clipped_uniform(0.2, 0.4, 0.05) == pytest.approx((0.3, 0.04 / 12))
+    assert clipped_uniform(0.01, 0.04, 0.05) == (0.05, 0.0)
+    # Half the draws are clipped to the floor
+    mean, variance = clipped_uniform(0.0, 0.2, 0.1)
+    assert mean == pytest.approx(0.5 * 0.1 + 0.5 * 0.15)
+    assert variance > 0
+
+
+def test_feeding_chunks_counts_split_words_once():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+    whole = TypingEstimator(typer)
+    whole.set_text(TEXT)
+    chunked = TypingEstimator(typer)
+    for start in range(0, len(TEXT), 7):
+        chunked.feed(TEXT[start:start + 7])
+    assert chunked.estimate() == pytest.approx(whole.estimate())
+
+
+def test_settings_update_without_the_text():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+    estimator = TypingEstimator(typer)
+    estimator.set_text(TEXT)
+    slow = estimator.estimate()['duration']
+    typer.set_speed(400)
+    estimator.update_settings(typer)
+    assert estimator.estimate()['duration'] < slow
+    assert typer.estimate('')['duration'] == 0.0
+
+
+class CountingEstimator(TypingEstimator):
+    """Estimator that counts the swapped-word branches it evaluates."""
+
+    swaps = 0
+
+    def _swap_moments(self, length, retyped):
+        self.swaps += 1
+        return super()._swap_moments(length, retyped)
+
+
+@pytest.mark.parametrize("length", [2, 1000, 1000000])
+def test_word_cost_does_not_grow_with_its_length(length):
+    estimator = CountingEstimator(HumanTyper(use_keyboard=False, sink=MemorySink()))
+    estimator.set_text("x" * length)
+    estimator.estimate()
+    estimator.estimate()
+    # Two points of the swap mixture, computed once per word length
+    assert estimator.swaps == 2
+
+
+def test_estimate_work_follows_distinct_word_lengths():
+    estimator = CountingEstimator(HumanTyper(use_keyboard=False, sink=MemorySink()))
+    estimator.set_text(TEXT * 500)
+    estimator.estimate()
+    lengths = {len(word) for word in TEXT.split(' ')} - {0, 1}
+    assert estimator.swaps == 2 * len(lengths)
+
+
+def test_feeding_a_long_word_keeps_only_its_length():
+    estimator = TypingEstimator(HumanTyper(use_keyboard=False, sink=MemorySink()))
+    for _ in range(1000):
+        estimator.feed("x" * 1024)
+    assert estimator._tail == 1024 * 1000
+    assert not estimator.words
+    assert estimator.estimate()['words'] == 1
@@ -0,0 +1,59 @@
+"""
+Background file loading used by the GUI editor (no display needed).
+
+Run with: python -m pytest tests
+"""
+
+import queue
+import threading
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from human_typer_gui import HumanTyperGUI, LOAD_CHUNK_SIZE
+
+
+def drain(chunks: queue.Queue) -> list:
+    items = []
+    while True:
+        item = chunks.get(timeout=5)
+        items.append(item)
+        if item is None or isinstance(item, Exception):
+            return items
+
+
+def test_worker_streams_file_in_chunks(tmp_path):
+    path = tmp_path / "big.txt"
+    text = "line of text é\n" * 20000
+    path.write_text(text, encoding="utf-8")
+    chunks = queue.Queue(maxsize=2)
+    worker = threading.Thread(target=HumanTyperGUI._read_file_worker,
+                              args=(str(path), chunks, threading.Event()))
+    worker.start()
+
+    items = drain(chunks)
+    worker.join(5)
+    assert items[-1] is None
+    assert len(items) > len(text.encode("utf-8")) // LOAD_CHUNK_SIZE
+    assert "".join(items[:-1]) == text
+
+
+def test_worker_stops_when_cancelled(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("x" * (LOAD_CHUNK_SIZE * 50), encoding="utf-8")
+    chunks = queue.Queue(maxsize=1)
+    cancelled = threading.Event()
+    worker = threading.Thread(target=HumanTyperGUI._read_file_worker,
+                              args=(str(path), chunks, cancelled))
+    worker.start()
+    chunks.get(timeout=5)
+    cancelled.set()
+    worker.join(5)
+    assert not worker.is_alive()
+
+
+def test_worker_reports_errors(tmp_path):
+    chunks = queue.Queue()
+    HumanTyperGUI._read_file_worker(str(tmp_path / "missing.txt"), chunks, threading.Event())
+    assert isinstance(chunks.get_nowait(), OSError)
@@ -0,0 +1,91 @@
+"""
+GUI progress polling across sessions (no display needed).
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from human_typer import HumanTyper
+from human_typer_gui import HumanTyperGUI
+from sinks import MemorySink
+
+
+class FakeRoot:
+    """Tk root stand-in whose after() jobs run when the test says so."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+class Recorder:
+    """Stands in for a Tk variable or widget and remembers what was set."""
+
+    def __init__(self):
+        self.value = None
+        self.options = {}
+
+    def set(self, value):
+        self.value = value
+
+    def config(self, **options):
+        self.options.update(options)
+
+
+def make_gui():
+    gui = HumanTyperGUI.__new__(HumanTyperGUI)
+    gui.root = FakeRoot()
+    gui.typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+    gui.progress_interval = 33
+    gui.progress_job = None
+    gui.progress_unit = "characters"
+    gui.characters_typed = 0
+    gui.is_typing = False
+    gui.progress_var = Recorder()
+    gui.progress_bar = Recorder()
+    gui.start_button = Recorder()
+    gui.stop_button = Recorder()
+    return gui
+
+
+def test_progress_updates_after_a_restart():
+    gui = make_gui()
+    progress = gui.typer.progress
+
+    # First session
+    gui.on_typing_start()
+    gui.root.run_pending()
+    progress.reset(10)
+    progress.publish(4, 10)
+    gui.root.run_pending()
+    assert gui.progress_var.value == "Typing: 4/10 characters (40.0%)"
+
+    # Stop (F6) cancels the poll
+    gui.on_typing_stop()
+    gui.root.run_pending()
+    assert gui.progress_job is None
+    assert gui.progress_var.value == "Typing complete!"
+
+    # Second session (F6 again) polls again
+    gui.on_typing_start()
+    gui.root.run_pending()
+    progress.publish(7, 10)
+    gui.root.run_pending()
+    assert gui.progress_var.value == "Typing: 7/10 characters (70.0%)"
+    assert gui.progress_job is not None
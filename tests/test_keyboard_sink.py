@@ -0,0 +1,117 @@
+"""
+KeyboardSink key dispatch, against a stand-in pynput backend.
+
+Run with: python -m pytest tests
+"""
+
+import sys
+import types
+
+import pytest
+
+from human_typer import HumanTyper
+from sinks import KeyboardSink
+from typing_plan import ACTION_BACKSPACE
+
+
+class FakeKeyCode:
+    resolved = 0
+
+    def __init__(self, char):
+        self.char = char
+
+    @classmethod
+    def from_char(cls, char):
+        cls.resolved += 1
+        return cls(char)
+
+
+class FakeController:
+    def __init__(self):
+        self.pressed = []
+
+    def press(self, key):
+        if getattr(key, 'char', None) == '☃':
+            raise ValueError("no keysym")
+        self.pressed.append(getattr(key, 'char', key))
+
+    def release(self, key):
+        pass
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    keyboard = types.ModuleType('pynput.keyboard')
+    keyboard.Controller = FakeController
+    keyboard.KeyCode = FakeKeyCode
+    keyboard.Key = types.SimpleNamespace(enter='<enter>', tab='<tab>', backspace='<bs>')
+    package = types.ModuleType('pynput')
+    package.keyboard = keyboard
+    monkeypatch.setitem(sys.modules, 'pynput', package)
+    monkeypatch.setitem(sys.modules, 'pynput.keyboard', keyboard)
+    FakeKeyCode.resolved = 0
+    return KeyboardSink()
+
+
+def test_each_character_is_resolved_once(sink):
+    text = "hi\tyo\r\nhi"
+    assert sink.prepare(text) == []
+    for char in text:
+        sink.write(char)
+    sink.backspace()
+    assert FakeKeyCode.resolved == len(set("hiyo"))
+    # One key per character: '\r\n' is two Enters
+    assert sink.controller.pressed == ['h', 'i', '<tab>', 'y', 'o', '<enter>', '<enter>',
+                                       'h', 'i', '<bs>']
+
+
+def test_carriage_returns_press_enter(sink):
+    for char in "a\rb\r\rc\n\nd":
+        sink.write(char)
+    assert sink.controller.pressed == ['a', '<enter>', 'b', '<enter>', '<enter>', 'c',
+                                       '<enter>', '<enter>', 'd']
+
+
+def test_untypable_characters_are_reported_up_front(sink):
+    assert sorted(sink.prepare("ok\x00\x07ok")) == ['\x00', '\x07']
+    assert sink.prepare("ok\x00") == []  # already known
+    sink.write('\x00')
+    assert sink.controller.pressed == []
+
+
+def test_backend_rejections_are_reported_once(sink, capsys):
+    for _ in range(3):
+        sink.write('☃')
+    assert sink.untypable == ['☃']
+    assert capsys.readouterr().out.count("Error typing") == 1
+
+
+def target_text(pressed):
+    """What the focused application holds after the pressed keys."""
+    text = []
+    for key in pressed:
+        if key == '<bs>':
+            if text:
+                text.pop()
+        else:
+            text.append('\n' if key == '<enter>' else key)
+    return ''.join(text)
+
+
+def test_corrections_across_crlf_delete_what_was_typed(sink):
+    text = "hello ab\r\ncd world"
+    typer = HumanTyper(use_keyboard=False, sink=sink)
+    typer.char_swap_probability = 0.5
+    typer.set_error_rate(0.2)
+    corrected = 0
+    for seed in range(300):
+        sink.controller.pressed.clear()
+        plan = typer.compile_plan(text, seed=seed)
+        for code, action in zip(plan.keys, plan.actions):
+            if action == ACTION_BACKSPACE:
+                sink.backspace()
+            else:
+                sink.write(chr(code))
+        corrected += '<bs>' in sink.controller.pressed
+        assert target_text(sink.controller.pressed) == text.replace('\r', '\n'), seed
+    assert corrected > 200
@@ -0,0 +1,56 @@
+"""
+Geometry-based keyboard layouts.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from human_typer import HumanTyper
+from layouts import LAYOUT_NAMES, get_layout
+from sinks import MemorySink
+
+TEXT = "The quick brown fox, 42 times! Élan & zèle?"
+
+
+def test_neighbors_follow_the_layout():
+    qwerty = get_layout('qwerty')
+    assert set(qwerty.neighbors['f']) >= {'d', 'g', 'r', 'v'}
+    assert 'w' in qwerty.neighbors['q'] and '1' in qwerty.neighbors['q']
+    # Shifted keys hit shifted neighbors
+    assert '@' in qwerty.neighbors['!'] and 'Q' in qwerty.neighbors['!']
+    assert set(get_layout('azerty').neighbors['a']) >= {'z', 'q'}
+    assert set(get_layout('dvorak').neighbors['h']) >= {'d', 't'}
+
+
+def test_tables_are_shared_and_read_only():
+    first = HumanTyper(use_keyboard=False)
+    second = HumanTyper(use_keyboard=False)
+    assert first.layout is second.layout
+    with pytest.raises(TypeError):
+        first.keyboard_layout['f'] = ('x',)
+    with pytest.raises(TypeError):
+        first.layout.distances[0] = 1.0
+
+
+def test_distances_and_travel():
+    layout = get_layout('qwerty')
+    assert layout.distance('f', 'j') == layout.distance('j', 'f') == 3.0
+    assert layout.distance('f', 'F') == 0.0
+    assert layout.distance('a', 'é') is None
+    assert layout.travel_factor('f', 'g') < 1.0 < layout.travel_factor('q', 'p')
+    assert layout.travel_factor('q', ' ') == 1.0
+
+
+def test_unknown_layout():
+    with pytest.raises(ValueError):
+        HumanTyper(use_keyboard=False).set_keyboard_layout('klingon')
+
+
+@pytest.mark.parametrize('name', LAYOUT_NAMES)
+def test_every_layout_types_the_text(name):
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=3)
+    typer.set_keyboard_layout(name)
+    typer.set_error_rate(0.5)
+    assert typer.get_current_settings()['keyboard_layout'] == name
+    assert typer.simulate(TEXT)['text'] == TEXT
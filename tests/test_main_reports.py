@@ -0,0 +1,75 @@
+"""
+CLI outputs (--stats, --trace, --log) in F6 hotkey mode, against a stand-in pynput.
+
+Run with: python -m pytest tests
+"""
+
+import json
+import os
+import sys
+import threading
+import types
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeController:
+    def __init__(self):
+        self.pressed = []
+
+    def press(self, key):
+        self.pressed.append(key)
+
+    def release(self, key):
+        pass
+
+
+class FakeListener:
+    """Listener that presses F6 once main() waits on it, then returns when typing ends."""
+
+    def __init__(self, on_press):
+        self.on_press = on_press
+        self.daemon = False
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def join(self):
+        self.on_press('<f6>')
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread() and thread.daemon:
+                thread.join()
+
+
+def install_fake_pynput(monkeypatch):
+    keyboard = types.ModuleType('pynput.keyboard')
+    keyboard.Controller = FakeController
+    keyboard.Listener = FakeListener
+    keyboard.KeyCode = types.SimpleNamespace(from_char=lambda char: char)
+    keyboard.Key = types.SimpleNamespace(enter='<enter>', tab='<tab>', backspace='<bs>',
+                                         f6='<f6>', f7='<f7>')
+    package = types.ModuleType('pynput')
+    package.keyboard = keyboard
+    monkeypatch.setitem(sys.modules, 'pynput', package)
+    monkeypatch.setitem(sys.modules, 'pynput.keyboard', keyboard)
+
+
+def test_hotkey_sessions_write_their_outputs_when_they_end(monkeypatch, tmp_path):
+    monkeypatch.syspath_prepend(ROOT_DIR)
+    import main
+    import src.human_typer
+    install_fake_pynput(monkeypatch)
+    monkeypatch.setattr(src.human_typer, 'PYNPUT_AVAILABLE', True)
+
+    stats, trace, log = tmp_path / "stats.json", tmp_path / "trace.json", tmp_path / "keys.log"
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--cli', '--text', 'hotkey run',
+                                      '--speed', '500', '--seed', '1', '--stats', str(stats),
+                                      '--trace', str(trace), '--log', str(log)])
+    main.main()
+
+    assert json.loads(stats.read_text())['characters'] == len('hotkey run')
+    assert json.loads(trace.read_text())['traceEvents']
+    assert log.stat().st_size > 0
@@ -0,0 +1,82 @@
+"""
+Per-session metrics and their JSON / Prometheus output.
+
+Run with: python -m pytest tests
+"""
+
+import json
+
+from human_typer import HumanTyper
+from metrics import LatencyHistogram, to_prometheus, write_json
+from sinks import MemorySink
+
+TEXT = "metrics at work"
+
+
+def run_session() -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=4)
+    typer.set_speed(500)
+    typer.set_error_rate(0.3)
+    typer.pause_probability = 0.0
+    plan = typer.compile_plan(TEXT)
+    assert typer.execute_plan(plan)
+    return typer
+
+
+def test_session_stats_match_the_plan():
+    typer = run_session()
+    stats = typer.get_session_stats()
+
+    assert stats['keystrokes'] == len(TEXT) + 2 * stats['backspaces']
+    assert stats['characters'] == len(TEXT)
+    assert stats['corrections'] == stats['typos'] + stats['double_chars'] + stats['swaps']
+    assert stats['target_cpm'] == 500
+    assert 0 < stats['achieved_cpm'] < 1000
+    assert stats['achieved_wpm'] == stats['achieved_cpm'] / 5
+    assert 0 <= stats['cpu_time'] < stats['elapsed']
+
+    histograms = stats['histograms']
+    assert histograms['intended_delay']['count'] == stats['keystrokes'] - 1
+    assert histograms['actual_delay']['count'] == stats['keystrokes'] - 1
+    assert histograms['output_latency']['count'] == stats['keystrokes']
+    # Deadline scheduling keeps the actual delays close to the planned ones
+    assert abs(histograms['actual_delay']['sum'] - histograms['intended_delay']['sum']) < 0.05
+
+
+def test_no_stats_before_first_session():
+    assert HumanTyper(use_keyboard=False).get_session_stats() == {}
+
+
+def test_histogram_buckets():
+    histogram = LatencyHistogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    summary = histogram.to_dict()
+    assert summary['min'] == 0.05 and summary['max'] == 2.0
+    assert summary['p50'] == 0.1
+
+
+def test_json_and_prometheus_output(tmp_path):
+    stats = run_session().get_session_stats()
+    path = tmp_path / "stats.json"
+    write_json(stats, str(path))
+    assert json.loads(path.read_text())['keystrokes'] == stats['keystrokes']
+
+    text = to_prometheus(stats)
+    assert f"human_typer_keystrokes_total {stats['keystrokes']}" in text
+    assert 'human_typer_errors_total{kind="typos"}' in text
+    assert (f'human_typer_output_latency_seconds_bucket{{le="+Inf"}} {stats["keystrokes"]}'
+            in text)
+
+
+def test_streamed_sessions_count_characters_not_bytes():
+    text = "naïve café, déjà vu"
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=4)
+    typer.set_speed(500)
+    typer.pause_probability = 0.0
+    typer.type_stream([text], total_bytes=len(text.encode('utf-8')), use_hotkey=False,
+                      show_progress=False)
+    stats = typer.get_session_stats()
+    assert stats['characters'] == len(text) < len(text.encode('utf-8'))
+    assert stats['achieved_cpm'] == 60.0 * len(text) / stats['elapsed']
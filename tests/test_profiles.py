@@ -0,0 +1,92 @@
+"""
+Typing profiles: fitting recorded key events and the binary profile format.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from human_typer import HumanTyper
+from profiles import BACKSPACE, TypingProfile, fit_profile, load_profile
+from sinks import MemorySink
+from typing_plan import ACTION_BACKSPACE
+
+TEXT = ("the operator types this paragraph at a steady pace and then the "
+        "same words again while the recorder watches every key ") * 12
+
+
+def recorded_events(typer: HumanTyper):
+    """Key-down events of a simulated session, as the recorder would see them."""
+    events = []
+    for seconds, key, action in typer.simulate(TEXT)['events']:
+        key = BACKSPACE if action == ACTION_BACKSPACE else key
+        events.append((int(seconds * 1e9), key, True))
+        events.append((int(seconds * 1e9) + 30_000_000, key, False))
+    return events
+
+
+def test_fit_recovers_simulated_settings():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=12)
+    typer.set_speed(300)
+    typer.speed_variance = 10
+    typer.set_error_rate(0.05)
+    typer.pause_probability = 0.2
+    typer.double_char_probability = typer.char_swap_probability = 0.0
+
+    profile = fit_profile(recorded_events(typer), layout='qwerty')
+    assert profile.base_speed == pytest.approx(300, rel=0.1)
+    assert profile.typo_probability == pytest.approx(0.05, abs=0.02)
+    assert profile.pause_probability == pytest.approx(0.2, abs=0.07)
+    assert 0.3 < profile.pause_range[0] < profile.pause_range[1] < 2.3
+    assert profile.speed_variance == pytest.approx(10, abs=3)
+    # Same-finger 'de' is slower than alternating-hand 'he'
+    assert profile.digraphs['he'] < 1.0 < profile.digraphs['de']
+
+
+def test_fit_needs_enough_keystrokes():
+    with pytest.raises(ValueError):
+        fit_profile([(0, 'a', True), (100_000_000, 'b', True)])
+
+
+def test_binary_round_trip(tmp_path):
+    profile = TypingProfile(base_speed=321.5, pause_range=(0.6, 1.5), layout='dvorak',
+                            digraphs={'th': 0.75, 'ñe': 1.3}, keystrokes=900)
+    path = tmp_path / "operator.htp"
+    profile.save(str(path))
+    assert path.stat().st_size == 8 + 80 + 16 * 2
+
+    loaded = load_profile(str(path))
+    assert loaded.base_speed == 321.5 and loaded.layout == 'dvorak'
+    assert loaded.pause_range == (0.6, 1.5)
+    assert loaded.digraphs == {'th': 0.75, 'ñe': 1.3}
+    assert loaded.keystrokes == 900
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("definitely not a profile, just some words in a file" * 3)
+    with pytest.raises(ValueError):
+        load_profile(str(path))
+    with pytest.raises(ValueError):
+        TypingProfile.from_buffer(TypingProfile().to_bytes()[:-1] + b'\0\0')
+
+
+def test_typer_applies_profile(tmp_path):
+    path = tmp_path / "operator.htp"
+    TypingProfile(base_speed=420, typo_probability=0.02, layout='colemak',
+                  digraphs={'th': 0.6}).save(str(path))
+    typer = HumanTyper(use_keyboard=False, profile=str(path))
+    settings = typer.get_current_settings()
+    assert settings['speed'] == 420
+    assert settings['error_rate'] == 0.02
+    assert settings['keyboard_layout'] == 'colemak'
+    assert typer.digraphs.factor('t', 'h') == 0.6
+
+
+def test_fast_profiles_keep_their_speed():
+    profile = TypingProfile(base_speed=720.0, speed_variance=40.0)
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), profile=profile)
+    assert typer.base_speed == 720.0
+    assert typer.speed_variance == 40.0
+    delays = [event[0] for event in typer.simulate("a" * 200)['events']]
+    assert 60.0 * (len(delays) - 1) / (delays[-1] - delays[0]) > 600
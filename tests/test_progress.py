@@ -0,0 +1,51 @@
+"""
+Polled progress reporting.
+
+Run with: python -m pytest tests
+"""
+
+import io
+import time
+
+from human_typer import HumanTyper
+from progress import ProgressBar, ProgressCounter
+from sinks import MemorySink
+
+
+def test_session_publishes_progress_without_callback():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=2)
+    typer.set_error_rate(0.0)
+    typer.pause_probability = 0.0
+    typer.set_speed(500)
+    plan = typer.compile_plan("ok go")
+
+    assert typer.execute_plan(plan)
+    assert typer.progress.snapshot() == (5, 5)
+    assert typer.progress.fraction() == 1.0
+
+
+def test_progress_bar_redraws_at_most_at_its_rate():
+    counter = ProgressCounter()
+    counter.reset(1000)
+    stream = io.StringIO()
+    bar = ProgressBar(counter, stream=stream, rate=20, unit='bytes')
+    bar.start()
+    started = time.monotonic()
+    for done in range(1001):
+        counter.publish(done, 1000)
+        time.sleep(0.0002)
+    elapsed = time.monotonic() - started
+    bar.stop()
+
+    frames = stream.getvalue().split('\r')[1:]
+    assert len(frames) <= elapsed * 20 + 2
+    assert frames[-1].startswith('[' + '#' * 40 + '] 100.0% 1000/1000 bytes')
+
+
+def test_unknown_total():
+    counter = ProgressCounter()
+    counter.publish(42, 0)
+    stream = io.StringIO()
+    ProgressBar(counter, stream=stream).draw()
+    assert counter.fraction() == 0.0
+    assert stream.getvalue() == '\r42 characters'
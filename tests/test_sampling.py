@@ -0,0 +1,91 @@
+"""
+Batched decisions from TypingSampler, with and without NumPy.
+
+Run with: python -m pytest tests
+"""
+
+import random
+
+import pytest
+
+from human_typer import HumanTyper
+from sampling import BATCH_SIZE, INITIAL_BATCH_SIZE, MIN_DELAY, NUMPY_AVAILABLE, TypingSampler
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    not NUMPY_AVAILABLE, reason="NumPy not installed"))]
+
+DRAWS = 20000
+
+
+def make_typer() -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False)
+    typer.set_speed(300)
+    typer.pause_probability = 0.2
+    typer.typo_probability = 0.1
+    typer.double_char_probability = 0.05
+    typer.correction_probability = 0.8
+    typer.char_swap_probability = 0.3
+    return typer
+
+
+def draw_all(sampler: TypingSampler) -> tuple:
+    return ([sampler.delay() for _ in range(DRAWS)],
+            [sampler.pause() for _ in range(DRAWS)],
+            [sampler.char_decision() for _ in range(DRAWS)],
+            [sampler.swap_decision() for _ in range(DRAWS)])
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_same_seed_draws_the_same_decisions(use_numpy):
+    typer = make_typer()
+    first = draw_all(TypingSampler(typer, random.Random(9), use_numpy=use_numpy))
+    second = draw_all(TypingSampler(typer, random.Random(9), use_numpy=use_numpy))
+    other = draw_all(TypingSampler(typer, random.Random(10), use_numpy=use_numpy))
+    assert first == second
+    assert first != other
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_draws_respect_the_settings(use_numpy):
+    typer = make_typer()
+    sampler = TypingSampler(typer, random.Random(4), use_numpy=use_numpy)
+    assert (sampler.np_rng is not None) == use_numpy
+    delays, pauses, chars, swaps = draw_all(sampler)
+
+    base = 60.0 / typer.base_speed
+    spread = typer.speed_variance / typer.base_speed
+    assert all(max(MIN_DELAY, base - spread) <= delay <= base + spread for delay in delays)
+    assert sum(delays) / DRAWS == pytest.approx(base, rel=0.02)
+
+    taken = [pause for pause in pauses if pause]
+    assert len(taken) / DRAWS == pytest.approx(0.2, abs=0.015)
+    assert all(0.5 <= pause <= 2.0 for pause in taken)
+
+    def rate(flags):
+        return sum(flags) / DRAWS
+
+    assert rate(c[0] for c in chars) == pytest.approx(0.05, abs=0.01)
+    assert rate(c[1] for c in chars) == pytest.approx(0.1, abs=0.01)
+    assert rate(c[2] for c in chars) == pytest.approx(0.8, abs=0.015)
+    assert all(0.0 <= c[3] < 1.0 for c in chars)
+    assert rate(s[0] for s in swaps) == pytest.approx(0.3, abs=0.015)
+    assert rate(s[2] for s in swaps) == pytest.approx(0.8, abs=0.015)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_throughput_bursts(use_numpy):
+    typer = make_typer()
+    typer.set_throughput_mode(6000, burst_pause_range=(0.1, 0.3), error_probability=0.25)
+    sampler = TypingSampler(typer, random.Random(2), use_numpy=use_numpy)
+    assert sampler.min_delay == 0.0
+    bursts = [sampler.burst_decision() for _ in range(DRAWS)]
+    assert all(0.1 <= pause <= 0.3 for pause, _ in bursts)
+    assert sum(errors for _, errors in bursts) / DRAWS == pytest.approx(0.25, abs=0.015)
+
+
+def test_batches_grow_up_to_the_batch_size():
+    sampler = TypingSampler(make_typer(), random.Random(0), use_numpy=False)
+    sizes = [sampler._next_batch_size('delays') for _ in range(12)]
+    assert sizes[0] == INITIAL_BATCH_SIZE
+    assert sizes == sorted(sizes)
+    assert sizes[-1] == BATCH_SIZE
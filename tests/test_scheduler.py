@@ -0,0 +1,73 @@
+"""
+Deadline and relative keystroke scheduling on simulated clocks.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from human_typer import HumanTyper
+from scheduler import (NS_PER_SECOND, SCHEDULERS, DeadlineScheduler, SleepScheduler,
+                       VirtualClock)
+from sinks import MemorySink
+
+
+class OversleepingClock(VirtualClock):
+    """Virtual clock whose every sleep overshoots, like a loaded OS timer."""
+
+    def __init__(self, overshoot: float):
+        super().__init__()
+        self.overshoot_ns = round(overshoot * NS_PER_SECOND)
+
+    def sleep(self, seconds: float):
+        super().sleep(seconds)
+        if seconds > 0:
+            self.time_ns += self.overshoot_ns
+
+
+def run(scheduler, events=200, gap=0.05):
+    scheduler.start()
+    for index in range(1, events + 1):
+        scheduler.wait_until(index * gap)
+    return scheduler.report()
+
+
+def test_relative_timing_accumulates_drift():
+    report = run(SleepScheduler(clock=OversleepingClock(2e-6)))
+    assert report['mode'] == 'relative'
+    assert report['events'] == 200
+    assert report['drift'] == pytest.approx(200 * 2e-6, rel=0.01)
+
+
+def test_deadline_timing_does_not_accumulate_drift():
+    # The virtual clock spins a nanosecond at a time, so the overshoot and
+    # spin window are kept to microseconds
+    report = run(DeadlineScheduler(clock=OversleepingClock(2e-6), spin_window=5e-6))
+    assert report['mode'] == 'deadline'
+    # Each deadline is met by spinning, whatever the earlier sleeps overshot
+    assert report['max_lateness'] < 1e-6
+    assert report['elapsed'] == pytest.approx(200 * 0.05, abs=1e-6)
+
+
+def test_late_events_are_sent_at_once_and_reported():
+    clock = VirtualClock()
+    scheduler = DeadlineScheduler(clock=clock, spin_window=0)
+    scheduler.start()
+    clock.time_ns += NS_PER_SECOND  # an output call blocked for a second
+    assert scheduler.wait_until(0.25) == round(0.75 * NS_PER_SECOND)
+    assert scheduler.wait_until(1.5) == 0
+    assert scheduler.report()['max_lateness'] == pytest.approx(0.75)
+
+
+def test_timing_mode_selects_the_scheduler():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+    assert typer.timing_mode == 'deadline'
+    typer.set_timing_mode('relative')
+    assert SCHEDULERS[typer.timing_mode] is SleepScheduler
+    with pytest.raises(ValueError):
+        typer.set_timing_mode('fastest')
+    typer.set_speed(500)
+    typer.pause_probability = 0.0
+    typer.type_text("ok", use_hotkey=False, show_progress=False)
+    assert typer.last_timing['mode'] == 'relative'
+    assert typer.sink.getvalue() == "ok"
@@ -0,0 +1,129 @@
+"""
+Stop and pause/resume behaviour of a running typing session.
+
+Run with: python -m pytest tests
+"""
+
+import threading
+import time
+
+from human_typer import HumanTyper
+from sinks import MemorySink
+from text_stream import TOKEN_PATTERN
+
+TEXT = "pause here and carry on"
+
+
+def make_typer() -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=11)
+    typer.set_error_rate(0.0)
+    typer.pause_probability = 0.0
+    typer.set_speed(500)
+    return typer
+
+
+# Stopping takes milliseconds (benchmarks measure it); the tests only check
+# that it ends a wait long before the wait would be over
+LONG_WAIT = 10.0
+
+
+def run_in_thread(typer: HumanTyper, text: str, wait_for_keystroke: bool = True):
+    """Start typing `text` in the background and wait for the first keystroke."""
+    started = threading.Event()
+    typer.set_callbacks(on_progress=lambda done, total: started.set())
+    open_tokens = lambda: TOKEN_PATTERN.findall(text)
+    typer.typing_thread = threading.Thread(target=typer._typing_worker,
+                                           args=(open_tokens, len(text)), daemon=True)
+    typer.typing_thread.start()
+    if wait_for_keystroke:
+        assert started.wait(5)
+
+
+def stop_and_time(typer: HumanTyper) -> float:
+    """Stop typing and return how long it took until the typing thread was gone."""
+    started = time.perf_counter()
+    typer.stop_typing()
+    typer.typing_thread.join(LONG_WAIT)
+    assert not typer.typing_thread.is_alive()
+    return time.perf_counter() - started
+
+
+def test_stop_interrupts_a_long_wait():
+    typer = make_typer()
+    typer.pause_probability = 1.0
+    typer.pause_range = (LONG_WAIT, LONG_WAIT)  # a thinking pause before the first key
+    run_in_thread(typer, "b" * 100, wait_for_keystroke=False)
+    time.sleep(0.05)
+
+    assert stop_and_time(typer) < LONG_WAIT / 5
+    assert typer.sink.getvalue() == ''
+    assert not typer.is_typing
+
+
+def test_stop_interrupts_a_pause():
+    typer = make_typer()
+    run_in_thread(typer, "b" * 2000)
+    typer.pause_typing()
+    assert typer.is_paused
+    time.sleep(0.05)
+
+    assert stop_and_time(typer) < LONG_WAIT / 5
+    assert not typer.is_typing
+
+
+def test_pause_and_resume_keep_position():
+    typer = make_typer()
+    run_in_thread(typer, TEXT)
+    typer.pause_typing()
+    time.sleep(0.05)
+    typed = typer.sink.getvalue()
+    time.sleep(0.2)
+    assert typer.sink.getvalue() == typed  # nothing is typed while paused
+
+    typer.resume_typing()
+    typer.typing_thread.join(5)
+    assert typer.sink.getvalue() == TEXT
+    assert typer.last_timing['paused'] >= 0.2
+    assert typer.last_timing['max_lateness'] < 0.05
+
+
+class WatchingSink(MemorySink):
+    """Sink that records whether its typer reported a session while writing."""
+
+    def __init__(self):
+        super().__init__()
+        self.typer = None
+        self.typing = []
+
+    def write(self, char):
+        self.typing.append(self.typer.is_typing)
+        super().write(char)
+
+
+def test_execute_plan_runs_after_a_stop():
+    typer = make_typer()
+    typer.set_speed(50)
+    run_in_thread(typer, "b" * 100)
+    typer.stop_typing()
+
+    sink = typer.sink = WatchingSink()
+    sink.typer = typer
+    typer.set_speed(500)
+    assert typer.execute_plan(typer.compile_plan("ok go"))
+    assert sink.getvalue() == "ok go"
+    assert all(sink.typing) and not typer.is_typing
+
+
+def test_replay_runs_after_a_stop(tmp_path):
+    typer = make_typer()
+    log = str(tmp_path / "session.htl")
+    typer.enable_session_log(log)
+    assert typer.execute_plan(typer.compile_plan("ok go"))
+    typer.disable_session_log()
+    typer.should_stop = True  # as left by stop_typing()
+
+    sink = typer.sink = WatchingSink()
+    sink.typer = typer
+    assert typer.replay(log)
+    assert sink.getvalue() == "ok go"
+    assert all(sink.typing) and not typer.is_typing
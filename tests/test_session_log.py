@@ -0,0 +1,120 @@
+"""
+Binary session logs and exact-timing replay.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from human_typer import HumanTyper
+from scheduler import DeadlineScheduler, SessionControl, VirtualClock
+from session_log import ACTION_SESSION, RECORD, SessionLog, read_log, replay
+from sinks import MemorySink
+from typing_plan import ACTION_BACKSPACE, ACTION_PRESS
+
+TEXT = "Replay me exactly, typos and all."
+
+
+def keystrokes(records):
+    return [record for record in records if record[2] != ACTION_SESSION]
+
+
+def record_session(path, seed=5):
+    sink = MemorySink()
+    typer = HumanTyper(use_keyboard=False, sink=sink, seed=seed)
+    typer.set_throughput_mode(30000, burst_pause_range=(0.0, 0.0), error_probability=1.0)
+    typer.set_error_rate(0.3)
+    typer.enable_session_log(str(path))
+    plan = typer.compile_plan(TEXT)
+    assert typer.execute_plan(plan)
+    typer.disable_session_log()
+    return plan, sink.getvalue()
+
+
+def virtual_scheduler(control=None):
+    return DeadlineScheduler(clock=VirtualClock(), control=control, spin_window=0)
+
+
+def test_log_records_every_emitted_keystroke(tmp_path):
+    plan, typed = record_session(tmp_path / 'session.htl')
+    records = read_log(str(tmp_path / 'session.htl'))
+    assert records[0][1:] == (0, ACTION_SESSION)
+    events = keystrokes(records)
+    assert [(code, action) for _, code, action in events] == list(zip(plan.keys, plan.actions))
+    assert any(action == ACTION_BACKSPACE for _, _, action in events)
+    times = [time_ns for time_ns, _, _ in events]
+    assert times == sorted(times)
+    assert typed == TEXT
+
+
+def test_replay_reproduces_stream_and_timing(tmp_path):
+    record_session(tmp_path / 'original.htl')
+    sink = MemorySink()
+    with SessionLog(str(tmp_path / 'replayed.htl')) as log:
+        report = replay(str(tmp_path / 'original.htl'), sink, virtual_scheduler(), log)
+    assert report['finished']
+    assert sink.getvalue() == TEXT
+    original = keystrokes(read_log(str(tmp_path / 'original.htl')))
+    assert report['keystrokes'] == len(original)
+    # On a virtual clock every keystroke lands on its recorded nanosecond
+    assert keystrokes(read_log(str(tmp_path / 'replayed.htl'))) == original
+
+    again = MemorySink()
+    with SessionLog(str(tmp_path / 'again.htl')) as log:
+        replay(str(tmp_path / 'replayed.htl'), again, virtual_scheduler(), log)
+    body = slice(RECORD.size + 8, None)  # skip the header and the session record
+    assert ((tmp_path / 'again.htl').read_bytes()[body]
+            == (tmp_path / 'replayed.htl').read_bytes()[body])
+
+
+def test_records_are_written_in_bulk(tmp_path):
+    path = tmp_path / 'ring.htl'
+    log = SessionLog(str(path), capacity=4)
+    log.begin()
+    for index in range(6):
+        log.record(ord('a'), ACTION_PRESS, index)
+    assert path.stat().st_size == 8 + 4 * RECORD.size
+    log.close()
+    assert path.stat().st_size == 8 + 7 * RECORD.size
+
+
+def test_sessions_append_to_one_log(tmp_path):
+    path = str(tmp_path / 'two.htl')
+    record_session(path, seed=1)
+    record_session(path, seed=2)
+    records = read_log(path)
+    assert sum(action == ACTION_SESSION for _, _, action in records) == 2
+    sink = MemorySink()
+    replay(records, sink, virtual_scheduler())
+    assert sink.getvalue() == TEXT + TEXT
+
+
+def test_stopped_replay_reports_unfinished(tmp_path):
+    record_session(tmp_path / 'session.htl')
+    control = SessionControl()
+    control.stop()
+    report = replay(str(tmp_path / 'session.htl'), MemorySink(), virtual_scheduler(control))
+    assert not report['finished'] and report['keystrokes'] == 0
+
+
+def test_rejects_files_that_are_not_logs(tmp_path):
+    path = tmp_path / 'bogus.htl'
+    path.write_bytes(b'not a session log')
+    with pytest.raises(ValueError):
+        read_log(str(path))
+    with pytest.raises(ValueError):
+        SessionLog(str(path))
+
+
+def test_async_sessions_are_logged(tmp_path):
+    import asyncio
+    from async_typer import AsyncHumanTyper
+
+    typer = AsyncHumanTyper(use_keyboard=False, sink=MemorySink(), seed=3)
+    typer.set_throughput_mode(30000, burst_pause_range=(0.0, 0.0))
+    typer.enable_session_log(str(tmp_path / 'async.htl'))
+    assert asyncio.run(typer.type_text("async keystrokes"))
+    typer.disable_session_log()
+    sink = MemorySink()
+    replay(str(tmp_path / 'async.htl'), sink, virtual_scheduler())
+    assert sink.getvalue() == "async keystrokes"
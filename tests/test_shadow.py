@@ -0,0 +1,94 @@
+"""
+Shadow document of the target's expected contents.
+
+Run with: python -m pytest tests
+"""
+
+import random
+
+from human_typer import HumanTyper
+from shadow import GapBuffer, ShadowDocument
+from sinks import MemorySink
+
+TEXT = "Stopping halfway through a swap correction leaves a mess behind."
+
+
+def test_gap_buffer_matches_a_list():
+    rng = random.Random(1)
+    buffer, reference, cursor = GapBuffer(capacity=2), [], 0
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.6:
+            code = rng.randrange(32, 0x1F600)
+            buffer.insert(code)
+            reference.insert(cursor, code)
+            cursor += 1
+        elif op < 0.85:
+            removed = buffer.delete_before()
+            assert removed == (reference.pop(cursor - 1) if cursor else None)
+            cursor = max(0, cursor - 1)
+        else:
+            cursor = rng.randrange(len(reference) + 1)
+            buffer.move_to(cursor)
+        assert len(buffer) == len(reference) and buffer.cursor == cursor
+    assert buffer.text() == ''.join(map(chr, reference))
+    assert buffer.slice(5, 40) == ''.join(map(chr, reference[5:40]))
+
+
+def test_matched_prefix_tracks_edits():
+    rng = random.Random(2)
+    intended = "abcab cab"
+    shadow = ShadowDocument(intended[:4])
+    typed = []
+    for step in range(2000):
+        if step == 1000:
+            shadow.expect(intended[4:])
+        if typed and rng.random() < 0.4:
+            shadow.backspace()
+            typed.pop()
+        else:
+            char = rng.choice("abc ")
+            shadow.write(char)
+            typed.append(char)
+        expected = intended[:4] if step < 1000 else intended
+        prefix = 0
+        while (prefix < min(len(typed), len(expected))
+               and typed[prefix] == expected[prefix]):
+            prefix += 1
+        assert shadow.matched == prefix
+        assert shadow.is_correct == (''.join(typed) == expected)
+    diff = shadow.diff()
+    assert diff['extra'] == ''.join(typed)[prefix:]
+    assert diff['missing'] == intended[prefix:]
+
+
+def test_simulate_checks_the_result():
+    typer = HumanTyper(use_keyboard=False)
+    typer.set_error_rate(0.3)
+    typer.char_swap_probability = 0.3
+    for seed in range(10):
+        result = typer.simulate(TEXT, seed=seed)
+        assert result['correct'] and result['text'] == TEXT
+
+
+def test_stopped_session_continues_from_the_target():
+    for stop_at in (3, 17, 40):
+        sink = MemorySink()
+        typer = HumanTyper(use_keyboard=False, sink=sink, seed=stop_at)
+        typer.set_throughput_mode(30000, burst_pause_range=(0.0, 0.0), error_probability=1.0)
+        typer.set_error_rate(0.4)
+        typer.char_swap_probability = 0.5
+
+        def stop(done, total):
+            if done >= stop_at:
+                typer.should_stop = True
+
+        typer.set_callbacks(on_progress=stop)
+        typer.type_text(TEXT, use_hotkey=False, show_progress=False)
+        assert sink.getvalue() == typer.shadow.text() != TEXT
+
+        typer.set_callbacks()
+        assert typer.continue_typing(use_hotkey=False, show_progress=False)
+        assert sink.getvalue() == TEXT
+        assert typer.shadow.is_correct
+        assert not typer.continue_typing(use_hotkey=False, show_progress=False)
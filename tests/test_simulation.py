@@ -0,0 +1,77 @@
+"""
+Regression checks for the typing model using the virtual-clock simulator.
+
+Run with: python -m pytest tests
+"""
+
+import time
+
+from human_typer import HumanTyper
+
+SAMPLE_TEXT = ("The quick brown fox jumps over the lazy dog.\n"
+               "Pack my box with five dozen liquor jugs!  Double  spaces stay.")
+
+
+def make_typer() -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False)
+    typer.set_error_rate(0.3)
+    typer.double_char_probability = 0.1
+    typer.char_swap_probability = 0.2
+    return typer
+
+
+def test_final_text_matches_target():
+    for seed in range(25):
+        result = make_typer().simulate(SAMPLE_TEXT, seed=seed)
+        assert result['text'] == SAMPLE_TEXT
+
+
+def test_same_seed_gives_same_timeline():
+    first = make_typer().simulate(SAMPLE_TEXT, seed=42)
+    second = make_typer().simulate(SAMPLE_TEXT, seed=42)
+    assert first['events'] == second['events']
+    assert first['duration'] == second['duration']
+
+
+def test_instance_seed_reproduces_every_session():
+    first = HumanTyper(use_keyboard=False, seed=7).compile_plan(SAMPLE_TEXT)
+    typer = HumanTyper(use_keyboard=False, seed=7)
+    for _ in range(2):
+        plan = typer.compile_plan(SAMPLE_TEXT)
+        assert plan.keys == first.keys
+        assert plan.offsets == first.offsets
+    assert typer.get_current_settings()['seed'] == 7
+
+
+def test_errors_are_counted_and_corrected():
+    result = make_typer().simulate(SAMPLE_TEXT * 20, seed=1)
+    assert result['typos'] > 0
+    assert result['swaps'] > 0
+    assert result['corrections'] == result['typos'] + result['double_chars'] + result['swaps']
+    assert result['keystrokes'] == len(SAMPLE_TEXT * 20) + 2 * result['backspaces']
+
+
+def test_timeline_is_ordered_and_matches_duration():
+    result = make_typer().simulate(SAMPLE_TEXT, seed=3)
+    times = [event[0] for event in result['events']]
+    assert times == sorted(times)
+    assert times[-1] <= result['duration']
+
+
+def test_simulation_never_waits_in_real_time(monkeypatch):
+    def no_sleep(seconds):
+        raise AssertionError(f"simulate() slept for {seconds} s")
+
+    # How much faster than real time it runs is measured by bench_planning
+    monkeypatch.setattr(time, 'sleep', no_sleep)
+    text = ' '.join(['lorem ipsum dolor sit amet'] * 400)
+    result = make_typer().simulate(text, seed=5)
+    assert result['correct']
+    assert result['duration'] > 600  # minutes of typing
+
+
+def test_empty_text():
+    result = make_typer().simulate('', seed=0)
+    assert result['text'] == ''
+    assert result['events'] == []
+    assert result['duration'] == 0
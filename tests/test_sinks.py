@@ -0,0 +1,78 @@
+"""
+Behaviour of the console, memory and file sinks.
+
+Run with: python -m pytest tests
+"""
+
+import io
+
+from human_typer import HumanTyper
+from sinks import ConsoleSink, FileSink, MemorySink, OutputSink
+
+
+def test_memory_sink_applies_backspaces():
+    sink = MemorySink()
+    for char in "cat":
+        sink.write(char)
+    sink.backspace()
+    sink.backspace()
+    sink.write("o")
+    assert sink.getvalue() == "co"
+    sink.backspace()
+    sink.backspace()
+    sink.backspace()  # nothing left to delete
+    assert sink.getvalue() == ""
+
+
+def test_file_sink_records_the_raw_keystroke_stream(tmp_path):
+    path = tmp_path / "keys.txt"
+    sink = FileSink(str(path))
+    for char in "teh":
+        sink.write(char)
+    sink.backspace()
+    sink.backspace()
+    sink.write("he")
+    sink.close()
+    sink.close()  # closing twice is harmless
+    assert path.read_text(encoding="utf-8") == "teh\b\bhe"
+
+
+def test_console_sink_buffers_until_the_next_frame():
+    stream = io.StringIO()
+    # One frame every 1000 s: nothing is written until an explicit flush
+    sink = ConsoleSink(stream, frame_rate=0.001)
+    for char in "ab":
+        sink.write(char)
+    sink.backspace()
+    assert stream.getvalue() == ""
+    sink.flush()
+    assert stream.getvalue() == "ab\b \b"
+    sink.flush()
+    assert stream.getvalue() == "ab\b \b"
+
+
+def test_console_sink_writes_once_a_frame_has_passed():
+    stream = io.StringIO()
+    sink = ConsoleSink(stream, frame_rate=1e9)
+    sink.write("x")
+    assert stream.getvalue() == "x"
+
+
+class PickySink(MemorySink):
+    """Memory sink that cannot type digits."""
+
+    def prepare(self, chars):
+        return sorted(set(char for char in chars if char.isdigit()))
+
+
+def test_default_prepare_accepts_everything():
+    assert OutputSink().prepare("any\x00text") == []
+
+
+def test_untypable_characters_are_reported_before_typing(capsys):
+    typer = HumanTyper(use_keyboard=False, sink=PickySink(), seed=1)
+    typer.set_speed(500)
+    typer.pause_probability = 0.0
+    typer.type_text("room 101", use_hotkey=False, show_progress=True)
+    assert "cannot type '0', '1'" in capsys.readouterr().out
+    assert typer.sink.getvalue() == "room 101"
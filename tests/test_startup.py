@@ -0,0 +1,32 @@
+"""
+Startup cost: importing the entry points stays cheap and side-effect free.
+
+Run with: python -m pytest tests
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+from bench_startup import HEAVY_MODULES, importtime
+
+# Import time budgets are wall-clock numbers: bench_startup.LIMITS holds them
+# and `benchmarks/run.py --check` enforces them
+
+
+@pytest.mark.parametrize('module', ['main', 'src.human_typer'])
+def test_imports_skip_heavy_modules(module):
+    modules = importtime(f'import {module}')
+    assert module in modules
+    assert not set(HEAVY_MODULES) & set(modules)
+
+
+def test_imports_print_nothing():
+    result = subprocess.run([sys.executable, '-c', 'import main, src.human_typer, src.sinks'],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout == '' and result.stderr == ''
@@ -0,0 +1,93 @@
+"""
+Lazy text sources and the streaming tokenizer.
+
+Run with: python -m pytest tests
+"""
+
+import io
+import os
+import random
+import threading
+
+from human_typer import HumanTyper
+from sinks import MemorySink
+from text_stream import (MAX_WORD_LENGTH, TOKEN_PATTERN, iter_file_chunks, iter_stream_chunks,
+                         iter_tokens, utf8_length)
+
+TEXT = "Streams  start typing\nbefore the whole file is read, naïve café text. "
+
+
+def test_tokens_match_whole_text_across_chunk_boundaries():
+    rng = random.Random(3)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(TEXT)), rng.randint(1, 8)))
+        chunks = [TEXT[start:end] for start, end in zip([0] + cuts, cuts + [len(TEXT)])]
+        assert list(iter_tokens(chunks)) == TOKEN_PATTERN.findall(TEXT)
+
+
+def test_very_long_words_are_emitted_in_pieces():
+    word = "x" * (3 * MAX_WORD_LENGTH)
+    chunks = [word[start:start + 1000] for start in range(0, len(word), 1000)]
+    tokens = list(iter_tokens(chunks + [" end"]))
+    assert ''.join(tokens) == word + " end"
+    assert max(map(len, tokens)) <= MAX_WORD_LENGTH + 1000
+
+
+def test_file_chunks_decode_split_characters_and_newlines(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(TEXT.replace("\n", "\r\n").encode("utf-8"))
+    # Chunks of 7 bytes split the two-byte characters and the \r\n pair
+    assert ''.join(iter_file_chunks(str(path), chunk_size=7)) == TEXT
+    (tmp_path / "empty.txt").write_bytes(b"")
+    assert list(iter_file_chunks(str(tmp_path / "empty.txt"))) == []
+
+
+def test_type_file_streams_and_reports_bytes(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=6)
+    typer.set_speed(500)
+    typer.pause_probability = 0.0
+    typer.type_file(str(path), use_hotkey=False, show_progress=False)
+
+    assert typer.sink.getvalue() == TEXT
+    size = utf8_length(TEXT)
+    assert size > len(TEXT)
+    assert typer.progress.snapshot() == (size, size)
+
+
+def test_type_stream_reads_lazily():
+    stream = io.StringIO(TEXT)
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=6)
+    typer.set_speed(500)
+    typer.pause_probability = 0.0
+    typer.type_stream(iter_stream_chunks(stream, chunk_size=5), use_hotkey=False,
+                      show_progress=False)
+    assert typer.sink.getvalue() == TEXT
+
+
+def next_within(chunks, seconds=5.0):
+    """Next chunk, failing instead of hanging if the reader waits for more input."""
+    result = []
+    reader = threading.Thread(target=lambda: result.append(next(chunks)), daemon=True)
+    reader.start()
+    reader.join(seconds)
+    assert result, "the reader is waiting for a full chunk"
+    return result[0]
+
+
+def test_stream_chunks_arrive_before_the_stream_ends():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, 'r', encoding='utf-8') as stream, \
+            os.fdopen(write_fd, 'wb', buffering=0) as producer:
+        chunks = iter_stream_chunks(stream)
+        e_acute = "é".encode('utf-8')
+        # Half of 'é' is held back until the rest arrives, and so is a '\r'
+        # that may start a '\r\n'
+        producer.write(b"caf" + e_acute[:1])
+        assert next_within(chunks) == "caf"
+        producer.write(e_acute[1:] + b" ok\r")
+        assert next_within(chunks) == "é ok"
+        producer.write(b"\nend")
+        producer.close()
+        assert ''.join(chunks) == "\nend"
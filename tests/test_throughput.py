@@ -0,0 +1,76 @@
+"""
+Throughput mode: uncapped bursts for bulk text entry.
+
+Run with: python -m pytest tests
+"""
+
+import pytest
+
+from human_typer import HumanTyper
+from sampling import MIN_DELAY
+from sinks import MemorySink
+from typing_plan import ACTION_BACKSPACE
+
+TEXT = "bulk entry of records, field after field; " * 40
+
+
+def bulk_typer(cpm=30000, **options) -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=21)
+    typer.set_throughput_mode(cpm, **options)
+    return typer
+
+
+def test_bursts_are_uncapped_and_paused():
+    typer = bulk_typer(burst_length=50, burst_pause_range=(0.2, 0.3))
+    result = typer.simulate(TEXT)
+    assert result['text'] == TEXT
+    assert result['typos'] == result['double_chars'] == result['swaps'] == 0
+
+    times = [event[0] for event in result['events']]
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    pauses = [gap for gap in gaps if gap >= 0.2]
+    assert len(pauses) == (len(TEXT) - 1) // 50
+    assert max(gap for gap in gaps if gap < 0.2) < MIN_DELAY
+    assert result['burst_pause_time'] == pytest.approx(sum(pauses), rel=0.05)
+    # Far beyond the 500 CPM cap of set_speed, even with the pauses
+    assert 60 * len(TEXT) / result['duration'] > 5000
+
+
+def test_error_model_is_optional_per_burst():
+    result = bulk_typer(burst_length=20, error_probability=0.5).simulate(TEXT)
+    assert result['text'] == TEXT
+    assert result['typos'] + result['double_chars'] > 0
+    corrected = {int(time // 1) for time, _, action in result['events']
+                 if action == ACTION_BACKSPACE}
+    assert corrected
+
+
+def test_bursts_with_errors_swap_characters():
+    typer = bulk_typer(burst_length=20, error_probability=0.5)
+    typer.char_swap_probability = 0.3
+    result = typer.simulate(TEXT)
+    assert result['text'] == TEXT
+    assert result['swaps'] > 0
+    assert typer.simulate(TEXT)['swaps'] == result['swaps']  # seeded
+    typer.set_throughput_mode(30000, error_probability=0.0)
+    assert typer.simulate(TEXT)['swaps'] == 0
+
+
+def test_sustained_rate_is_reported():
+    typer = bulk_typer(60000, burst_length=100, burst_pause_range=(0.01, 0.02))
+    assert typer.execute_plan(typer.compile_plan(TEXT[:400]))
+    stats = typer.get_session_stats()
+    assert stats['target_cpm'] == 60000
+    assert stats['sustained_cpm'] > stats['achieved_cpm'] > 5000
+    assert typer.sink.getvalue() == TEXT[:400]
+
+
+def test_mode_can_be_switched_off():
+    typer = bulk_typer()
+    typer.set_throughput_mode(None)
+    assert typer.get_current_settings()['throughput_cpm'] is None
+    assert 'burst_pause_time' not in typer.simulate("plain typing")
+    with pytest.raises(ValueError):
+        typer.set_throughput_mode(0)
+    with pytest.raises(ValueError):
+        typer.set_throughput_mode(1000, burst_length=0)
@@ -0,0 +1,92 @@
+"""
+Time-budget mode: solved settings and closed-loop pacing.
+
+Run with: python -m pytest tests
+"""
+
+import time
+
+import pytest
+
+from human_typer import HumanTyper
+from pacing import PaceController
+from sinks import MemorySink
+
+TEXT = "Please fill in the delivery address and the preferred time slot. " * 3
+
+
+class SlowSink(MemorySink):
+    """Sink whose every keystroke takes a few milliseconds, like a slow target."""
+
+    def write(self, char):
+        time.sleep(0.003)
+        super().write(char)
+
+
+def test_solved_settings_predict_the_target():
+    typer = HumanTyper(use_keyboard=False, seed=4)
+    settings = typer.get_current_settings()
+    for target in (40.0, 90.0, 300.0):
+        budget = typer.solve_time_budget(TEXT, target)
+        assert abs(budget['predicted'] - target) <= 0.03 * target
+        assert typer.get_current_settings() == settings
+
+        solved = HumanTyper(use_keyboard=False, seed=4)
+        solved.base_speed = budget['speed']
+        solved.pause_range = tuple(end * budget['pause_scale'] for end in typer.pause_range)
+        assert abs(solved.compile_plan(TEXT, seed=4).duration - target) <= 0.03 * target
+
+
+def test_budget_applies_to_its_session_only():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=2)
+    typer.pause_probability = 0.0
+    settings = typer.get_current_settings()
+    typer.type_text("form entry", use_hotkey=False, show_progress=False, target_duration=3.0)
+    assert typer.get_session_stats()['target_cpm'] == typer.time_budget['speed'] != 200
+    assert typer.get_current_settings() == settings
+
+    typer.type_text("form entry", use_hotkey=False, show_progress=False)
+    assert typer.get_session_stats()['target_cpm'] == 200
+
+
+def test_pauses_shrink_when_the_speed_runs_out():
+    typer = HumanTyper(use_keyboard=False, seed=1)
+    typer.pause_probability = 1.0
+    typer.pause_range = (3.0, 4.0)
+    slowest = typer.solve_time_budget(TEXT, 1000.0)
+    assert slowest['pause_scale'] > 1.0
+    budget = typer.solve_time_budget(TEXT, 40.0)
+    assert budget['pause_scale'] < 1.0
+    assert abs(budget['predicted'] - 40.0) <= 0.05 * 40.0
+
+
+def test_impossible_budgets_are_rejected():
+    typer = HumanTyper(use_keyboard=False)
+    with pytest.raises(ValueError):
+        typer.solve_time_budget(TEXT, 1.0)
+    with pytest.raises(ValueError):
+        typer.solve_time_budget(TEXT, 0)
+    with pytest.raises(ValueError):
+        typer.type_text(TEXT, use_hotkey=False, show_progress=False, target_duration=-5)
+
+
+@pytest.mark.parametrize("mode", ['deadline', 'relative'])
+def test_session_finishes_on_target_despite_slow_output(mode):
+    sink = SlowSink()
+    typer = HumanTyper(use_keyboard=False, sink=sink)
+    typer.set_timing_mode(mode)
+    typer.set_throughput_mode(4000, error_probability=0.5)
+    etas = []
+    typer.set_callbacks(on_progress=lambda done, total: etas.append(typer.progress.eta()))
+    typer.type_text(TEXT, use_hotkey=False, show_progress=False, target_duration=2.0)
+    assert sink.getvalue() == TEXT
+    assert abs(typer.last_timing['elapsed'] - 2.0) < 0.1
+    assert etas[len(etas) // 2] < etas[1]
+    assert typer.progress.eta() == 0.0
+
+
+def test_pace_controller_absorbs_lateness():
+    pace = PaceController(target_duration=10.0, total=100)
+    pace.update(50, 4.0, 6.0)   # half done, planned 4 s in, but 6 s have passed
+    assert pace.scale == pytest.approx((10.0 - 6.0 - 2.0) / 4.0)
+    assert pace.eta == pytest.approx(4.0)
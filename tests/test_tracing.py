@@ -0,0 +1,65 @@
+"""
+Chrome trace export of a typing session.
+
+Run with: python -m pytest tests
+"""
+
+import json
+from collections import Counter
+
+from human_typer import HumanTyper
+from sinks import MemorySink
+from tracing import Tracer
+
+TEXT = "trace this short line"
+
+
+def traced_session() -> HumanTyper:
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink(), seed=9)
+    typer.set_speed(500)
+    typer.set_error_rate(0.3)
+    typer.pause_probability = 0.0
+    typer.enable_tracing()
+    typer.type_text(TEXT, use_hotkey=False, show_progress=False)
+    return typer
+
+
+def test_session_is_traced(tmp_path):
+    typer = traced_session()
+    stats = typer.get_session_stats()
+    path = tmp_path / "trace.json"
+    typer.tracer.dump(str(path))
+
+    events = json.loads(path.read_text())['traceEvents']
+    names = Counter((event['name'], event['ph']) for event in events)
+    assert names[('session', 'B')] == names[('session', 'E')] == 1
+    assert names[('plan_word', 'X')] == len(TEXT.split())
+    assert names[('output', 'X')] == stats['keystrokes']
+    assert names[('wait', 'X')] == stats['keystrokes']
+    assert names[('typo', 'i')] == stats['typos']
+
+    outputs = [event for event in events if event['name'] == 'output']
+    typed = []
+    for event in outputs:
+        if event['args']['key'] == '\b':
+            typed.pop()
+        else:
+            typed.append(event['args']['key'])
+    assert ''.join(typed) == TEXT
+    assert [event['ts'] for event in outputs] == sorted(event['ts'] for event in outputs)
+
+
+def test_ring_buffer_keeps_newest_events():
+    tracer = Tracer(capacity=3)
+    for index in range(5):
+        tracer.instant('tick', {'index': index})
+    events = tracer.to_chrome_trace()['traceEvents']
+    assert [event['args']['index'] for event in events] == [2, 3, 4]
+
+
+def test_tracing_is_off_by_default():
+    typer = HumanTyper(use_keyboard=False, sink=MemorySink())
+    assert typer.tracer is None
+    typer.enable_tracing()
+    typer.disable_tracing()
+    assert typer.tracer is None